@@ -0,0 +1,42 @@
+"""Add group balance ledger
+
+Revision ID: 3f1c9a7d2b6e
+Revises: 07e59571203c
+Create Date: 2026-10-17 09:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b6e'
+down_revision: Union[str, Sequence[str], None] = '07e59571203c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'group_balances',
+        sa.Column('group_id', sa.String(), sa.ForeignKey('groups.id'), primary_key=True),
+        sa.Column('user_id', sa.String(), sa.ForeignKey('users.id'), primary_key=True),
+        sa.Column('other_user_id', sa.String(), sa.ForeignKey('users.id'), primary_key=True),
+        sa.Column('amount', sa.Float(), nullable=False),
+    )
+    # Existing groups are materialized lazily from their expenses on first read
+    op.add_column(
+        'groups',
+        sa.Column(
+            'balances_materialized', sa.Boolean(), nullable=False, server_default=sa.false()
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('groups', 'balances_materialized')
+    op.drop_table('group_balances')
@@ -0,0 +1,84 @@
+"""Store money as integer cents
+
+Revision ID: 5a9d3c7e2b41
+Revises: 8c4e2f6a1d93
+Create Date: 2026-10-17 16:41:08.912733
+
+"""
+import json
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5a9d3c7e2b41'
+down_revision: Union[str, Sequence[str], None] = '8c4e2f6a1d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, primary key columns, old float column, new integer column)
+MONEY_COLUMNS = [
+    ('expenses', ('id',), 'amount', 'amount_cents'),
+    ('installments', ('id',), 'amount', 'amount_cents'),
+    ('group_balances', ('group_id', 'user_id', 'other_user_id'), 'amount', 'amount_cents'),
+]
+
+
+def _to_cents(value) -> int:
+    return int((Decimal(str(value)) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def _rewrite_json(table: str, column: str, convert, where: str = '') -> None:
+    """Apply ``convert`` to every value of a ``{user_id: number}`` JSON column."""
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(f'SELECT id, {column} FROM {table} {where}')).fetchall()
+    for row_id, raw in rows:
+        if not raw:
+            continue
+        values = json.loads(raw) if isinstance(raw, str) else raw
+        bind.execute(
+            sa.text(f'UPDATE {table} SET {column} = :value WHERE id = :id'),
+            {'value': json.dumps({k: convert(v) for k, v in values.items()}), 'id': row_id},
+        )
+
+
+def _copy_to_cents(table: str, keys, old: str, new: str) -> None:
+    """Fill ``new`` with ``old`` in cents, rounded by ``_to_cents`` like the JSON values."""
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(f"SELECT {', '.join(keys)}, {old} FROM {table}")).fetchall()
+    if not rows:
+        return
+    match = ' AND '.join(f'{key} = :{key}' for key in keys)
+    bind.execute(
+        sa.text(f'UPDATE {table} SET {new} = :cents WHERE {match}'),
+        [{**dict(zip(keys, row[:-1], strict=True)), 'cents': _to_cents(row[-1])} for row in rows],
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, keys, old, new in MONEY_COLUMNS:
+        op.add_column(table, sa.Column(new, sa.Integer(), nullable=True))
+        _copy_to_cents(table, keys, old, new)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(new, existing_type=sa.Integer(), nullable=False)
+            batch_op.drop_column(old)
+
+    _rewrite_json('users', 'balance', _to_cents)
+    _rewrite_json('expenses', 'split_values', _to_cents, "WHERE split_type = 'EXACT'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rewrite_json('expenses', 'split_values', lambda v: v / 100, "WHERE split_type = 'EXACT'")
+    _rewrite_json('users', 'balance', lambda v: v / 100)
+
+    for table, _, old, new in MONEY_COLUMNS:
+        op.add_column(table, sa.Column(old, sa.Float(), nullable=True))
+        op.execute(f'UPDATE {table} SET {old} = {new} / 100.0')
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(old, existing_type=sa.Float(), nullable=False)
+            batch_op.drop_column(new)
@@ -0,0 +1,35 @@
+"""Add expense version
+
+Revision ID: 8c4e2f6a1d93
+Revises: 3f1c9a7d2b6e
+Create Date: 2026-10-17 14:03:27.504118
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e2f6a1d93'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7d2b6e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'expenses',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+    )
+    # Shares are now rounded half-up to the cent everywhere; rebuild every ledger lazily
+    # with the unified rules instead of mixing them with deltas from the old ones
+    op.execute('DELETE FROM group_balances')
+    op.execute(sa.text('UPDATE groups SET balances_materialized = :value').bindparams(value=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('expenses', 'version')
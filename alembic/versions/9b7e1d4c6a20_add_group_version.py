@@ -0,0 +1,35 @@
+"""Add group version
+
+Revision ID: 9b7e1d4c6a20
+Revises: 5a9d3c7e2b41
+Create Date: 2026-10-17 19:12:45.301876
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9b7e1d4c6a20'
+down_revision: Union[str, Sequence[str], None] = '5a9d3c7e2b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'groups',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+    )
+    op.add_column('groups', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute('UPDATE groups SET updated_at = created_at')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('groups') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('version')
@@ -0,0 +1,56 @@
+"""Add notification outbox
+
+Revision ID: c4a8e2f61b37
+Revises: 9b7e1d4c6a20
+Create Date: 2026-10-17 21:40:12.553108
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8e2f61b37'
+down_revision: Union[str, Sequence[str], None] = '9b7e1d4c6a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_outbox',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('expense_id', sa.String(), nullable=False),
+        sa.Column('installment_number', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('notify_on', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('claim_id', sa.String(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint(
+            'user_id',
+            'expense_id',
+            'installment_number',
+            'kind',
+            'notify_on',
+            name='uq_notification_outbox_key',
+        ),
+    )
+    op.create_index(
+        'ix_notification_outbox_status_user', 'notification_outbox', ['status', 'user_id']
+    )
+    op.create_index('ix_notification_outbox_claim_id', 'notification_outbox', ['claim_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notification_outbox_claim_id', table_name='notification_outbox')
+    op.drop_index('ix_notification_outbox_status_user', table_name='notification_outbox')
+    op.drop_table('notification_outbox')
@@ -44,27 +44,16 @@ export function Dashboard({ onNavigate }: DashboardProps) {
   const loadDashboardData = async () => {
     try {
       setLoading(true);
-      const userGroups = await apiClient.getGroups();
-
-      // Calculate total balance from all groups
-      let totalOwed = 0;
-      let totalOwing = 0;
-
-      userGroups.forEach(group => {
-        if (user && group.balances && group.balances[user.id]) {
-          const balance = group.balances[user.id];
-          if (balance > 0) {
-            totalOwed += balance;
-          } else {
-            totalOwing += Math.abs(balance);
-          }
-        }
-      });
+      // Totals across all groups come from one server-side aggregation
+      const [userGroups, balances] = await Promise.all([
+        apiClient.getGroups(),
+        apiClient.getMyBalances(),
+      ]);
 
       setGroups(userGroups);
-      setTotalBalance(totalOwed - totalOwing);
-      setOwedAmount(totalOwed);
-      setOwingAmount(totalOwing);
+      setTotalBalance(balances.net);
+      setOwedAmount(balances.owed_to_you);
+      setOwingAmount(balances.you_owe);
     } catch (error) {
       toast.error("Failed to load dashboard data");
       console.error("Dashboard error:", error);
@@ -120,6 +120,11 @@ class ApiClient {
     return this.request(`/groups/${groupId}`);
   }
 
+  // Server-sent events with compact deltas for one group (see GroupEventType)
+  openGroupEvents(groupId: string): EventSource {
+    return new EventSource(`${this.baseURL}/groups/${groupId}/events`, { withCredentials: true });
+  }
+
   async deleteGroup(groupId: string): Promise<void> {
     return this.request(`/groups/${groupId}`, {
       method: 'DELETE',
@@ -146,6 +151,24 @@ class ApiClient {
     });
   }
 
+  // Imports every row or none; a 422 lists the error of each invalid row
+  async importExpenses(groupId: string, csv: string): Promise<{ created: number; expense_ids: string[] }> {
+    return this.request(`/groups/${groupId}/expenses:bulk`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'text/csv' },
+      body: csv,
+    });
+  }
+
+  // A download link; the browser streams the file instead of buffering it here
+  exportExpensesUrl(groupId: string, format: 'csv' | 'jsonl' | 'xlsx' = 'csv'): string {
+    return `${this.baseURL}/groups/${groupId}/export?format=${format}`;
+  }
+
+  async getMyBalances(settle: boolean = false): Promise<UserBalances> {
+    return this.request(`/me/balances${settle ? '?settle=true' : ''}`);
+  }
+
   async getGroupExpenses(groupId: string): Promise<Expense[]> {
     const group = await this.getGroup(groupId);
     return group.expenses || [];
@@ -181,6 +204,16 @@ export interface Group {
   balances: Record<string, number>;
 }
 
+export type GroupEventType =
+  | 'expense_added'
+  | 'expense_deleted'
+  | 'expenses_imported'
+  | 'installment_paid'
+  | 'member_added'
+  | 'balances'
+  | 'group_deleted'
+  | 'resync'; // Events were dropped: refetch the group, then reconnect
+
 export interface Expense {
   id: string;
   description: string;
@@ -195,6 +228,22 @@ export interface Expense {
   created_at: string;
 }
 
+export interface SettlementTransfer {
+  from_user_id: string;
+  to_user_id: string;
+  amount: number;
+}
+
+export interface UserBalances {
+  user_id: string;
+  net: number; // Positive = you are owed overall
+  owed_to_you: number;
+  you_owe: number;
+  counterparties: { user_id: string; name: string; amount: number }[];
+  settlement_strategy?: string | null;
+  settlement?: SettlementTransfer[] | null;
+}
+
 // Export singleton instance
 export const apiClient = new ApiClient();
 export default apiClient;
\ No newline at end of file
@@ -13,6 +13,7 @@ from src.constants import (
     CLI_ERROR_COLOR,
     CLI_SUCCESS_COLOR,
     CLI_WARNING_COLOR,
+    MIN_BALANCE_THRESHOLD,
     SPLIT_EQUAL,
     SPLIT_EXACT,
     SPLIT_PERCENTAGE,
@@ -20,6 +21,7 @@ from src.constants import (
 from src.models.expense import Expense
 from src.models.group import Group
 from src.models.user import User
+from src.money import from_cents, to_cents
 from src.services.expense_service import ExpenseCalculationError, ExpenseService
 
 console = Console()
@@ -121,7 +123,7 @@ class SplitwiseApp:
     def _collect_expense_data(self) -> Optional[Dict]:
         """Collect expense data from user input."""
         try:
-            amount = float(Prompt.ask("Enter amount"))
+            amount = to_cents(float(Prompt.ask("Enter amount")))
             description = Prompt.ask("Enter description")
 
             split_type = self._get_split_type()
@@ -191,12 +193,12 @@ class SplitwiseApp:
         else:
             return {}
 
-    def _get_exact_amounts(self, selected_users: List[User]) -> Dict[str, float]:
-        """Get exact amounts for each user."""
+    def _get_exact_amounts(self, selected_users: List[User]) -> Dict[str, int]:
+        """Get exact amounts for each user, in cents."""
         split_values = {}
         for user in selected_users:
             try:
-                value = float(Prompt.ask(f"Amount for {user.name}"))
+                value = to_cents(float(Prompt.ask(f"Amount for {user.name}")))
                 split_values[user.id] = value
             except ValueError:
                 self._show_error(f"Invalid amount for {user.name}")
@@ -253,11 +255,10 @@ class SplitwiseApp:
         has_balances = False
         for user in self.current_group.members.values():
             net_balance = sum(user.balance.values())
-            if abs(net_balance) > 0.01:  # Only show non-zero balances
+            if abs(net_balance) >= MIN_BALANCE_THRESHOLD:  # Only show non-zero balances
                 has_balances = True
                 status = "owes" if net_balance < 0 else "is owed"
-                amount = abs(round(net_balance, 2))
-                table.add_row(user.name, f"{status} ${amount:.2f}")
+                table.add_row(user.name, f"{status} ${from_cents(abs(net_balance)):.2f}")
 
         if has_balances:
             console.print(table)
@@ -284,7 +285,7 @@ class SplitwiseApp:
             for t in transactions:
                 from_user = self.users[t["from"]].name
                 to_user = self.users[t["to"]].name
-                table.add_row(from_user, to_user, f"${t['amount']:.2f}")
+                table.add_row(from_user, to_user, f"${from_cents(t['amount']):.2f}")
 
             console.print(table)
 
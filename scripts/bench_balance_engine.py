@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+DividaFacil balance engine benchmark
+
+Times the pure-Python balance computations against the NumPy engine on synthetic groups
+with many expenses.
+
+Usage:
+    python scripts/bench_balance_engine.py --expenses 10000 50000 --members 50
+"""
+
+import argparse
+import copy
+import random
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+# Ensure project root is in sys.path for module imports
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.constants import BALANCE_ENGINE_NUMPY, BALANCE_ENGINE_PYTHON  # noqa: E402
+from src.models.expense import Expense  # noqa: E402
+from src.models.group import Group  # noqa: E402
+from src.models.installment import Installment  # noqa: E402
+from src.models.user import User  # noqa: E402
+from src.money import div_half_up  # noqa: E402
+from src.services import vectorized_balance_engine  # noqa: E402
+from src.services.expense_service import ExpenseService  # noqa: E402
+from src.services.portion_service import PortionService  # noqa: E402
+from src.settings import get_settings  # noqa: E402
+
+BENCHMARKS = {
+    "member balances (recompute)": lambda group: ExpenseService.recompute_group_balances(group),
+    "group nets (PortionService)": PortionService.group_net_balances,
+}
+
+
+def build_group(expense_count: int, member_count: int, seed: int = 42) -> Group:
+    """Synthetic group mixing EQUAL, EXACT and PERCENTAGE splits and installments."""
+    rng = random.Random(seed)
+    members = {
+        f"user-{i:04d}": User(id=f"user-{i:04d}", name=f"User {i}", email=f"user{i}@example.com")
+        for i in range(member_count)
+    }
+    ids = list(members)
+    expenses = []
+    for i in range(expense_count):
+        amount = rng.randint(500, 100000)  # cents
+        split_among = rng.sample(ids, rng.randint(2, min(member_count, 12)))
+        split_type = rng.choice(["EQUAL", "EQUAL", "EXACT", "PERCENTAGE"])
+        split_values = {}
+        if split_type == "EXACT":
+            share = amount // len(split_among)
+            split_values = {uid: share for uid in split_among}
+            split_values[split_among[-1]] = amount - share * (len(split_among) - 1)
+        elif split_type == "PERCENTAGE":
+            pct = round(100 / len(split_among), 2)
+            split_values = {uid: pct for uid in split_among}
+            split_values[split_among[-1]] = round(100 - pct * (len(split_among) - 1), 2)
+        expense = Expense(
+            id=f"expense-{i}",
+            amount=amount,
+            description=f"Expense {i}",
+            paid_by=rng.choice(split_among),
+            split_among=split_among,
+            split_type=split_type,
+            split_values=split_values,
+            created_at=datetime(2025, 1, 1),
+        )
+        if rng.random() < 0.1:
+            per = div_half_up(amount, 3)
+            expense.installments_count = 3
+            expense.installments = [
+                Installment(number=n + 1, due_date=date(2025, n + 1, 1), amount=per)
+                for n in range(3)
+            ]
+            expense.installments[-1].amount = amount - 2 * per
+            expense.installments[0].paid = rng.random() < 0.5
+        expenses.append(expense)
+    return Group(id="benchmark", name="Benchmark", members=members, expenses=expenses)
+
+
+def time_engine(engine: str, compute, group, repeat: int) -> float:
+    """Best-of-``repeat`` wall time of ``compute(group)`` with the given engine."""
+    get_settings().BALANCE_ENGINE = engine
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compute(group)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the balance engines")
+    parser.add_argument("--expenses", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--members", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not vectorized_balance_engine.NUMPY_AVAILABLE:
+        sys.exit("numpy is not installed; install it to benchmark the vectorized engine")
+
+    print(f"{'expenses':>9} {'computation':<28} {'python s':>9} {'numpy s':>9} {'speedup':>8}")
+    for expense_count in args.expenses:
+        group = build_group(expense_count, args.members)
+        for name, compute in BENCHMARKS.items():
+            python_s = time_engine(
+                BALANCE_ENGINE_PYTHON, compute, copy.deepcopy(group), args.repeat
+            )
+            numpy_s = time_engine(BALANCE_ENGINE_NUMPY, compute, copy.deepcopy(group), args.repeat)
+            print(
+                f"{expense_count:>9} {name:<28} {python_s:>9.3f} {numpy_s:>9.3f} "
+                f"{python_s / numpy_s:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
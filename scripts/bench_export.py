@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+DividaFacil group export benchmark
+
+Fills a throwaway SQLite database with one group of synthetic expenses, then streams it in
+every export format and reports the wall time, output size and peak Python memory
+(tracemalloc) of each export. Peak memory should stay flat as the expense count grows.
+
+Usage:
+    python scripts/bench_export.py --expenses 10000 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ensure project root is in sys.path for module imports
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+_DB_DIR = tempfile.mkdtemp(prefix="dividafacil-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/bench.db"
+
+from src.constants import EXPORT_CSV, EXPORT_JSONL, EXPORT_XLSX  # noqa: E402
+from src.models.expense import Expense  # noqa: E402
+from src.services.database_service import DatabaseService  # noqa: E402
+from src.services.expense_service import ExpenseService  # noqa: E402
+from src.services.export_service import ExportService  # noqa: E402
+
+
+def build_group(expense_count: int, seed: int = 42) -> str:
+    """Create a group of 8 members with ``expense_count`` expenses, some in installments."""
+    rng = random.Random(seed)
+    stamp = f"{expense_count}-{rng.randrange(10**9)}"
+    members = [
+        DatabaseService.create_user(f"User {i}", f"user{i}-{stamp}@example.com").id
+        for i in range(8)
+    ]
+    group = DatabaseService.create_group(f"Bench {expense_count}", members)
+    start = datetime(2020, 1, 1)
+    batch = []
+    for i in range(expense_count):
+        expense = Expense(
+            id=f"{stamp}-{i}",
+            amount=rng.randint(100, 50000),
+            description=f"Expense {i}",
+            paid_by=rng.choice(members),
+            split_among=rng.sample(members, rng.randint(2, len(members))),
+            created_at=start + timedelta(minutes=i),
+            installments_count=3 if i % 10 == 0 else 1,
+        )
+        ExpenseService.generate_installments(expense)
+        batch.append(expense)
+        if len(batch) == 5000:
+            DatabaseService.add_expenses_to_group(group.id, batch)
+            batch = []
+    DatabaseService.add_expenses_to_group(group.id, batch)
+    return group.id
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming group exports")
+    parser.add_argument("--expenses", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+
+    DatabaseService.initialize()
+    print(f"{'expenses':>9} {'format':>6} {'seconds':>8} {'MB out':>7} {'peak MB':>8}")
+    for expense_count in args.expenses:
+        group_id = build_group(expense_count)
+        for export_format in (EXPORT_CSV, EXPORT_JSONL, EXPORT_XLSX):
+            tracemalloc.start()
+            started = time.perf_counter()
+            size = sum(
+                len(chunk)
+                for chunk in ExportService.stream(
+                    DatabaseService.iter_group_expenses(group_id), export_format
+                )
+            )
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"{expense_count:>9} {export_format:>6} {elapsed:>8.2f} "
+                f"{size / 2**20:>7.1f} {peak / 2**20:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
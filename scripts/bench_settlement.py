@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+DividaFacil settlement strategy benchmark
+
+Compares the number of transfers and the wall time of each settlement strategy on synthetic
+groups of increasing size. Balances are built from small sub-groups that settle among
+themselves, as happens when a large group splits into tables or rooms, so there is something
+for the exact and heuristic strategies to find.
+
+Usage:
+    python scripts/bench_settlement.py --members 8 12 14 50 200 --budget-ms 50
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is in sys.path for module imports
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.constants import (  # noqa: E402
+    SETTLEMENT_EXACT,
+    SETTLEMENT_GREEDY,
+    SETTLEMENT_HEURISTIC,
+)
+from src.services.settlement_service import SettlementService  # noqa: E402
+from src.settings import get_settings  # noqa: E402
+
+STRATEGIES = (SETTLEMENT_GREEDY, SETTLEMENT_EXACT, SETTLEMENT_HEURISTIC)
+
+
+def build_nets(member_count: int, seed: int = 42) -> dict:
+    """Net balances in cents where members fall into zero-sum clusters of 2 to 5."""
+    rng = random.Random(seed)
+    nets = {}
+    while len(nets) < member_count:
+        left = member_count - len(nets)
+        size = rng.randint(2, 5)
+        if left - size < 2:
+            size = left
+        values = [rng.randint(-20000, 20000) or 1 for _ in range(size - 1)]
+        values.append(-sum(values))
+        for value in values:
+            nets[f"user-{len(nets):04d}"] = value
+    return nets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the settlement strategies")
+    parser.add_argument("--members", type=int, nargs="+", default=[8, 12, 14, 50, 200])
+    parser.add_argument("--budget-ms", type=float, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    settings.SETTLEMENT_TIME_BUDGET_MS = args.budget_ms
+
+    print(f"{'members':>8} {'strategy':<10} {'ran as':<10} {'transfers':>9} {'ms':>9}")
+    for member_count in args.members:
+        nets = build_nets(member_count)
+        for strategy in STRATEGIES:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                plan = SettlementService.plan(nets, strategy)
+                best = min(best, time.perf_counter() - start)
+            print(
+                f"{member_count:>8} {strategy:<10} {plan.strategy:<10} "
+                f"{len(plan.transfers):>9} {best * 1000:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
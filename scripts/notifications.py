@@ -6,8 +6,11 @@ CLI tool to manage installment payment notifications and send reminders.
 """
 
 import argparse
+import logging
 import os
+import signal
 import sys
+import threading
 from pathlib import Path
 
 # Ensure project root is in sys.path for module imports
@@ -15,8 +18,11 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from src.money import from_cents
+from src.services.database_service import DatabaseService
+from src.services.notification_scheduler import MetricsServer, NotificationScheduler
 from src.services.notification_service import NotificationService
-from src.state import GROUPS
+from src.settings import get_settings
 
 
 def setup_notification_service() -> NotificationService:
@@ -25,6 +31,7 @@ def setup_notification_service() -> NotificationService:
     smtp_port = int(os.getenv("SMTP_PORT", "587"))
     smtp_username = os.getenv("SMTP_USERNAME")
     smtp_password = os.getenv("SMTP_PASSWORD")
+    DatabaseService.initialize()
 
     return NotificationService(
         smtp_server=smtp_server,
@@ -37,24 +44,25 @@ def setup_notification_service() -> NotificationService:
 def cmd_check_overdue(args):
     """Check for overdue installments and optionally send notifications."""
     notification_service = setup_notification_service()
-    groups = dict(GROUPS.items())  # Convert to regular dict
 
     if args.report_only:
-        notification_service.print_overdue_report(groups)
+        notification_service.print_overdue_report()
+    elif args.enqueue_only:
+        queued = notification_service.enqueue_overdue_notifications()
+        print(f"📥 {queued} lembretes de parcelas em atraso adicionados à fila.")
     else:
-        sent_count = notification_service.send_overdue_notifications(groups)
+        sent_count = notification_service.send_overdue_notifications()
         print(f"📧 Enviadas {sent_count} notificações de parcelas em atraso.")
 
         if args.verbose:
-            notification_service.print_overdue_report(groups)
+            notification_service.print_overdue_report()
 
 
 def cmd_check_upcoming(args):
     """Check for upcoming installments and optionally send notifications."""
     notification_service = setup_notification_service()
-    groups = dict(GROUPS.items())  # Convert to regular dict
 
-    upcoming_items = notification_service.get_upcoming_installments(groups, args.days)
+    upcoming_items = notification_service.get_upcoming_installments(days_ahead=args.days)
 
     if args.report_only:
         if not upcoming_items:
@@ -76,9 +84,8 @@ def cmd_check_upcoming(args):
                 for item in items:
                     days_until = -item.days_overdue  # Convert back to positive
                     print(f"   • {item.expense.description} - {item.group.name}")
-                    print(
-                        f"     Parcela {item.installment.number}: R$ {item.installment.amount:.2f}"
-                    )
+                    amount = from_cents(item.installment.amount)
+                    print(f"     Parcela {item.installment.number}: R$ {amount:.2f}")
                     if days_until == 0:
                         print(
                             f"     Vence hoje! ({item.installment.due_date.strftime('%d/%m/%Y')})"
@@ -88,8 +95,11 @@ def cmd_check_upcoming(args):
                             f"     Vence em {days_until} dias ({item.installment.due_date.strftime('%d/%m/%Y')})"
                         )
                 print()
+    elif args.enqueue_only:
+        queued = notification_service.enqueue_upcoming_notifications(days_ahead=args.days)
+        print(f"📥 {queued} lembretes de parcelas vencendo adicionados à fila.")
     else:
-        sent_count = notification_service.send_upcoming_notifications(groups, args.days)
+        sent_count = notification_service.send_upcoming_notifications(days_ahead=args.days)
         print(f"📧 Enviadas {sent_count} notificações de parcelas vencendo.")
 
         if args.verbose:
@@ -97,6 +107,53 @@ def cmd_check_upcoming(args):
                 print(f"✅ Nenhuma parcela vencendo nos próximos {args.days} dias!")
 
 
+def cmd_dispatch(args):
+    """Deliver the reminders waiting in the notification outbox."""
+    notification_service = setup_notification_service()
+    sent_count = notification_service.dispatch_notifications(
+        kind=args.kind, chunk_users=args.chunk_users
+    )
+    print(f"📧 Enviadas {sent_count} notificações da fila.")
+
+
+def cmd_outbox_status(args):
+    """Show how many outbox reminders are in each status."""
+    setup_notification_service()
+    counts = DatabaseService.get_notification_outbox_counts()
+    if not counts:
+        print("📭 Fila de notificações vazia.")
+    for status, count in sorted(counts.items()):
+        print(f"{status:>8}: {count}")
+
+
+def cmd_daemon(args):
+    """Run the notification scheduler until SIGINT or SIGTERM."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    scheduler = NotificationScheduler(setup_notification_service(), interval_seconds=args.interval)
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    port = (
+        get_settings().NOTIFICATION_METRICS_PORT if args.metrics_port is None else args.metrics_port
+    )
+    metrics_server = None
+    if port:
+        metrics_server = MetricsServer(scheduler, port=port)
+        metrics_server.start()
+        print(f"📈 Saúde e métricas em http://localhost:{metrics_server.server_address[1]}/metrics")
+
+    try:
+        scheduler.run(stop)
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
+            metrics_server.server_close()
+    print(f"🛑 Agendador encerrado após {scheduler.ticks} ciclos.")
+
+
 def cmd_test_email(args):
     """Test email configuration by sending a test message."""
     notification_service = setup_notification_service()
@@ -136,6 +193,16 @@ Examples:
   
   # Check installments due in next 7 days
   python notifications.py upcoming --days 7
+
+  # Queue today's reminders now and deliver them in a separate run
+  python notifications.py overdue --enqueue-only
+  python notifications.py dispatch
+
+  # Count queued, sent and failed reminders
+  python notifications.py outbox
+
+  # Keep running: daily scan, incremental ticks and delivery, metrics on :9105
+  python notifications.py daemon
   
   # Test email configuration
   python notifications.py test-email user@example.com
@@ -157,6 +224,11 @@ Environment Variables:
     parser_overdue.add_argument(
         "--report-only", action="store_true", help="Only show report, do not send notifications"
     )
+    parser_overdue.add_argument(
+        "--enqueue-only",
+        action="store_true",
+        help="Only queue reminders in the outbox, deliver them later with dispatch",
+    )
     parser_overdue.add_argument(
         "--verbose",
         "-v",
@@ -175,6 +247,11 @@ Environment Variables:
     parser_upcoming.add_argument(
         "--report-only", action="store_true", help="Only show report, do not send notifications"
     )
+    parser_upcoming.add_argument(
+        "--enqueue-only",
+        action="store_true",
+        help="Only queue reminders in the outbox, deliver them later with dispatch",
+    )
     parser_upcoming.add_argument(
         "--verbose",
         "-v",
@@ -183,6 +260,36 @@ Environment Variables:
     )
     parser_upcoming.set_defaults(func=cmd_check_upcoming)
 
+    # Dispatch command
+    parser_dispatch = subparsers.add_parser(
+        "dispatch", help="Deliver queued reminders (resumes interrupted runs)"
+    )
+    parser_dispatch.add_argument(
+        "--kind", choices=["overdue", "upcoming"], help="Only deliver one kind of reminder"
+    )
+    parser_dispatch.add_argument(
+        "--chunk-users", type=int, help="Users whose reminders are sent per chunk"
+    )
+    parser_dispatch.set_defaults(func=cmd_dispatch)
+
+    # Outbox status command
+    parser_outbox = subparsers.add_parser("outbox", help="Show notification outbox status")
+    parser_outbox.set_defaults(func=cmd_outbox_status)
+
+    # Daemon command
+    parser_daemon = subparsers.add_parser(
+        "daemon", help="Run the notification scheduler (replaces cron jobs)"
+    )
+    parser_daemon.add_argument(
+        "--interval", type=float, help="Seconds between ticks (default: from settings)"
+    )
+    parser_daemon.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Health/metrics HTTP port, 0 to disable (default: from settings)",
+    )
+    parser_daemon.set_defaults(func=cmd_daemon)
+
     # Test email command
     parser_test = subparsers.add_parser("test-email", help="Test email configuration")
     parser_test.add_argument("email", help="Email address to send test message to")
@@ -1,19 +1,28 @@
 """Simple session-based authentication for DividaFacil."""
 
+import secrets
 from typing import Optional
 
-from fastapi import HTTPException, Request, status
+from fastapi import Header, HTTPException, Request, status
 
 from src.models.user import User
 from src.services.database_service import DatabaseService
+from src.services.user_cache import user_cache
+from src.settings import get_settings
 
 
 def get_current_user_from_session(request: Request) -> Optional[User]:
     """Get the current user from session. Returns None if not authenticated."""
     user_id = request.session.get("user_id")
-    if user_id:
-        return DatabaseService.get_user(user_id)
-    return None
+    if not user_id:
+        return None
+
+    user = user_cache.get(user_id)
+    if user is None:
+        user = DatabaseService.get_user(user_id)
+        if user:
+            user_cache.set(user)
+    return user
 
 
 def require_authentication(request: Request) -> User:
@@ -26,6 +35,15 @@ def require_authentication(request: Request) -> User:
     return user
 
 
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Require the configured admin token. Admin endpoints are hidden when none is set."""
+    expected = get_settings().ADMIN_TOKEN
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
 def login_user(request: Request, user: User) -> None:
     """Log in a user by storing their ID in the session."""
     request.session["user_id"] = user.id
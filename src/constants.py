@@ -4,7 +4,7 @@ from decimal import Decimal
 from typing import Final
 
 # Expense calculation constants
-MIN_BALANCE_THRESHOLD: Final[Decimal] = Decimal("0.01")
+MIN_BALANCE_THRESHOLD: Final[int] = 1  # cents
 DECIMAL_PLACES: Final[int] = 2
 PERCENTAGE_BASE: Final[Decimal] = Decimal("100.0")
 
@@ -25,6 +25,48 @@ REDIRECT_STATUS_CODE: Final[int] = 303
 # Database constants
 DEFAULT_DATABASE_URL: Final[str] = "sqlite:///./dividafacil.db"
 
+# Balance materialization modes (see Settings.BALANCE_MATERIALIZATION)
+BALANCE_MATERIALIZATION_ON_WRITE: Final[str] = "on_write"
+BALANCE_MATERIALIZATION_ON_READ: Final[str] = "on_read"
+
+# Balance engines (see Settings.BALANCE_ENGINE)
+BALANCE_ENGINE_PYTHON: Final[str] = "python"
+BALANCE_ENGINE_NUMPY: Final[str] = "numpy"
+BALANCE_ENGINE_AUTO: Final[str] = "auto"
+
+# Settlement strategies (see Settings.SETTLEMENT_STRATEGY)
+SETTLEMENT_AUTO: Final[str] = "auto"
+SETTLEMENT_GREEDY: Final[str] = "greedy"
+SETTLEMENT_EXACT: Final[str] = "exact"
+SETTLEMENT_HEURISTIC: Final[str] = "heuristic"
+
+# Group event types pushed by GET /api/groups/{id}/events
+EVENT_EXPENSE_ADDED: Final[str] = "expense_added"
+EVENT_EXPENSE_DELETED: Final[str] = "expense_deleted"
+EVENT_EXPENSES_IMPORTED: Final[str] = "expenses_imported"
+EVENT_INSTALLMENT_PAID: Final[str] = "installment_paid"
+EVENT_MEMBER_ADDED: Final[str] = "member_added"
+EVENT_BALANCES: Final[str] = "balances"
+EVENT_GROUP_DELETED: Final[str] = "group_deleted"
+EVENT_RESYNC: Final[str] = "resync"  # Events were dropped; refetch the group
+
+# Event brokers (see Settings.EVENT_BROKER)
+EVENT_BROKER_MEMORY: Final[str] = "memory"
+
+# Group export formats (GET /api/groups/{id}/export)
+EXPORT_CSV: Final[str] = "csv"
+EXPORT_JSONL: Final[str] = "jsonl"
+EXPORT_XLSX: Final[str] = "xlsx"
+
+# Notification kinds and outbox statuses (see NotificationOutboxRepository)
+NOTIFICATION_OVERDUE: Final[str] = "overdue"
+NOTIFICATION_UPCOMING: Final[str] = "upcoming"
+OUTBOX_PENDING: Final[str] = "pending"
+OUTBOX_SENDING: Final[str] = "sending"  # Claimed by a dispatch; never picked up again
+OUTBOX_SENT: Final[str] = "sent"
+OUTBOX_FAILED: Final[str] = "failed"  # Out of attempts
+OUTBOX_SKIPPED: Final[str] = "skipped"  # Paid or deleted before it was dispatched
+
 # Static files constants
 DEFAULT_STATIC_DIR: Final[str] = "static"
 
@@ -5,16 +5,29 @@ from sqlalchemy import (
     JSON,
     Boolean,
     Column,
+    Date,
     DateTime,
-    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
+    UniqueConstraint,
     create_engine,
+    event,
 )
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 
+from src.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    async_pool_metrics,
+    instrument_pool,
+    pool_metrics,
+)
+from src.settings import get_settings
+
 # Database URL - default to SQLite local file, overridable via env
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dividafacil.db")
 
@@ -25,17 +38,71 @@ elif DATABASE_URL.startswith("postgresql://") and "+" not in DATABASE_URL:
     # Ensure psycopg2 driver explicit for reliability
     DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg2://", 1)
 
+# Async driver URL for the asyncio engine used by the API routers
+if DATABASE_URL.startswith("sqlite:"):
+    ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite:", "sqlite+aiosqlite:", 1)
+else:
+    ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+
+settings = get_settings()
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+IS_SQLITE_MEMORY = IS_SQLITE and (DATABASE_URL in {"sqlite://", "sqlite:///:memory:"})
+
 # Engine setup depending on backend
 engine_kwargs = {}
-if DATABASE_URL.startswith("sqlite"):
+async_engine_kwargs = {}
+if IS_SQLITE:
     # check_same_thread only valid for SQLite
     engine_kwargs["connect_args"] = {"check_same_thread": False}
 else:
     # Pre-ping helps long-lived connections on hosted DBs
     engine_kwargs["pool_pre_ping"] = True
+    async_engine_kwargs["pool_pre_ping"] = True
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        engine_kwargs["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+        async_engine_kwargs["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+
+if not IS_SQLITE_MEMORY:
+    # In-memory SQLite keeps its own single-connection pool
+    # Each engine has its own pool; most requests go through the async one
+    pool_kwargs = dict(pool_timeout=settings.DB_POOL_TIMEOUT, pool_recycle=settings.DB_POOL_RECYCLE)
+    engine_kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_SYNC_POOL_SIZE,
+        max_overflow=settings.DB_SYNC_MAX_OVERFLOW,
+        **pool_kwargs,
+    )
+    async_engine_kwargs.update(
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        **pool_kwargs,
+    )
 
 engine = create_engine(DATABASE_URL, **engine_kwargs)
+instrument_pool(engine.pool, pool_metrics)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_kwargs)
+instrument_pool(async_engine.sync_engine.pool, async_pool_metrics)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply journal/synchronous pragmas to every new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    if not IS_SQLITE_MEMORY and settings.SQLITE_JOURNAL_MODE:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    if settings.SQLITE_SYNCHRONOUS:
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.close()
+
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 # Association table for group members (many-to-many)
@@ -66,7 +133,7 @@ class UserDB(Base):
     )  # For authentication, nullable for backward compatibility
     reset_token = Column(String, nullable=True)  # For password reset
     reset_token_expiry = Column(DateTime, nullable=True)  # Reset token expiration
-    balance = Column(JSON, default=dict)  # Store as JSON: {"user_id": amount}
+    balance = Column(JSON, default=dict)  # Store as JSON: {"user_id": amount_in_cents}
     notification_preferences = Column(
         JSON,
         default=lambda: {"email_overdue": True, "email_upcoming": True, "days_ahead_reminder": 3},
@@ -87,10 +154,17 @@ class GroupDB(Base):
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # False until the balance ledger has been built from this group's expenses
+    balances_materialized = Column(Boolean, default=False, nullable=False)
+    # Bumped on every change to the group's members, expenses or installments; backs the
+    # ETag/Last-Modified validators of group and expense list responses
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     members = relationship("UserDB", secondary=group_members, back_populates="groups")
     expenses = relationship("ExpenseDB", back_populates="group", cascade="all, delete-orphan")
+    balance_entries = relationship("GroupBalanceDB", cascade="all, delete-orphan")
 
 
 class ExpenseDB(Base):
@@ -98,7 +172,7 @@ class ExpenseDB(Base):
 
     id = Column(String, primary_key=True)
     description = Column(String, nullable=False)
-    amount = Column(Float, nullable=False)
+    amount_cents = Column(Integer, nullable=False)
     paid_by = Column(
         String, ForeignKey("users.id"), nullable=False, index=True
     )  # Index for user expense queries
@@ -110,12 +184,14 @@ class ExpenseDB(Base):
     )  # Index for group expense queries
     category = Column(String, nullable=True)  # expense category
     split_type = Column(String, nullable=False)  # EQUAL, EXACT, PERCENTAGE
-    split_values = Column(JSON, default=dict)  # Store as JSON: {"user_id": value}
+    # Store as JSON: {"user_id": value}, cents for EXACT and percentages for PERCENTAGE
+    split_values = Column(JSON, default=dict)
     created_at = Column(
         DateTime, default=datetime.utcnow, index=True
     )  # Index for date-based queries
     installments_count = Column(Integer, default=1)
     first_due_date = Column(DateTime)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relationships
     payer = relationship("UserDB", foreign_keys=[paid_by], back_populates="paid_expenses")
@@ -135,7 +211,7 @@ class InstallmentDB(Base):
         String, ForeignKey("expenses.id"), nullable=False, index=True
     )  # Index for expense installment queries
     number = Column(Integer, nullable=False)
-    amount = Column(Float, nullable=False)
+    amount_cents = Column(Integer, nullable=False)
     due_date = Column(
         DateTime, nullable=False, index=True
     )  # Index for due date queries (notifications)
@@ -146,6 +222,56 @@ class InstallmentDB(Base):
     expense = relationship("ExpenseDB", back_populates="installments")
 
 
+class GroupBalanceDB(Base):
+    """Net balance between a pair of members inside a group.
+
+    Each pair is stored once with ``user_id < other_user_id``. A positive amount (in cents)
+    means ``user_id`` owes ``other_user_id``; a negative amount means the opposite.
+    """
+
+    __tablename__ = "group_balances"
+
+    group_id = Column(String, ForeignKey("groups.id"), primary_key=True)
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    other_user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    amount_cents = Column(Integer, nullable=False, default=0)
+
+
+class NotificationOutboxDB(Base):
+    """One reminder about one installment, for one member, on one day.
+
+    Rows are enqueued once per ``(user, installment, kind, day)`` and move from pending to
+    sending (claimed by a dispatch under ``claim_id``) to sent, failed or skipped. There are no
+    foreign keys: the outbox is a delivery log that outlives deleted expenses and users.
+    """
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "expense_id",
+            "installment_number",
+            "kind",
+            "notify_on",
+            name="uq_notification_outbox_key",
+        ),
+        Index("ix_notification_outbox_status_user", "status", "user_id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(String, nullable=False)
+    expense_id = Column(String, nullable=False)
+    installment_number = Column(Integer, nullable=False)
+    kind = Column(String, nullable=False)  # overdue or upcoming
+    notify_on = Column(Date, nullable=False)
+    status = Column(String, nullable=False, default="pending")
+    claim_id = Column(String, nullable=True, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
 def get_db():
     """Dependency to get database session."""
     db = SessionLocal()
@@ -155,6 +281,21 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency to get a request-scoped asyncio session.
+
+    The whole request shares one session and one transaction: it is committed once after the
+    handler returns, or rolled back if the handler raises.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
 def create_tables():
     """Create all tables in the database."""
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,75 @@
+"""ETag and Last-Modified validators for conditional GETs on versioned resources."""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Clients may reuse a stored response only after revalidating it with the server
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(version: int, *variant: object) -> str:
+    """Build a weak ETag from a resource version and whatever else shapes the representation.
+
+    ``variant`` covers the user and query parameters, so e.g. two pages of the same expense
+    list never share a tag.
+    """
+    if not variant:
+        return f'W/"{version}"'
+    digest = hashlib.sha1(repr(variant).encode()).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+
+def format_http_date(moment: datetime) -> str:
+    """Format a naive UTC or aware datetime as an HTTP date."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return format_datetime(moment.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Whether the request's validators still match the current representation.
+
+    ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only consulted without it.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: W/"x" and "x" match
+        opaque = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = last_modified
+        if modified.tzinfo is None:
+            modified = modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have whole-second precision
+        return modified.replace(microsecond=0) <= since
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> None:
+    """Attach the cache validators to a response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_http_date(last_modified)
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    """An empty 304 response carrying the current validators."""
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified)
+    return response
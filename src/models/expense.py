@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from ..money import from_cents
 from .installment import Installment
 
 
@@ -10,19 +11,22 @@ class Expense:
     """Represents an expense in the Splitwise application."""
 
     id: str
-    amount: float
+    amount: int  # in cents
     description: str
     paid_by: str  # user_id who paid
     split_among: List[str]  # List of user_ids
     created_by: Optional[str] = None  # user_id who created this expense
     category: Optional[str] = None  # expense category (food, transport, etc.)
     split_type: str = "EQUAL"  # 'EQUAL', 'EXACT', or 'PERCENTAGE'
-    split_values: Dict[str, float] = field(default_factory=dict)  # user_id -> amount/percentage
+    # user_id -> cents (EXACT) or percentage (PERCENTAGE)
+    split_values: Dict[str, float] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.now)
     # Installments support
     installments: List[Installment] = field(default_factory=list)
     installments_count: int = 1
     first_due_date: Optional[datetime] = None
+    # Bumped on every edit; keys the cached split portions (see PortionService)
+    version: int = 1
 
     def validate_split(self):
         """Validate that the split values are correct based on split type."""
@@ -33,9 +37,10 @@ class Expense:
 
         elif self.split_type == "EXACT":
             total = sum(self.split_values.values())
-            if abs(total - self.amount) > 0.01:  # Allow for floating point errors
+            if total != self.amount:
                 raise ValueError(
-                    f"Sum of exact splits ({total}) does not match expense amount ({self.amount})"
+                    f"Sum of exact splits ({from_cents(total):.2f}) does not match expense "
+                    f"amount ({from_cents(self.amount):.2f})"
                 )
 
         elif self.split_type == "PERCENTAGE":
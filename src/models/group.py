@@ -1,10 +1,25 @@
 from dataclasses import dataclass, field
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, List, Optional
 
 from .expense import Expense
 from .user import User
 
 
+@dataclass
+class GroupSummary:
+    """A group's members, expense totals and net balances, without its expenses."""
+
+    id: str
+    name: str
+    member_names: Dict[str, str] = field(default_factory=dict)  # user_id -> name (may be empty)
+    member_count: int = 0
+    expense_count: int = 0
+    total_amount: int = 0  # in cents
+    last_activity: Optional[datetime] = None  # latest expense, or the group's creation
+    balances: Dict[str, int] = field(default_factory=dict)  # user_id -> net cents owed
+
+
 @dataclass
 class Group:
     """Represents a group of users sharing expenses."""
@@ -42,3 +57,12 @@ class Group:
         return [
             exp for exp in self.expenses if exp.paid_by == user_id or user_id in exp.split_among
         ]
+
+
+@dataclass
+class GroupVersion:
+    """Cache validators of a group, plus whether the requesting user is a member."""
+
+    version: int
+    updated_at: Optional[datetime]
+    is_member: bool = False
@@ -9,6 +9,6 @@ class Installment:
 
     number: int
     due_date: date
-    amount: float
+    amount: int  # in cents
     paid: bool = False
     paid_at: Optional[datetime] = None
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from datetime import date
+
+from .expense import Expense
+from .group import Group
+from .installment import Installment
+from .user import User
+
+
+@dataclass
+class OutboxItem:
+    """A claimed notification outbox row with the installment it reminds about."""
+
+    id: int
+    kind: str  # overdue or upcoming
+    notify_on: date
+    user: User
+    expense: Expense
+    installment: Installment
+    group: Group
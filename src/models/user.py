@@ -10,7 +10,7 @@ class User:
     id: str
     name: str
     email: str
-    balance: Dict[str, float] = field(default_factory=dict)  # user_id -> amount owed
+    balance: Dict[str, int] = field(default_factory=dict)  # user_id -> cents owed
     notification_preferences: Dict[str, Union[bool, int]] = field(
         default_factory=lambda: {
             "email_overdue": True,
@@ -22,11 +22,11 @@ class User:
     reset_token: Optional[str] = None  # For password reset
     reset_token_expiry: Optional[datetime] = None  # Reset token expiration
 
-    def update_balance(self, user_id: str, amount: float):
+    def update_balance(self, user_id: str, amount: int):
         """Update the balance with another user.
 
         Args:
             user_id: ID of the other user
-            amount: Positive amount means this user owes the other user
+            amount: Cents; a positive amount means this user owes the other user
         """
         self.balance[user_id] = self.balance.get(user_id, 0) + amount
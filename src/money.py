@@ -0,0 +1,35 @@
+"""Fixed-point money: every amount below the API schemas is an integer number of cents."""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Union
+
+Cents = int
+
+
+def to_cents(value: Union[float, int, str, Decimal]) -> Cents:
+    """Convert an amount in currency units to cents, rounding half away from zero."""
+    scaled = Decimal(str(value)) * 100
+    return int(scaled.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: Cents) -> float:
+    """Convert cents back to currency units for display and API responses."""
+    return cents / 100
+
+
+def div_half_up(numerator: int, denominator: int) -> int:
+    """Integer division rounded half away from zero, without going through floats."""
+    quotient, remainder = divmod(abs(numerator), abs(denominator))
+    if 2 * remainder >= abs(denominator):
+        quotient += 1
+    return -quotient if (numerator < 0) != (denominator < 0) else quotient
+
+
+def from_cents_map(amounts: Dict[str, Cents]) -> Dict[str, float]:
+    """Convert a ``user_id -> cents`` mapping (balances, exact splits) to currency units."""
+    return {user_id: from_cents(cents) for user_id, cents in amounts.items()}
+
+
+def to_cents_map(amounts: Dict[str, float]) -> Dict[str, Cents]:
+    """Convert a ``user_id -> amount`` mapping in currency units to cents."""
+    return {user_id: to_cents(amount) for user_id, amount in amounts.items()}
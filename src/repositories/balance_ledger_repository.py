@@ -0,0 +1,233 @@
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.database import GroupBalanceDB, GroupDB, group_members
+from src.models.expense import Expense
+from src.models.group import Group
+from src.money import Cents
+from src.services.portion_service import PortionService
+
+
+class BalanceLedgerRepository:
+    """Persisted per-group, per-pair net balances.
+
+    The ledger is kept up to date with deltas on every expense write so that reads never
+    have to walk a group's full expense history. Deltas are added by the database
+    (``amount_cents = amount_cents + delta``), so concurrent writes to a pair never lose one.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def is_materialized(self, group_id: str) -> bool:
+        """Check whether the ledger for a group has been built."""
+        materialized = (
+            self.db.query(GroupDB.balances_materialized).filter(GroupDB.id == group_id).scalar()
+        )
+        return bool(materialized)
+
+    def apply_expense(self, group_id: str, expense: Expense, sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) an expense's contribution to the ledger."""
+        shares = PortionService.owed_shares(expense)
+        signed = {user_id: sign * amount for user_id, amount in shares.items()}
+        self.apply_shares(group_id, expense.paid_by, signed)
+
+    def apply_shares(self, group_id: str, payer_id: str, shares: Dict[str, Cents]) -> None:
+        """Record that each user in ``shares`` owes ``payer_id`` the given (signed) cents."""
+        if not self.is_materialized(group_id):
+            # The next read rebuilds the ledger from scratch, including this change
+            return
+
+        deltas: Dict[Tuple[str, str], Cents] = {}
+        self._add_deltas(deltas, payer_id, shares)
+        self._apply_deltas(group_id, deltas)
+
+    def apply_expenses(self, group_id: str, expenses: Iterable[Expense]) -> None:
+        """Add several expenses to the ledger, writing each touched pair once."""
+        if not self.is_materialized(group_id):
+            return
+
+        deltas: Dict[Tuple[str, str], Cents] = {}
+        for expense in expenses:
+            self._add_deltas(deltas, expense.paid_by, PortionService.owed_shares(expense))
+        self._apply_deltas(group_id, deltas)
+
+    def _add_deltas(
+        self, deltas: Dict[Tuple[str, str], Cents], payer_id: str, shares: Dict[str, Cents]
+    ) -> None:
+        for user_id, amount in shares.items():
+            if user_id == payer_id or not amount:
+                continue
+            key, signed = self._canonical(user_id, payer_id, amount)
+            deltas[key] = deltas.get(key, 0) + signed
+
+    def _apply_deltas(self, group_id: str, deltas: Dict[Tuple[str, str], Cents]) -> None:
+        if not deltas:
+            return
+
+        rows = [
+            {
+                "group_id": group_id,
+                "user_id": user_id,
+                "other_user_id": other_user_id,
+                "amount_cents": delta,
+            }
+            for (user_id, other_user_id), delta in deltas.items()
+        ]
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            statement = dialect_insert(GroupBalanceDB)
+            statement = statement.on_conflict_do_update(
+                index_elements=[
+                    GroupBalanceDB.group_id,
+                    GroupBalanceDB.user_id,
+                    GroupBalanceDB.other_user_id,
+                ],
+                set_={
+                    "amount_cents": GroupBalanceDB.amount_cents + statement.excluded.amount_cents
+                },
+            )
+            self.db.execute(statement, rows)
+            return
+
+        missing = []
+        for row in rows:
+            result = self.db.execute(
+                update(GroupBalanceDB)
+                .where(
+                    GroupBalanceDB.group_id == group_id,
+                    GroupBalanceDB.user_id == row["user_id"],
+                    GroupBalanceDB.other_user_id == row["other_user_id"],
+                )
+                .values(amount_cents=GroupBalanceDB.amount_cents + row["amount_cents"])
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                missing.append(row)
+        if missing:
+            self.db.execute(insert(GroupBalanceDB), missing)
+
+    def get_member_balances(self, group_id: str) -> Dict[str, Dict[str, Cents]]:
+        """Get user_id -> {other_user_id: cents owed} for every pair in the group."""
+        balances: Dict[str, Dict[str, Cents]] = {}
+        # Plain columns, not ORM rows: the amounts are updated in SQL, behind the identity map
+        rows = self.db.execute(
+            select(
+                GroupBalanceDB.user_id, GroupBalanceDB.other_user_id, GroupBalanceDB.amount_cents
+            ).where(GroupBalanceDB.group_id == group_id)
+        ).all()
+        for row in rows:
+            balances.setdefault(row.user_id, {})[row.other_user_id] = row.amount_cents
+            balances.setdefault(row.other_user_id, {})[row.user_id] = -row.amount_cents
+        return balances
+
+    def get_unmaterialized_group_ids(self, user_id: str) -> List[str]:
+        """IDs of the user's groups whose ledger has not been built yet."""
+        rows = (
+            self.db.query(GroupDB.id)
+            .join(group_members, group_members.c.group_id == GroupDB.id)
+            .filter(group_members.c.user_id == user_id, GroupDB.balances_materialized.is_(False))
+            .all()
+        )
+        return [row.id for row in rows]
+
+    def get_counterparty_balances(self, user_id: str) -> Dict[str, Cents]:
+        """Get other_user_id -> cents the user owes them, summed over every group.
+
+        The aggregation runs in the database. Negative amounts mean the other user owes.
+        """
+        is_low = GroupBalanceDB.user_id == user_id
+        counterparty = case((is_low, GroupBalanceDB.other_user_id), else_=GroupBalanceDB.user_id)
+        owed = case((is_low, GroupBalanceDB.amount_cents), else_=-GroupBalanceDB.amount_cents)
+        rows = (
+            self.db.query(counterparty.label("counterparty"), func.sum(owed).label("owed"))
+            .filter((GroupBalanceDB.user_id == user_id) | (GroupBalanceDB.other_user_id == user_id))
+            .group_by(counterparty)
+            .all()
+        )
+        return {row.counterparty: row.owed for row in rows if row.owed}
+
+    def get_consolidated_nets(self, user_id: str) -> Dict[str, Cents]:
+        """Get user_id -> net cents owed, summed over every group the given user belongs to.
+
+        Covers every member of those groups, so debts can be settled across groups.
+        Positive amounts mean the member owes.
+        """
+        user_groups = select(group_members.c.group_id).where(group_members.c.user_id == user_id)
+        nets: Dict[str, Cents] = {}
+        for column, sign in ((GroupBalanceDB.user_id, 1), (GroupBalanceDB.other_user_id, -1)):
+            rows = (
+                self.db.query(column, func.sum(GroupBalanceDB.amount_cents))
+                .filter(GroupBalanceDB.group_id.in_(user_groups))
+                .group_by(column)
+                .all()
+            )
+            for member_id, total in rows:
+                nets[member_id] = nets.get(member_id, 0) + sign * total
+        return nets
+
+    def get_group_nets(self, group_ids: List[str]) -> Dict[str, Dict[str, Cents]]:
+        """Get group_id -> {member_id: net cents owed} for the current members of each group.
+
+        Each member's pairs are summed in the database, so no expense is loaded. Positive
+        amounts mean the member owes; members without pairs are reported as 0.
+        """
+        nets: Dict[str, Dict[str, Cents]] = {group_id: {} for group_id in group_ids}
+        if not group_ids:
+            return nets
+        for group_id, user_id in self.db.execute(
+            select(group_members.c.group_id, group_members.c.user_id).where(
+                group_members.c.group_id.in_(group_ids)
+            )
+        ):
+            nets[group_id][user_id] = 0
+
+        for column, sign in ((GroupBalanceDB.user_id, 1), (GroupBalanceDB.other_user_id, -1)):
+            rows = (
+                self.db.query(
+                    GroupBalanceDB.group_id, column, func.sum(GroupBalanceDB.amount_cents)
+                )
+                .filter(GroupBalanceDB.group_id.in_(group_ids))
+                .group_by(GroupBalanceDB.group_id, column)
+                .all()
+            )
+            for group_id, member_id, total in rows:
+                if member_id in nets[group_id]:
+                    nets[group_id][member_id] += sign * total
+        return nets
+
+    def rebuild(self, group: Group) -> None:
+        """Rebuild a group's ledger from its full expense history."""
+        totals: Dict[Tuple[str, str], Cents] = {}
+        for expense in group.expenses:
+            for user_id, owed in PortionService.owed_shares(expense).items():
+                key, signed = self._canonical(user_id, expense.paid_by, owed)
+                totals[key] = totals.get(key, 0) + signed
+
+        self.db.query(GroupBalanceDB).filter(GroupBalanceDB.group_id == group.id).delete()
+        for (user_id, other_user_id), amount in totals.items():
+            self.db.add(
+                GroupBalanceDB(
+                    group_id=group.id,
+                    user_id=user_id,
+                    other_user_id=other_user_id,
+                    amount_cents=amount,
+                )
+            )
+        self.db.query(GroupDB).filter(GroupDB.id == group.id).update(
+            {GroupDB.balances_materialized: True}
+        )
+        self.db.flush()
+
+    @staticmethod
+    def _canonical(
+        debtor_id: str, creditor_id: str, amount: Cents
+    ) -> Tuple[Tuple[str, str], Cents]:
+        """Map "debtor owes creditor amount" onto the stored (low_id, high_id) orientation."""
+        if debtor_id < creditor_id:
+            return (debtor_id, creditor_id), amount
+        return (creditor_id, debtor_id), -amount
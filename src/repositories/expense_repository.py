@@ -1,10 +1,22 @@
 import uuid
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from sqlalchemy import Select, and_, insert, or_, select
 from sqlalchemy.orm import Session, selectinload
 
-from src.database import ExpenseDB, InstallmentDB, UserDB
+from src.database import (
+    ExpenseDB,
+    GroupDB,
+    InstallmentDB,
+    UserDB,
+    expense_split_among,
+    group_members,
+)
 from src.models.expense import Expense, Installment
+from src.models.group import Group
+from src.models.user import User
+from src.pagination import CursorKey
 
 
 class ExpenseRepository:
@@ -16,7 +28,7 @@ class ExpenseRepository:
         db_expense = ExpenseDB(
             id=expense.id,
             description=expense.description,
-            amount=expense.amount,
+            amount_cents=expense.amount,
             paid_by=expense.paid_by,
             created_by=expense.created_by,
             group_id=group_id,
@@ -26,6 +38,7 @@ class ExpenseRepository:
             created_at=expense.created_at,
             installments_count=expense.installments_count,
             first_due_date=expense.first_due_date,
+            version=expense.version,
         )
         self.db.add(db_expense)
 
@@ -39,17 +52,75 @@ class ExpenseRepository:
                 id=str(uuid.uuid4()),
                 expense_id=expense.id,
                 number=installment.number,
-                amount=installment.amount,
+                amount_cents=installment.amount,
                 due_date=installment.due_date,
                 paid=installment.paid,
                 paid_at=installment.paid_at,
             )
             self.db.add(db_installment)
 
-        self.db.commit()
+        self.db.flush()
+        self._bump_group_version(group_id)
         self.db.refresh(db_expense)
         return self._to_domain_model(db_expense)
 
+    def bulk_create(self, expenses: List[Expense], group_id: str) -> int:
+        """Insert many new expenses with one executemany per table.
+
+        Unlike ``create``, members in ``split_among`` are not looked up again; callers validate
+        them first.
+        """
+        if not expenses:
+            return 0
+
+        self.db.execute(
+            insert(ExpenseDB),
+            [
+                {
+                    "id": expense.id,
+                    "description": expense.description,
+                    "amount_cents": expense.amount,
+                    "paid_by": expense.paid_by,
+                    "created_by": expense.created_by,
+                    "group_id": group_id,
+                    "category": expense.category,
+                    "split_type": expense.split_type,
+                    "split_values": expense.split_values,
+                    "created_at": expense.created_at,
+                    "installments_count": expense.installments_count,
+                    "first_due_date": expense.first_due_date,
+                    "version": expense.version,
+                }
+                for expense in expenses
+            ],
+        )
+        self.db.execute(
+            insert(expense_split_among),
+            [
+                {"expense_id": expense.id, "user_id": user_id}
+                for expense in expenses
+                for user_id in dict.fromkeys(expense.split_among)
+            ],
+        )
+        installment_rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "expense_id": expense.id,
+                "number": installment.number,
+                "amount_cents": installment.amount,
+                "due_date": installment.due_date,
+                "paid": installment.paid,
+                "paid_at": installment.paid_at,
+            }
+            for expense in expenses
+            for installment in expense.installments
+        ]
+        if installment_rows:
+            self.db.execute(insert(InstallmentDB), installment_rows)
+
+        self._bump_group_version(group_id)
+        return len(expenses)
+
     def get_by_id(self, expense_id: str) -> Optional[Expense]:
         """Get expense by ID with all relationships loaded."""
         db_expense = (
@@ -62,6 +133,10 @@ class ExpenseRepository:
         )
         return self._to_domain_model(db_expense) if db_expense else None
 
+    def get_group_id(self, expense_id: str) -> Optional[str]:
+        """Get the ID of the group an expense belongs to."""
+        return self.db.query(ExpenseDB.group_id).filter(ExpenseDB.id == expense_id).scalar()
+
     def get_by_group_id(self, group_id: str) -> List[Expense]:
         """Get all expenses for a group."""
         db_expenses = (
@@ -74,6 +149,119 @@ class ExpenseRepository:
         )
         return [self._to_domain_model(db_expense) for db_expense in db_expenses]
 
+    def list_for_group(
+        self,
+        group_id: str,
+        limit: int,
+        after: Optional[CursorKey] = None,
+        category: Optional[str] = None,
+        paid_by: Optional[str] = None,
+        created_by: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> List[Expense]:
+        """Get a page of a group's expenses, newest first, with every filter applied in SQL.
+
+        Pages are keyed on ``(created_at, id)``: ``after`` is the key of the last expense of
+        the previous page, so pages stay stable while new expenses are added. Expenses with
+        no recorded creator count as created by their payer.
+        """
+        query = self.db.query(ExpenseDB).filter(ExpenseDB.group_id == group_id)
+        if category is not None:
+            query = query.filter(ExpenseDB.category == category)
+        if paid_by is not None:
+            query = query.filter(ExpenseDB.paid_by == paid_by)
+        if created_by is not None:
+            query = query.filter(
+                or_(
+                    ExpenseDB.created_by == created_by,
+                    and_(ExpenseDB.created_by.is_(None), ExpenseDB.paid_by == created_by),
+                )
+            )
+        if created_from is not None:
+            query = query.filter(ExpenseDB.created_at >= created_from)
+        if created_before is not None:
+            query = query.filter(ExpenseDB.created_at < created_before)
+        if after is not None:
+            after_created_at, after_id = after
+            query = query.filter(
+                or_(
+                    ExpenseDB.created_at < after_created_at,
+                    and_(ExpenseDB.created_at == after_created_at, ExpenseDB.id < after_id),
+                )
+            )
+
+        db_expenses = (
+            query.options(
+                selectinload(ExpenseDB.split_among_users), selectinload(ExpenseDB.installments)
+            )
+            .order_by(ExpenseDB.created_at.desc(), ExpenseDB.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [self._to_domain_model(db_expense) for db_expense in db_expenses]
+
+    def iter_for_export(self, group_id: str, batch_size: int = 500) -> Iterator[Expense]:
+        """Yield every expense of a group, oldest first, with its split members and installments.
+
+        Expenses are read through a server-side cursor (``yield_per``) as plain rows, never as
+        ORM objects held by the session, and each batch fetches its split members and
+        installments with one query apiece. Memory stays bounded by ``batch_size`` however
+        many expenses the group has.
+        """
+        expenses = ExpenseDB.__table__
+        installments = InstallmentDB.__table__
+        result = self.db.execute(
+            select(expenses)
+            .where(expenses.c.group_id == group_id)
+            .order_by(expenses.c.created_at, expenses.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for rows in result.partitions():
+            expense_ids = [row.id for row in rows]
+            split_among: Dict[str, List[str]] = {expense_id: [] for expense_id in expense_ids}
+            for expense_id, user_id in self.db.execute(
+                select(expense_split_among.c.expense_id, expense_split_among.c.user_id).where(
+                    expense_split_among.c.expense_id.in_(expense_ids)
+                )
+            ):
+                split_among[expense_id].append(user_id)
+            installments_by_expense: Dict[str, List[Installment]] = {
+                expense_id: [] for expense_id in expense_ids
+            }
+            for row in self.db.execute(
+                select(installments)
+                .where(installments.c.expense_id.in_(expense_ids))
+                .order_by(installments.c.expense_id, installments.c.number)
+            ):
+                installments_by_expense[row.expense_id].append(
+                    Installment(
+                        number=row.number,
+                        amount=row.amount_cents,
+                        due_date=row.due_date,
+                        paid=bool(row.paid),
+                        paid_at=row.paid_at,
+                    )
+                )
+
+            for row in rows:
+                yield Expense(
+                    id=row.id,
+                    description=row.description,
+                    amount=row.amount_cents,
+                    paid_by=row.paid_by,
+                    created_by=row.created_by,
+                    split_among=split_among[row.id],
+                    category=row.category,
+                    split_type=row.split_type,
+                    split_values=row.split_values or {},
+                    created_at=row.created_at,
+                    installments_count=row.installments_count,
+                    first_due_date=row.first_due_date,
+                    installments=installments_by_expense[row.id],
+                    version=row.version or 1,
+                )
+
     def update(self, expense: Expense) -> Expense:
         """Update an existing expense."""
         db_expense = self.db.query(ExpenseDB).filter(ExpenseDB.id == expense.id).first()
@@ -82,13 +270,16 @@ class ExpenseRepository:
 
         # Update basic fields
         db_expense.description = expense.description
-        db_expense.amount = expense.amount
+        db_expense.amount_cents = expense.amount
         db_expense.paid_by = expense.paid_by
         db_expense.split_type = expense.split_type
         db_expense.split_values = expense.split_values
         db_expense.created_at = expense.created_at
         db_expense.installments_count = expense.installments_count
         db_expense.first_due_date = expense.first_due_date
+        # A new version invalidates the cached split portions of the old one
+        db_expense.version = (db_expense.version or 1) + 1
+        expense.version = db_expense.version
 
         # Update split_among relationships
         db_expense.split_among_users.clear()
@@ -105,14 +296,15 @@ class ExpenseRepository:
                 id=str(uuid.uuid4()),
                 expense_id=expense.id,
                 number=installment.number,
-                amount=installment.amount,
+                amount_cents=installment.amount,
                 due_date=installment.due_date,
                 paid=installment.paid,
                 paid_at=installment.paid_at,
             )
             self.db.add(db_installment)
 
-        self.db.commit()
+        self.db.flush()
+        self._bump_group_version(db_expense.group_id)
         self.db.refresh(db_expense)
         return self._to_domain_model(db_expense)
 
@@ -120,8 +312,10 @@ class ExpenseRepository:
         """Delete expense by ID."""
         db_expense = self.db.query(ExpenseDB).filter(ExpenseDB.id == expense_id).first()
         if db_expense:
+            group_id = db_expense.group_id
             self.db.delete(db_expense)
-            self.db.commit()
+            self.db.flush()
+            self._bump_group_version(group_id)
             return True
         return False
 
@@ -140,10 +334,126 @@ class ExpenseRepository:
         if db_installment and not db_installment.paid:
             db_installment.paid = True
             db_installment.paid_at = datetime.now()
-            self.db.commit()
+            self.db.flush()
+            self._bump_group_version(self.get_group_id(expense_id))
             return True
         return False
 
+    def get_unpaid_installments_due(
+        self,
+        due_before: datetime,
+        due_from: Optional[datetime] = None,
+        created_after: Optional[datetime] = None,
+    ) -> List[Tuple[User, Expense, Installment, Group]]:
+        """Unpaid installments due in ``[due_from, due_before)``, once per member who owes them.
+
+        A single query walks the ``paid``/``due_date`` indexes of the installments table and
+        joins the owing members with their notification preferences, so the cost follows the
+        due installments rather than the size of the history. ``created_after`` only keeps
+        expenses created after that time. Rows are ordered by user, then due date.
+        """
+        query = self.select_unpaid_installment_debtors().where(InstallmentDB.due_date < due_before)
+        if due_from is not None:
+            query = query.where(InstallmentDB.due_date >= due_from)
+        if created_after is not None:
+            query = query.where(ExpenseDB.created_at > created_after)
+        query = query.order_by(
+            UserDB.id, InstallmentDB.due_date, ExpenseDB.id, InstallmentDB.number
+        )
+        return self.to_due_installments(self.db.execute(query))
+
+    @staticmethod
+    def select_unpaid_installment_debtors() -> Select:
+        """Unpaid installments of installment expenses joined with each member who owes them.
+
+        Owing members are the split members still in the group, other than the payer. Read
+        the rows with ``to_due_installments``; callers add their own filters and columns.
+        """
+        split_user = expense_split_among.alias("split_user")
+        return (
+            select(
+                InstallmentDB.number,
+                InstallmentDB.amount_cents,
+                InstallmentDB.due_date,
+                ExpenseDB.id.label("expense_id"),
+                ExpenseDB.description,
+                ExpenseDB.amount_cents.label("expense_amount_cents"),
+                ExpenseDB.paid_by,
+                ExpenseDB.installments_count,
+                GroupDB.id.label("group_id"),
+                GroupDB.name.label("group_name"),
+                UserDB.id.label("user_id"),
+                UserDB.name.label("user_name"),
+                UserDB.email,
+                UserDB.notification_preferences,
+            )
+            .join(ExpenseDB, ExpenseDB.id == InstallmentDB.expense_id)
+            .join(GroupDB, GroupDB.id == ExpenseDB.group_id)
+            .join(split_user, split_user.c.expense_id == ExpenseDB.id)
+            .join(
+                group_members,
+                and_(
+                    group_members.c.group_id == ExpenseDB.group_id,
+                    group_members.c.user_id == split_user.c.user_id,
+                ),
+            )
+            .join(UserDB, UserDB.id == split_user.c.user_id)
+            .where(
+                InstallmentDB.paid.is_(False),
+                ExpenseDB.installments_count > 1,
+                UserDB.id != ExpenseDB.paid_by,
+            )
+        )
+
+    @staticmethod
+    def to_due_installments(rows) -> List[Tuple[User, Expense, Installment, Group]]:
+        """Turn ``select_unpaid_installment_debtors`` rows into domain objects.
+
+        Rows sharing a user, expense or group share the object. Expenses and groups only carry
+        what notifications use: the expense's description, payer and owing members, the
+        group's name and those members.
+        """
+        users: Dict[str, User] = {}
+        expenses: Dict[str, Expense] = {}
+        groups: Dict[str, Group] = {}
+        due = []
+        for row in rows:
+            user = users.get(row.user_id)
+            if user is None:
+                user = users[row.user_id] = User(
+                    id=row.user_id, name=row.user_name, email=row.email
+                )
+                if row.notification_preferences:
+                    user.notification_preferences = row.notification_preferences
+            expense = expenses.get(row.expense_id)
+            if expense is None:
+                expense = expenses[row.expense_id] = Expense(
+                    id=row.expense_id,
+                    amount=row.expense_amount_cents,
+                    description=row.description,
+                    paid_by=row.paid_by,
+                    split_among=[],
+                    installments_count=row.installments_count,
+                )
+            if user.id not in expense.split_among:
+                expense.split_among.append(user.id)
+            group = groups.get(row.group_id)
+            if group is None:
+                group = groups[row.group_id] = Group(id=row.group_id, name=row.group_name)
+            group.members.setdefault(user.id, user)
+            installment = Installment(
+                number=row.number, due_date=row.due_date, amount=row.amount_cents
+            )
+            due.append((user, expense, installment, group))
+        return due
+
+    def _bump_group_version(self, group_id: Optional[str]) -> None:
+        """Invalidate cached representations of the expense's group."""
+        from src.repositories.group_repository import GroupRepository
+
+        if group_id:
+            GroupRepository(self.db).bump_version(group_id)
+
     def get_by_created_by(self, created_by: str) -> List[Expense]:
         """Get all expenses created by a specific user."""
         db_expenses = (
@@ -163,7 +473,7 @@ class ExpenseRepository:
         installments = [
             Installment(
                 number=db_inst.number,
-                amount=db_inst.amount,
+                amount=db_inst.amount_cents,
                 due_date=db_inst.due_date,
                 paid=db_inst.paid,
                 paid_at=db_inst.paid_at,
@@ -177,7 +487,7 @@ class ExpenseRepository:
         return Expense(
             id=db_expense.id,
             description=db_expense.description,
-            amount=db_expense.amount,
+            amount=db_expense.amount_cents,
             paid_by=db_expense.paid_by,
             created_by=db_expense.created_by,  # This can be None for legacy data
             split_among=split_among,
@@ -188,4 +498,5 @@ class ExpenseRepository:
             installments_count=db_expense.installments_count,
             first_due_date=db_expense.first_due_date,
             installments=installments,
+            version=db_expense.version or 1,
         )
@@ -1,12 +1,24 @@
 import uuid
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 
+from sqlalchemy import exists, func
 from sqlalchemy.orm import Session, selectinload
 
-from src.database import GroupDB, UserDB
-from src.models.group import Group
+from src.database import ExpenseDB, GroupDB, UserDB, group_members
+from src.models.group import Group, GroupSummary, GroupVersion
 from src.models.user import User
 
+# Eager-load the whole group graph with one SELECT per relationship, so loading a group
+# costs the same number of queries regardless of how many expenses it has. Group reads also
+# use populate_existing() so that re-reading a group later in the same request-scoped session
+# picks up expenses and members flushed in between.
+GROUP_GRAPH_OPTIONS = (
+    selectinload(GroupDB.members),
+    selectinload(GroupDB.expenses).selectinload(ExpenseDB.split_among_users),
+    selectinload(GroupDB.expenses).selectinload(ExpenseDB.installments),
+)
+
 
 class GroupRepository:
     def __init__(self, db: Session):
@@ -15,7 +27,8 @@ class GroupRepository:
     def create(self, name: str, member_ids: List[str] = None) -> Group:
         """Create a new group in the database."""
         group_id = str(uuid.uuid4())
-        db_group = GroupDB(id=group_id, name=name)
+        # A new group has no expenses, so its (empty) balance ledger is already up to date
+        db_group = GroupDB(id=group_id, name=name, balances_materialized=True)
         self.db.add(db_group)
 
         # Add members if provided
@@ -23,7 +36,7 @@ class GroupRepository:
             members = self.db.query(UserDB).filter(UserDB.id.in_(member_ids)).all()
             db_group.members.extend(members)
 
-        self.db.commit()
+        self.db.flush()
         self.db.refresh(db_group)
         return self._to_domain_model(db_group)
 
@@ -31,20 +44,147 @@ class GroupRepository:
         """Get group by ID with all relationships loaded."""
         db_group = (
             self.db.query(GroupDB)
-            .options(selectinload(GroupDB.members), selectinload(GroupDB.expenses))
+            .options(*GROUP_GRAPH_OPTIONS)
+            .populate_existing()
             .filter(GroupDB.id == group_id)
             .first()
         )
         return self._to_domain_model(db_group) if db_group else None
 
+    def get_member_ids(self, group_id: str) -> Optional[List[str]]:
+        """Get the IDs of a group's members, or None if the group does not exist."""
+        if not self.db.query(GroupDB.id).filter(GroupDB.id == group_id).scalar():
+            return None
+        rows = self.db.query(group_members.c.user_id).filter(group_members.c.group_id == group_id)
+        return [row.user_id for row in rows]
+
+    def get_version(self, group_id: str, user_id: str) -> Optional[GroupVersion]:
+        """Get a group's cache validators and whether ``user_id`` is a member, in one query."""
+        is_member = exists().where(
+            group_members.c.group_id == GroupDB.id, group_members.c.user_id == user_id
+        )
+        row = (
+            self.db.query(GroupDB.version, GroupDB.updated_at, GroupDB.created_at, is_member)
+            .filter(GroupDB.id == group_id)
+            .first()
+        )
+        if not row:
+            return None
+        return GroupVersion(
+            version=row[0] or 1, updated_at=row[1] or row[2], is_member=bool(row[3])
+        )
+
+    def bump_version(self, group_id: str) -> None:
+        """Record a change to the group's members, expenses or installments."""
+        self.db.query(GroupDB).filter(GroupDB.id == group_id).update(
+            {GroupDB.version: GroupDB.version + 1, GroupDB.updated_at: datetime.utcnow()},
+            synchronize_session=False,
+        )
+
+    def get_summary(self, group_id: str) -> Optional[GroupSummary]:
+        """Get a group's summary using aggregate queries only; no expense rows are loaded."""
+        group_rows = (
+            self.db.query(GroupDB.id, GroupDB.name, GroupDB.created_at)
+            .filter(GroupDB.id == group_id)
+            .all()
+        )
+        summaries = self._build_summaries(group_rows, with_member_names=True)
+        return summaries[0] if summaries else None
+
+    def get_summaries_for_user(
+        self, user_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[GroupSummary]:
+        """Get summaries for a page of the user's groups, in the order of get_for_user.
+
+        Member names are left out; the whole page costs a fixed number of aggregate queries.
+        """
+        query = (
+            self.db.query(GroupDB.id, GroupDB.name, GroupDB.created_at)
+            .join(group_members, group_members.c.group_id == GroupDB.id)
+            .filter(group_members.c.user_id == user_id)
+            .order_by(GroupDB.created_at, GroupDB.id)
+            .offset(offset)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return self._build_summaries(query.all(), with_member_names=False)
+
+    def _build_summaries(self, group_rows, with_member_names: bool) -> List[GroupSummary]:
+        """Build GroupSummary objects for ``(id, name, created_at)`` rows."""
+        from src.repositories.balance_ledger_repository import BalanceLedgerRepository
+
+        group_ids = [row.id for row in group_rows]
+        if not group_ids:
+            return []
+
+        expense_stats = {
+            row.group_id: row
+            for row in self.db.query(
+                ExpenseDB.group_id,
+                func.count(ExpenseDB.id).label("count"),
+                func.sum(ExpenseDB.amount_cents).label("total"),
+                func.max(ExpenseDB.created_at).label("last_created_at"),
+            )
+            .filter(ExpenseDB.group_id.in_(group_ids))
+            .group_by(ExpenseDB.group_id)
+        }
+        member_names: Dict[str, Dict[str, str]] = {group_id: {} for group_id in group_ids}
+        member_counts: Dict[str, int] = {}
+        if with_member_names:
+            for group_id, user_id, name in (
+                self.db.query(group_members.c.group_id, UserDB.id, UserDB.name)
+                .join(UserDB, UserDB.id == group_members.c.user_id)
+                .filter(group_members.c.group_id.in_(group_ids))
+            ):
+                member_names[group_id][user_id] = name
+            member_counts = {group_id: len(names) for group_id, names in member_names.items()}
+        else:
+            member_counts = dict(
+                self.db.query(group_members.c.group_id, func.count(group_members.c.user_id))
+                .filter(group_members.c.group_id.in_(group_ids))
+                .group_by(group_members.c.group_id)
+                .all()
+            )
+        balances = BalanceLedgerRepository(self.db).get_group_nets(group_ids)
+
+        summaries = []
+        for row in group_rows:
+            stats = expense_stats.get(row.id)
+            summaries.append(
+                GroupSummary(
+                    id=row.id,
+                    name=row.name,
+                    member_names=member_names[row.id],
+                    member_count=member_counts.get(row.id, 0),
+                    expense_count=stats.count if stats else 0,
+                    total_amount=stats.total if stats else 0,
+                    last_activity=stats.last_created_at if stats else row.created_at,
+                    balances=balances[row.id],
+                )
+            )
+        return summaries
+
     def get_all(self) -> List[Group]:
         """Get all groups with relationships loaded."""
-        db_groups = (
+        db_groups = self.db.query(GroupDB).options(*GROUP_GRAPH_OPTIONS).populate_existing().all()
+        return [self._to_domain_model(db_group) for db_group in db_groups]
+
+    def get_for_user(
+        self, user_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Group]:
+        """Get a page of the groups a user belongs to, filtering membership in SQL."""
+        query = (
             self.db.query(GroupDB)
-            .options(selectinload(GroupDB.members), selectinload(GroupDB.expenses))
-            .all()
+            .join(group_members, group_members.c.group_id == GroupDB.id)
+            .filter(group_members.c.user_id == user_id)
+            .options(*GROUP_GRAPH_OPTIONS)
+            .populate_existing()
+            .order_by(GroupDB.created_at, GroupDB.id)
+            .offset(offset)
         )
-        return [self._to_domain_model(db_group) for db_group in db_groups]
+        if limit is not None:
+            query = query.limit(limit)
+        return [self._to_domain_model(db_group) for db_group in query.all()]
 
     def add_member(self, group_id: str, user_id: str) -> bool:
         """Add a member to a group."""
@@ -53,7 +193,8 @@ class GroupRepository:
 
         if db_group and db_user and db_user not in db_group.members:
             db_group.members.append(db_user)
-            self.db.commit()
+            self.db.flush()
+            self.bump_version(group_id)
             return True
         return False
 
@@ -62,7 +203,7 @@ class GroupRepository:
         db_group = self.db.query(GroupDB).filter(GroupDB.id == group_id).first()
         if db_group:
             self.db.delete(db_group)
-            self.db.commit()
+            self.db.flush()
             return True
         return False
 
@@ -0,0 +1,211 @@
+import uuid
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.constants import (
+    OUTBOX_FAILED,
+    OUTBOX_PENDING,
+    OUTBOX_SENDING,
+    OUTBOX_SENT,
+    OUTBOX_SKIPPED,
+)
+from src.database import InstallmentDB, NotificationOutboxDB, UserDB
+from src.models.notification import OutboxItem
+from src.repositories.expense_repository import ExpenseRepository
+
+
+class NotificationOutboxRepository:
+    """Installment reminders waiting to be delivered, and what became of them.
+
+    Enqueueing is idempotent: a reminder is stored once per user, installment, kind and day.
+    Dispatch claims the pending rows of a few users at a time, moving them to ``sending``
+    under a fresh claim id, and records the outcome afterwards. Rows left in ``sending`` by
+    a crashed dispatch are never claimed again, so a reminder is delivered at most once.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(self, kind: str, notify_on: date, entries: Iterable[Tuple[str, str, int]]) -> int:
+        """Queue ``(user_id, expense_id, installment_number)`` reminders for ``notify_on``.
+
+        Reminders already queued for that day and kind are left alone. Returns how many rows
+        were added.
+        """
+        now = datetime.utcnow()
+        rows = [
+            {
+                "user_id": user_id,
+                "expense_id": expense_id,
+                "installment_number": number,
+                "kind": kind,
+                "notify_on": notify_on,
+                "status": OUTBOX_PENDING,
+                "attempts": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for user_id, expense_id, number in dict.fromkeys(entries)
+        ]
+        if not rows:
+            return 0
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            statement = (
+                dialect_insert(NotificationOutboxDB)
+                .on_conflict_do_nothing()
+                .returning(NotificationOutboxDB.id)
+            )
+            return len(self.db.execute(statement, rows).all())
+
+        rows = self._without_existing(rows, kind, notify_on)
+        if rows:
+            self.db.execute(insert(NotificationOutboxDB), rows)
+        return len(rows)
+
+    def _without_existing(self, rows: List[dict], kind: str, notify_on: date) -> List[dict]:
+        existing = set(
+            self.db.execute(
+                select(
+                    NotificationOutboxDB.user_id,
+                    NotificationOutboxDB.expense_id,
+                    NotificationOutboxDB.installment_number,
+                ).where(
+                    NotificationOutboxDB.kind == kind, NotificationOutboxDB.notify_on == notify_on
+                )
+            ).all()
+        )
+        return [
+            row
+            for row in rows
+            if (row["user_id"], row["expense_id"], row["installment_number"]) not in existing
+        ]
+
+    def claim(
+        self, max_users: int, kind: Optional[str] = None, after_user_id: Optional[str] = None
+    ) -> Optional[Tuple[str, str]]:
+        """Claim every pending row of the next ``max_users`` users (by id, after ``after_user_id``).
+
+        Returns the claim id and the last claimed user id, or None when nothing is pending.
+        """
+        pending = [NotificationOutboxDB.status == OUTBOX_PENDING]
+        if kind is not None:
+            pending.append(NotificationOutboxDB.kind == kind)
+        users_query = select(NotificationOutboxDB.user_id).where(*pending).distinct()
+        if after_user_id is not None:
+            users_query = users_query.where(NotificationOutboxDB.user_id > after_user_id)
+        user_ids = list(
+            self.db.execute(
+                users_query.order_by(NotificationOutboxDB.user_id).limit(max_users)
+            ).scalars()
+        )
+        if not user_ids:
+            return None
+
+        claim_id = str(uuid.uuid4())
+        self.db.execute(
+            update(NotificationOutboxDB)
+            .where(*pending, NotificationOutboxDB.user_id.in_(user_ids))
+            .values(status=OUTBOX_SENDING, claim_id=claim_id, updated_at=datetime.utcnow())
+        )
+        return claim_id, user_ids[-1]
+
+    def load_claim(self, claim_id: str) -> List[OutboxItem]:
+        """The claimed reminders whose installment is still unpaid and owed by the user.
+
+        When a user has several rows for the same installment and kind (a failed reminder
+        retried after the next day's was queued), only the newest is kept. The other claimed
+        rows (duplicates, paid, deleted, or the user left the group) are marked skipped.
+        Items are ordered by user, kind and due date.
+        """
+        query = (
+            ExpenseRepository.select_unpaid_installment_debtors()
+            .add_columns(
+                NotificationOutboxDB.id.label("outbox_id"),
+                NotificationOutboxDB.kind,
+                NotificationOutboxDB.notify_on,
+            )
+            .join(
+                NotificationOutboxDB,
+                and_(
+                    NotificationOutboxDB.expense_id == InstallmentDB.expense_id,
+                    NotificationOutboxDB.installment_number == InstallmentDB.number,
+                    NotificationOutboxDB.user_id == UserDB.id,
+                ),
+            )
+            .where(NotificationOutboxDB.claim_id == claim_id)
+            .order_by(UserDB.id, NotificationOutboxDB.kind, InstallmentDB.due_date)
+        )
+        rows = self.db.execute(query).all()
+        items = [
+            OutboxItem(row.outbox_id, row.kind, row.notify_on, *due)
+            for row, due in zip(rows, ExpenseRepository.to_due_installments(rows), strict=True)
+        ]
+        newest: Dict[Tuple[str, str, str, int], OutboxItem] = {}
+        for item in items:
+            key = (item.user.id, item.kind, item.expense.id, item.installment.number)
+            kept = newest.get(key)
+            if kept is None or (item.notify_on, item.id) > (kept.notify_on, kept.id):
+                newest[key] = item
+        items = [
+            item
+            for item in items
+            if newest[(item.user.id, item.kind, item.expense.id, item.installment.number)] is item
+        ]
+
+        self.db.execute(
+            update(NotificationOutboxDB)
+            .where(
+                NotificationOutboxDB.claim_id == claim_id,
+                NotificationOutboxDB.status == OUTBOX_SENDING,
+                NotificationOutboxDB.id.notin_([item.id for item in items]),
+            )
+            .values(status=OUTBOX_SKIPPED, updated_at=datetime.utcnow())
+        )
+        return items
+
+    def mark_sent(self, outbox_ids: List[int]) -> None:
+        """Record that the reminders were delivered."""
+        self.db.execute(
+            update(NotificationOutboxDB)
+            .where(NotificationOutboxDB.id.in_(outbox_ids))
+            .values(
+                status=OUTBOX_SENT,
+                attempts=NotificationOutboxDB.attempts + 1,
+                last_error=None,
+                updated_at=datetime.utcnow(),
+            )
+        )
+
+    def mark_failed(self, outbox_ids: List[int], error: str, max_attempts: int) -> None:
+        """Record a failed delivery: back to pending, or failed once out of attempts."""
+        self.db.execute(
+            update(NotificationOutboxDB)
+            .where(NotificationOutboxDB.id.in_(outbox_ids))
+            .values(
+                status=case(
+                    (NotificationOutboxDB.attempts + 1 >= max_attempts, OUTBOX_FAILED),
+                    else_=OUTBOX_PENDING,
+                ),
+                attempts=NotificationOutboxDB.attempts + 1,
+                claim_id=None,
+                last_error=error,
+                updated_at=datetime.utcnow(),
+            )
+        )
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Number of outbox rows in each status."""
+        return dict(
+            self.db.execute(
+                select(NotificationOutboxDB.status, func.count()).group_by(
+                    NotificationOutboxDB.status
+                )
+            ).all()
+        )
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from src.database import UserDB
@@ -20,7 +21,7 @@ class UserRepository:
             id=user_id, name=name, email=email, balance={}, notification_preferences=default_prefs
         )
         self.db.add(db_user)
-        self.db.commit()
+        self.db.flush()
         self.db.refresh(db_user)
         return self._to_domain_model(db_user)
 
@@ -37,7 +38,7 @@ class UserRepository:
             notification_preferences=default_prefs,
         )
         self.db.add(db_user)
-        self.db.commit()
+        self.db.flush()
         self.db.refresh(db_user)
         return self._to_domain_model(db_user)
 
@@ -51,24 +52,52 @@ class UserRepository:
         db_user = self.db.query(UserDB).filter(UserDB.email == email).first()
         return self._to_domain_model(db_user) if db_user else None
 
+    def get_names(self, user_ids: List[str]) -> Dict[str, str]:
+        """Get user_id -> name for the given users in one query."""
+        if not user_ids:
+            return {}
+        rows = self.db.query(UserDB.id, UserDB.name).filter(UserDB.id.in_(user_ids)).all()
+        return {row.id: row.name for row in rows}
+
     def get_all(self) -> List[User]:
         """Get all users."""
         db_users = self.db.query(UserDB).all()
         return [self._to_domain_model(db_user) for db_user in db_users]
 
-    def update_balance(self, user_id: str, balance: Dict[str, float]):
-        """Update user balance."""
+    def update_balance(self, user_id: str, balance: Dict[str, int]):
+        """Update user balance (cents owed per other user)."""
         db_user = self.db.query(UserDB).filter(UserDB.id == user_id).first()
         if db_user:
             db_user.balance = balance
-            self.db.commit()
+            self.db.flush()
+
+    def update_balances(self, balances: Dict[str, Dict[str, int]]) -> int:
+        """Persist several user balances in one batched UPDATE.
+
+        Only users whose stored balance differs are written, and nothing is written when no
+        balance changed. Returns the number of users updated.
+        """
+        if not balances:
+            return 0
+
+        stored = dict(
+            self.db.query(UserDB.id, UserDB.balance).filter(UserDB.id.in_(list(balances))).all()
+        )
+        changed = [
+            {"id": user_id, "balance": balance}
+            for user_id, balance in balances.items()
+            if user_id in stored and (stored[user_id] or {}) != balance
+        ]
+        if changed:
+            self.db.execute(update(UserDB), changed)
+        return len(changed)
 
     def delete(self, user_id: str) -> bool:
         """Delete user by ID."""
         db_user = self.db.query(UserDB).filter(UserDB.id == user_id).first()
         if db_user:
             self.db.delete(db_user)
-            self.db.commit()
+            self.db.flush()
             return True
         return False
 
@@ -77,7 +106,7 @@ class UserRepository:
         db_user = self.db.query(UserDB).filter(UserDB.id == user_id).first()
         if db_user:
             db_user.notification_preferences = preferences
-            self.db.commit()
+            self.db.flush()
             return True
         return False
 
@@ -87,7 +116,7 @@ class UserRepository:
         if db_user:
             db_user.reset_token = reset_token
             db_user.reset_token_expiry = expiry
-            self.db.commit()
+            self.db.flush()
             return True
         return False
 
@@ -106,7 +135,7 @@ class UserRepository:
             db_user.password_hash = password_hash
             db_user.reset_token = None
             db_user.reset_token_expiry = None
-            self.db.commit()
+            self.db.flush()
             return True
         return False
 
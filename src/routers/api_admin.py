@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+
+from src.auth import require_admin_token
+from src.database import async_engine, engine
+from src.pool_metrics import async_pool_metrics, pool_metrics
+from src.services.portion_service import portion_cache
+from src.services.user_cache import user_cache
+
+router = APIRouter(tags=["admin"])
+
+
+@router.get("/admin/metrics")
+async def admin_metrics_api(_: None = Depends(require_admin_token)):
+    """Operational metrics for the running process. Requires the X-Admin-Token header."""
+    return {
+        "db_pool": pool_metrics.snapshot(engine.pool),
+        "db_async_pool": async_pool_metrics.snapshot(async_engine.sync_engine.pool),
+        "auth_cache": user_cache.snapshot(),
+        "portion_cache": portion_cache.snapshot(),
+    }
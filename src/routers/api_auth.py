@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, EmailStr
+from starlette.concurrency import run_in_threadpool
 
 from src.auth import login_user, logout_user
 from src.services.auth_service import AuthService
@@ -32,7 +33,9 @@ class ResetPasswordRequest(BaseModel):
 async def api_login(request: Request, login_data: LoginRequest):
     """API login endpoint that accepts JSON data with email and password authentication."""
     # Authenticate user with password
-    user = AuthService.authenticate_user(login_data.email, login_data.password)
+    user = await run_in_threadpool(
+        AuthService.authenticate_user, login_data.email, login_data.password
+    )
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
@@ -50,7 +53,9 @@ async def api_signup(request: Request, signup_data: SignupRequest):
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters long")
     
     # Register user
-    user = AuthService.register_user(signup_data.name, signup_data.email, signup_data.password)
+    user = await run_in_threadpool(
+        AuthService.register_user, signup_data.name, signup_data.email, signup_data.password
+    )
     if not user:
         raise HTTPException(status_code=400, detail="User with this email already exists")
 
@@ -70,7 +75,7 @@ async def api_logout(request: Request):
 @router.post("/forgot-password")
 async def forgot_password(forgot_data: ForgotPasswordRequest):
     """Request password reset token."""
-    reset_token = AuthService.generate_reset_token(forgot_data.email)
+    reset_token = await run_in_threadpool(AuthService.generate_reset_token, forgot_data.email)
     
     if reset_token:
         # In a real application, you would send this token via email
@@ -88,7 +93,9 @@ async def reset_password(reset_data: ResetPasswordRequest):
     if len(reset_data.password) < 6:
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters long")
     
-    success = AuthService.reset_password(reset_data.token, reset_data.password)
+    success = await run_in_threadpool(
+        AuthService.reset_password, reset_data.token, reset_data.password
+    )
     
     if success:
         return {"message": "Password reset successful"}
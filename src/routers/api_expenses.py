@@ -1,65 +1,104 @@
+import csv
+import io
+import json
 import uuid
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Collection, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth import require_authentication
+from src.constants import (
+    EVENT_BALANCES,
+    EVENT_EXPENSE_ADDED,
+    EVENT_EXPENSE_DELETED,
+    EVENT_EXPENSES_IMPORTED,
+    EVENT_INSTALLMENT_PAID,
+)
+from src.database import get_async_db
+from src.http_caching import is_not_modified, make_etag, not_modified, set_validators
 from src.models.expense import Expense
+from src.models.group import Group
 from src.models.user import User
-from src.schemas.expense import ExpenseCreate, ExpenseResponse
-from src.services.database_service import DatabaseService
+from src.money import from_cents, to_cents, to_cents_map
+from src.pagination import InvalidCursorError
+from src.schemas.expense import (
+    ExpenseBulkResponse,
+    ExpenseCreate,
+    ExpenseImportError,
+    ExpenseResponse,
+)
+from src.schemas.group import GroupResponse
+from src.services.async_database_service import AsyncDatabaseService
+from src.services.event_broker import GroupEvent, get_event_broker
 from src.services.expense_service import ExpenseService
+from src.settings import get_settings
 
 router = APIRouter(tags=["expenses"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Special values of the created_by filter when listing expenses
+CREATED_BY_ME = "me"
+CREATED_BY_ANY = "any"
 
-@router.post("/groups/{group_id}/expenses", response_model=ExpenseResponse, status_code=201)
-async def create_expense_api(
-    group_id: str,
-    expense_data: ExpenseCreate,
-    request: Request,
-    current_user: User = Depends(require_authentication),
-):
-    """Create a new expense via JSON API. User must be a member of the group."""
-    # User is already authenticated via Depends(require_authentication)
 
-    # Validate group exists
-    group = DatabaseService.get_group(group_id)
-    if not group:
-        raise HTTPException(status_code=404, detail="Group not found")
+def _publish_after_commit(background_tasks: BackgroundTasks, *events: GroupEvent) -> None:
+    """Push group events once the request's transaction has been committed."""
+    broker = get_event_broker()
+    for event in events:
+        background_tasks.add_task(broker.publish, event)
 
-    # Check if current user is a member of the group
-    if current_user.id not in group.members:
-        raise HTTPException(
-            status_code=403, detail="Access denied. You are not a member of this group."
-        )
 
+def _balances_event(group: Group) -> GroupEvent:
+    """New net balances, like ``GroupResponse.balances`` (positive = owes).
+
+    ``group`` must have its ledger balances loaded (``load_group_balances``).
+    """
+    return GroupEvent(
+        type=EVENT_BALANCES,
+        group_id=group.id,
+        data={"balances": GroupResponse.ledger_net_balances(group)},
+    )
+
+
+def _build_expense(
+    expense_data: ExpenseCreate,
+    member_ids: Collection[str],
+    created_by: str,
+    created_at: Optional[datetime] = None,
+) -> Expense:
+    """Validate an expense against the group's members and build it, in cents.
+
+    Raises:
+        ValueError: With the message for the client if the expense is invalid
+    """
     # Validate paid_by user exists and is in group
-    if expense_data.paid_by not in group.members:
-        raise HTTPException(status_code=400, detail="paid_by user must be a member of the group")
+    if expense_data.paid_by not in member_ids:
+        raise ValueError("paid_by user must be a member of the group")
 
     # Validate split_among users exist and are in group
     for user_id in expense_data.split_among:
-        if user_id not in group.members:
-            raise HTTPException(
-                status_code=400,
-                detail=f"User {user_id} in split_among must be a member of the group",
-            )
+        if user_id not in member_ids:
+            raise ValueError(f"User {user_id} in split_among must be a member of the group")
+
+    # Money is stored in integer cents from here on
+    amount = to_cents(expense_data.amount)
+    split_values = expense_data.split_values
 
     # Validate split values
     if expense_data.split_type == "PERCENTAGE":
         total_pct = sum(expense_data.split_values.values())
         if abs(total_pct - 100.0) > 0.01:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Percentages must sum to 100%. Current total: {total_pct:.2f}%",
-            )
+            raise ValueError(f"Percentages must sum to 100%. Current total: {total_pct:.2f}%")
     elif expense_data.split_type == "EXACT":
-        total_exact = sum(expense_data.split_values.values())
-        if abs(total_exact - expense_data.amount) > 0.01:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Exact values sum ({total_exact:.2f}) must equal total amount ({expense_data.amount:.2f})",
+        split_values = to_cents_map(split_values)
+        total_exact = sum(split_values.values())
+        if total_exact != amount:
+            raise ValueError(
+                f"Exact values sum ({from_cents(total_exact):.2f}) must equal total amount "
+                f"({from_cents(amount):.2f})"
             )
 
     # Use the provided date for first_due_date, or default to today
@@ -73,92 +112,294 @@ async def create_expense_api(
 
     expense = Expense(
         id=str(uuid.uuid4()),
-        amount=expense_data.amount,
+        amount=amount,
         description=expense_data.description,
         paid_by=expense_data.paid_by,
-        created_by=current_user.id,  # Set created_by to authenticated user
+        created_by=created_by,  # Set created_by to authenticated user
         split_among=expense_data.split_among,
         category=expense_data.category,
         split_type=expense_data.split_type.value,
-        split_values=expense_data.split_values,
-        created_at=datetime.now(),
+        split_values=split_values,
+        created_at=created_at or datetime.now(),
         installments_count=expense_data.installments_count,
         first_due_date=first_due_date_dt,
     )
 
     # Generate installments if applicable
     ExpenseService.generate_installments(expense)
+    return expense
+
+
+@router.post("/groups/{group_id}/expenses", response_model=ExpenseResponse, status_code=201)
+async def create_expense_api(
+    group_id: str,
+    expense_data: ExpenseCreate,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Create a new expense via JSON API. User must be a member of the group."""
+    # User is already authenticated via Depends(require_authentication)
+
+    # Validate group exists
+    group = await AsyncDatabaseService.get_group(group_id, db=db)
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    # Check if current user is a member of the group
+    if current_user.id not in group.members:
+        raise HTTPException(
+            status_code=403, detail="Access denied. You are not a member of this group."
+        )
+
+    try:
+        expense = _build_expense(expense_data, group.members, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from None
 
     # Persist expense to database
-    DatabaseService.add_expense_to_group(group_id, expense)
+    await AsyncDatabaseService.add_expense_to_group(group_id, expense, db=db)
+
+    # Load ledger balances and save to database
+    group = await AsyncDatabaseService.get_group(group_id, db=db)  # Refresh from DB
+    await AsyncDatabaseService.load_group_balances(group, db=db)
+    await AsyncDatabaseService.update_user_balances(group.members, db=db)
+
+    response = ExpenseResponse.from_expense(expense)
+    _publish_after_commit(
+        background_tasks,
+        GroupEvent(
+            type=EVENT_EXPENSE_ADDED,
+            group_id=group_id,
+            data={"expense": response.model_dump(mode="json")},
+        ),
+        _balances_event(group),
+    )
+    return response
+
+
+async def _read_bulk_rows(request: Request) -> Tuple[List[Any], Callable[[Any], ExpenseCreate]]:
+    """Read a bulk import body: the raw rows and how to turn one into an ExpenseCreate."""
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith("text/csv"):
+        try:
+            text = body.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded") from None
+        return list(csv.DictReader(io.StringIO(text))), ExpenseCreate.from_csv_row
+
+    try:
+        rows = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON") from None
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of expenses")
+    return rows, ExpenseCreate.model_validate
+
+
+def _import_error_message(error: ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+            for item in error.errors()
+        )
+    return str(error)
+
+
+@router.post(
+    "/groups/{group_id}/expenses:bulk", response_model=ExpenseBulkResponse, status_code=201
+)
+async def bulk_create_expenses_api(
+    group_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Import many expenses from a JSON array or a CSV body (``Content-Type: text/csv``).
+
+    CSV columns are the ``ExpenseCreate`` fields (see ``ExpenseCreate.from_csv_row``). Every
+    row is validated before anything is written: if any row is invalid nothing is imported
+    and the 422 response lists the error of each bad row. Otherwise all expenses, split
+    members and installments are inserted in one transaction and balances are updated once.
+    """
+    member_ids = await AsyncDatabaseService.get_group_member_ids(group_id, db=db)
+    if member_ids is None:
+        raise HTTPException(status_code=404, detail="Group not found")
 
-    # Recompute balances and save to database
-    group = DatabaseService.get_group(group_id)  # Refresh from DB
-    ExpenseService.recompute_group_balances(group)
-    DatabaseService.update_user_balances(group.members)
+    # Check if current user is a member of the group
+    if current_user.id not in member_ids:
+        raise HTTPException(
+            status_code=403, detail="Access denied. You are not a member of this group."
+        )
 
-    return ExpenseResponse.from_expense(expense)
+    rows, parse = await _read_bulk_rows(request)
+    if not rows:
+        raise HTTPException(status_code=400, detail="No expenses to import")
+    max_rows = get_settings().BULK_IMPORT_MAX_ROWS
+    if len(rows) > max_rows:
+        raise HTTPException(status_code=413, detail=f"At most {max_rows} expenses per import")
+
+    members = set(member_ids)
+    created_at = datetime.now()
+    expenses: List[Expense] = []
+    errors: List[ExpenseImportError] = []
+    for row_number, row in enumerate(rows, start=1):
+        try:
+            # Distinct timestamps keep the rows in file order in expense listings
+            expense = _build_expense(
+                parse(row),
+                members,
+                current_user.id,
+                created_at=created_at + timedelta(microseconds=row_number),
+            )
+        except ValueError as e:
+            errors.append(ExpenseImportError(row=row_number, error=_import_error_message(e)))
+        else:
+            expenses.append(expense)
+    if errors:
+        raise HTTPException(status_code=422, detail=[error.model_dump() for error in errors])
+
+    created = await AsyncDatabaseService.add_expenses_to_group(group_id, expenses, db=db)
+
+    # Load ledger balances and save to database, once for the whole import
+    group = await AsyncDatabaseService.get_group(group_id, db=db)
+    await AsyncDatabaseService.load_group_balances(group, db=db)
+    await AsyncDatabaseService.update_user_balances(group.members, db=db)
+
+    _publish_after_commit(
+        background_tasks,
+        GroupEvent(type=EVENT_EXPENSES_IMPORTED, group_id=group_id, data={"count": created}),
+        _balances_event(group),
+    )
+    return ExpenseBulkResponse(created=created, expense_ids=[expense.id for expense in expenses])
 
 
 @router.get("/groups/{group_id}/expenses", response_model=list[ExpenseResponse])
 async def list_expenses_api(
-    group_id: str, request: Request, current_user: User = Depends(require_authentication)
+    group_id: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    category: Optional[str] = Query(None),
+    paid_by: Optional[str] = Query(None),
+    created_by: str = Query(CREATED_BY_ME),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """List all expenses for a group via JSON API, filtered by authenticated user. User must be a member of the group."""
-    # User is already authenticated via Depends(require_authentication)
-
-    group = DatabaseService.get_group(group_id)
-    if not group:
+    """List a page of a group's expenses, newest first. User must be a member of the group.
+
+    By default only expenses created by the current user are listed (``created_by=me``); pass
+    a member id to see theirs, or ``created_by=any`` for all. ``date_from`` and ``date_to``
+    are inclusive. When more expenses follow, the ``X-Next-Cursor`` response header holds the
+    ``cursor`` to request the next page with the same filters. Pages carry ``ETag`` and
+    ``Last-Modified`` validators and are answered with 304 while the group is unchanged.
+    """
+    version = await AsyncDatabaseService.get_group_version(group_id, current_user.id, db=db)
+    if not version:
         raise HTTPException(status_code=404, detail="Group not found")
 
-    # Filter expenses created by the current user, with fallback to paid_by for legacy data
-    user_expenses = [
-        exp
-        for exp in group.expenses
-        if (exp.created_by == current_user.id)
-        or (exp.created_by is None and exp.paid_by == current_user.id)
-    ]
-
     # Check if current user is a member of the group
-    if current_user.id not in group.members:
+    if not version.is_member:
         raise HTTPException(
             status_code=403, detail="Access denied. You are not a member of this group."
         )
 
-    ExpenseService.recompute_group_balances(group)
-    DatabaseService.update_user_balances(group.members)
+    if created_by == CREATED_BY_ME:
+        created_by = current_user.id
 
-    return [ExpenseResponse.from_expense(expense) for expense in user_expenses]
+    # The page depends on the group version and on every parameter that selects it
+    etag = make_etag(
+        version.version, limit, cursor, category, paid_by, created_by, date_from, date_to
+    )
+    if is_not_modified(request, etag, version.updated_at):
+        return not_modified(etag, version.updated_at)
+    try:
+        expenses, next_cursor = await AsyncDatabaseService.list_group_expenses(
+            group_id,
+            limit,
+            cursor,
+            db=db,
+            category=category,
+            paid_by=paid_by,
+            created_by=None if created_by == CREATED_BY_ANY else created_by,
+            created_from=datetime.combine(date_from, time.min) if date_from else None,
+            created_before=(
+                datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None
+            ),
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    set_validators(response, etag, version.updated_at)
+    return [ExpenseResponse.from_expense(expense) for expense in expenses]
 
 
 @router.post("/groups/{group_id}/expenses/{expense_id}/installments/{number}/pay", status_code=204)
-async def pay_installment_api(group_id: str, expense_id: str, number: int, request: Request):
-    """Mark an installment as paid via JSON API."""
-    # Require authentication
-    require_authentication(request)
+async def pay_installment_api(
+    group_id: str,
+    expense_id: str,
+    number: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Mark an installment as paid via JSON API. User must be a member of the group."""
+    # User is already authenticated via Depends(require_authentication)
+
+    group = await AsyncDatabaseService.get_group(group_id, db=db)
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
 
-    if not DatabaseService.pay_installment(expense_id, number):
+    # Check if current user is a member of the group
+    if current_user.id not in group.members:
+        raise HTTPException(
+            status_code=403, detail="Access denied. You are not a member of this group."
+        )
+
+    if not any(expense.id == expense_id for expense in group.expenses):
+        raise HTTPException(status_code=404, detail="Expense not found")
+
+    if not await AsyncDatabaseService.pay_installment(expense_id, number, db=db):
         raise HTTPException(status_code=404, detail="Installment not found or already paid")
 
-    # Recompute balances and save to database
-    group = DatabaseService.get_group(group_id)
-    ExpenseService.recompute_group_balances(group)
-    DatabaseService.update_user_balances(group.members)
+    # Load ledger balances and save to database
+    group = await AsyncDatabaseService.get_group(group_id, db=db)
+    await AsyncDatabaseService.load_group_balances(group, db=db)
+    await AsyncDatabaseService.update_user_balances(group.members, db=db)
+    _publish_after_commit(
+        background_tasks,
+        GroupEvent(
+            type=EVENT_INSTALLMENT_PAID,
+            group_id=group_id,
+            data={"expense_id": expense_id, "number": number},
+        ),
+        _balances_event(group),
+    )
     return {}
 
 
 @router.delete("/groups/{group_id}/expenses/{expense_id}", status_code=204)
 async def delete_expense_api(
-    group_id: str, 
-    expense_id: str, 
-    request: Request, 
-    current_user: User = Depends(require_authentication)
+    group_id: str,
+    expense_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete an expense via JSON API."""
     # User is already authenticated via Depends(require_authentication)
 
     # Check if expense exists and user is the creator
-    group = DatabaseService.get_group(group_id)
+    group = await AsyncDatabaseService.get_group(group_id, db=db)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
 
@@ -173,11 +414,18 @@ async def delete_expense_api(
     ):
         raise HTTPException(status_code=403, detail="Only the creator can delete this expense")
 
-    if not DatabaseService.delete_expense(expense_id):
+    if not await AsyncDatabaseService.delete_expense(expense_id, db=db):
         raise HTTPException(status_code=404, detail="Expense not found")
 
-    # Recompute balances and save to database
-    group = DatabaseService.get_group(group_id)
-    ExpenseService.recompute_group_balances(group)
-    DatabaseService.update_user_balances(group.members)
+    # Load ledger balances and save to database
+    group = await AsyncDatabaseService.get_group(group_id, db=db)
+    await AsyncDatabaseService.load_group_balances(group, db=db)
+    await AsyncDatabaseService.update_user_balances(group.members, db=db)
+    _publish_after_commit(
+        background_tasks,
+        GroupEvent(
+            type=EVENT_EXPENSE_DELETED, group_id=group_id, data={"expense_id": expense_id}
+        ),
+        _balances_event(group),
+    )
     return {}
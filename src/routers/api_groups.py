@@ -1,17 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from typing import AsyncIterator, List, Literal, Optional, Union
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from src.auth import require_authentication
+from src.constants import EVENT_GROUP_DELETED, EVENT_MEMBER_ADDED, EVENT_RESYNC
+from src.database import get_async_db
+from src.http_caching import is_not_modified, make_etag, not_modified, set_validators
 from src.models.user import User
-from src.schemas.group import GroupCreate, GroupResponse
+from src.schemas.expense import ExportFormat
+from src.schemas.group import GroupCreate, GroupResponse, GroupSummaryResponse
+from src.schemas.settlement import SettlementPlanResponse, SettlementStrategy
+from src.services.async_database_service import AsyncDatabaseService
 from src.services.database_service import DatabaseService
-from src.services.expense_service import ExpenseService
+from src.services.event_broker import GroupEvent, Subscription, get_event_broker
+from src.services.export_service import MEDIA_TYPES, ExportService
+from src.services.settlement_service import SettlementService
+from src.settings import get_settings
 
 router = APIRouter(tags=["groups"])
 
 
 @router.post("/groups", response_model=GroupResponse, status_code=201)
 async def create_group_api(
-    group_data: GroupCreate, current_user: User = Depends(require_authentication)
+    group_data: GroupCreate,
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a new group via JSON API. Current user automatically becomes a member."""
     # Collect member IDs from both direct IDs and emails
@@ -19,57 +36,239 @@ async def create_group_api(
     
     # Convert emails to user IDs
     for email in group_data.member_emails:
-        user = DatabaseService.get_user_by_email(email)
+        user = await AsyncDatabaseService.get_user_by_email(email, db=db)
         if user:
             member_ids.add(user.id)
     
     # Create group with all resolved member IDs
-    created = DatabaseService.create_group(group_data.name, list(member_ids))
+    created = await AsyncDatabaseService.create_group(group_data.name, list(member_ids), db=db)
     return GroupResponse.from_group(created)
 
 
-@router.get("/groups", response_model=list[GroupResponse])
-async def list_groups_api(current_user: User = Depends(require_authentication)):
-    """List groups where the current user is a member."""
-    all_groups = DatabaseService.get_all_groups()
+@router.get(
+    "/groups", response_model=Union[List[GroupResponse], List[GroupSummaryResponse]]
+)
+async def list_groups_api(
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    view: Literal["full", "summary"] = Query("full"),
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List groups where the current user is a member, paged by creation date.
+
+    ``view=summary`` returns one ``GroupSummaryResponse`` per group, computed with aggregate
+    queries instead of loading members, expenses and ledgers.
+    """
+    if view == "summary":
+        summaries = await AsyncDatabaseService.get_group_summaries_for_user(
+            current_user.id, limit=limit, offset=offset, db=db
+        )
+        return [
+            GroupSummaryResponse.from_summary(summary, current_user.id, detailed=False)
+            for summary in summaries
+        ]
 
-    # Filter to only groups where current user is a member
-    user_groups = [group for group in all_groups.values() if current_user.id in group.members]
+    user_groups = await AsyncDatabaseService.get_groups_for_user(
+        current_user.id, limit=limit, offset=offset, db=db
+    )
 
-    # Recompute balances for user's groups only
+    # Load ledger balances for user's groups only
     for group in user_groups:
-        ExpenseService.recompute_group_balances(group)
-        DatabaseService.update_user_balances(group.members)
+        await AsyncDatabaseService.load_group_balances(group, db=db)
+        await AsyncDatabaseService.update_user_balances_on_read(group.members, db=db)
 
     return [GroupResponse.from_group(group) for group in user_groups]
 
 
 @router.get("/groups/{group_id}", response_model=GroupResponse)
-async def get_group_api(group_id: str, current_user: User = Depends(require_authentication)):
-    """Get a specific group via JSON API. User must be a member."""
-    group = DatabaseService.get_group(group_id)
-    if not group:
+async def get_group_api(
+    group_id: str,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get a specific group via JSON API. User must be a member.
+
+    Responses carry ``ETag`` and ``Last-Modified`` from the group version; a matching
+    ``If-None-Match`` (or ``If-Modified-Since``) is answered with 304 without loading the group.
+    """
+    version = await AsyncDatabaseService.get_group_version(group_id, current_user.id, db=db)
+    if not version:
         raise HTTPException(status_code=404, detail="Group not found")
 
     # Check if user is a member of the group
-    if current_user.id not in group.members:
+    if not version.is_member:
         raise HTTPException(
             status_code=403, detail="Access denied. You are not a member of this group."
         )
 
-    # Recompute balances for accuracy
-    ExpenseService.recompute_group_balances(group)
-    DatabaseService.update_user_balances(group.members)
+    etag = make_etag(version.version)
+    if is_not_modified(request, etag, version.updated_at):
+        return not_modified(etag, version.updated_at)
 
+    # A change landing after the version read only makes the tag stale, never the body
+    group = await AsyncDatabaseService.get_group(group_id, db=db)
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    # Serve balances from the group ledger
+    await AsyncDatabaseService.load_group_balances(group, db=db)
+    await AsyncDatabaseService.update_user_balances_on_read(group.members, db=db)
+
+    set_validators(response, etag, version.updated_at)
     return GroupResponse.from_group(group)
 
 
+@router.get("/groups/{group_id}/summary", response_model=GroupSummaryResponse)
+async def get_group_summary_api(
+    group_id: str,
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get a group's members, totals and balances without its expenses. User must be a member.
+
+    Balances are computed in the database and match ``GET /groups/{group_id}``.
+    """
+    summary = await AsyncDatabaseService.get_group_summary(group_id, db=db)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    if current_user.id not in summary.member_names:
+        raise HTTPException(
+            status_code=403, detail="Access denied. You are not a member of this group."
+        )
+
+    return GroupSummaryResponse.from_summary(summary, current_user.id)
+
+
+@router.get("/groups/{group_id}/settlements", response_model=SettlementPlanResponse)
+async def get_group_settlements_api(
+    group_id: str,
+    strategy: Optional[SettlementStrategy] = Query(None),
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Suggest the transfers that settle a group. User must be a member.
+
+    ``strategy`` defaults to the ``SETTLEMENT_STRATEGY`` setting.
+    """
+    group = await AsyncDatabaseService.get_group(group_id, db=db)
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    if current_user.id not in group.members:
+        raise HTTPException(
+            status_code=403, detail="Access denied. You are not a member of this group."
+        )
+
+    # Ledger balances are positive when the member owes, settlements expect the opposite
+    await AsyncDatabaseService.load_group_balances(group, db=db)
+    nets = {user_id: -sum(member.balance.values()) for user_id, member in group.members.items()}
+
+    # The exact and heuristic strategies are CPU-bound; keep them off the event loop
+    plan = await run_in_threadpool(
+        SettlementService.plan, nets, strategy.value if strategy else None
+    )
+    return SettlementPlanResponse.from_plan(group_id, plan)
+
+
+def _format_sse(event: GroupEvent) -> str:
+    """Serialize an event as a server-sent event message."""
+    data = json.dumps(event.data, separators=(",", ":"))
+    return f"event: {event.type}\ndata: {data}\n\n"
+
+
+async def _stream_events(request: Request, subscription: Subscription) -> AsyncIterator[str]:
+    heartbeat = get_settings().EVENT_STREAM_HEARTBEAT_SECONDS
+    try:
+        # Ask EventSource clients to reconnect quickly if the connection drops
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            event = await subscription.get(timeout=heartbeat)
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield _format_sse(event)
+            if event.type in (EVENT_GROUP_DELETED, EVENT_RESYNC):
+                break
+    finally:
+        subscription.close()
+
+
+@router.get("/groups/{group_id}/events")
+async def group_events_api(
+    group_id: str,
+    request: Request,
+    current_user: User = Depends(require_authentication),
+):
+    """Stream a group's changes as server-sent events. User must be a member.
+
+    Events carry compact deltas: ``expense_added``, ``expense_deleted``, ``installment_paid``,
+    ``member_added``, ``expenses_imported`` (a count) and the new net ``balances``. The
+    stream ends after ``group_deleted``, or after ``resync`` when the client fell too far
+    behind and should refetch the group before reconnecting. The stream does not hold a
+    database session.
+    """
+    version = await AsyncDatabaseService.get_group_version(group_id, current_user.id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    if not version.is_member:
+        raise HTTPException(
+            status_code=403, detail="Access denied. You are not a member of this group."
+        )
+
+    subscription = get_event_broker().subscribe(group_id)
+    return StreamingResponse(
+        _stream_events(request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/groups/{group_id}/export")
+async def export_group_api(
+    group_id: str,
+    format: ExportFormat = Query(ExportFormat.CSV),
+    current_user: User = Depends(require_authentication),
+):
+    """Download a group's expense history with splits and installments. User must be a member.
+
+    ``format`` is ``csv``, ``jsonl`` or ``xlsx``. Rows are streamed from a server-side cursor
+    in expense creation order, so memory use does not grow with the size of the group.
+    """
+    version = await AsyncDatabaseService.get_group_version(group_id, current_user.id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    if not version.is_member:
+        raise HTTPException(
+            status_code=403, detail="Access denied. You are not a member of this group."
+        )
+
+    # A sync iterator: Starlette drives it from its threadpool, with a session of its own
+    chunks = ExportService.stream(DatabaseService.iter_group_expenses(group_id), format.value)
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format.value],
+        headers={
+            "Content-Disposition": f'attachment; filename="expenses-{group_id}.{format.value}"'
+        },
+    )
+
+
 @router.post("/groups/{group_id}/members/{user_id}", status_code=204)
 async def add_member_api(
-    group_id: str, user_id: str, current_user: User = Depends(require_authentication)
+    group_id: str,
+    user_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Add a member to a group via JSON API. User must be a member of the group."""
-    group = DatabaseService.get_group(group_id)
+    group = await AsyncDatabaseService.get_group(group_id, db=db)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
 
@@ -79,21 +278,29 @@ async def add_member_api(
             status_code=403, detail="Access denied. You are not a member of this group."
         )
 
-    if not DatabaseService.get_user(user_id):
+    user = await AsyncDatabaseService.get_user(user_id, db=db)
+    if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not DatabaseService.add_member_to_group(group_id, user_id):
+    if not await AsyncDatabaseService.add_member_to_group(group_id, user_id, db=db):
         raise HTTPException(status_code=400, detail="User is already a member")
 
+    event = GroupEvent(
+        type=EVENT_MEMBER_ADDED, group_id=group_id, data={"user_id": user.id, "name": user.name}
+    )
+    background_tasks.add_task(get_event_broker().publish, event)
     return {}
 
 
 @router.delete("/groups/{group_id}", status_code=204)
 async def delete_group_api(
-    group_id: str, current_user: User = Depends(require_authentication)
+    group_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Delete a group via JSON API. Only allowed if group is settled and user is a member."""
-    group = DatabaseService.get_group(group_id)
+    group = await AsyncDatabaseService.get_group(group_id, db=db)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
 
@@ -104,13 +311,15 @@ async def delete_group_api(
         )
 
     # Check if group is settled (no outstanding balances)
-    if not DatabaseService.is_group_settled(group_id):
+    if not await AsyncDatabaseService.is_group_settled(group_id, db=db):
         raise HTTPException(
             status_code=400, detail="Cannot delete group with outstanding balances. Please settle all debts first."
         )
 
     # Delete the group
-    if not DatabaseService.delete_group(group_id):
+    if not await AsyncDatabaseService.delete_group(group_id, db=db):
         raise HTTPException(status_code=500, detail="Failed to delete group")
 
+    event = GroupEvent(type=EVENT_GROUP_DELETED, group_id=group_id)
+    background_tasks.add_task(get_event_broker().publish, event)
     return None
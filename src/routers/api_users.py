@@ -1,23 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from src.auth import require_authentication
+from src.database import get_async_db
 from src.models.user import User
+from src.schemas.settlement import SettlementStrategy, UserBalancesResponse
 from src.schemas.user import UserCreate, UserResponse
-from src.services.database_service import DatabaseService
+from src.services.async_database_service import AsyncDatabaseService
+from src.services.settlement_service import SettlementService
 
 router = APIRouter(tags=["users"])
 
 
 @router.post("/users", response_model=UserResponse, status_code=201)
-async def create_user_api(user_data: UserCreate):
+async def create_user_api(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new user via JSON API."""
     # Check if user already exists
-    existing_user = DatabaseService.get_user_by_email(user_data.email)
+    existing_user = await AsyncDatabaseService.get_user_by_email(user_data.email, db=db)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Create new user via repository (generates ID)
-    created = DatabaseService.create_user(user_data.name, user_data.email)
+    created = await AsyncDatabaseService.create_user(user_data.name, user_data.email, db=db)
     return UserResponse.from_user(created)
 
 
@@ -38,3 +45,32 @@ async def get_user_api(user_id: str, current_user: User = Depends(require_authen
         )
 
     return UserResponse.from_user(current_user)
+
+
+@router.get("/me/balances", response_model=UserBalancesResponse)
+async def get_my_balances_api(
+    settle: bool = Query(False),
+    strategy: Optional[SettlementStrategy] = Query(None),
+    current_user: User = Depends(require_authentication),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """The current user's net position against every counterparty, across all their groups.
+
+    With ``settle=true`` the response also carries the user's transfers in one plan that
+    settles all of their groups together, so debts can cancel out across groups.
+    """
+    owed_by_user = await AsyncDatabaseService.get_counterparty_balances(current_user.id, db=db)
+    names = await AsyncDatabaseService.get_user_names(list(owed_by_user), db=db)
+
+    plan = None
+    if settle:
+        # Ledger nets are positive when the member owes, settlements expect the opposite
+        nets = await AsyncDatabaseService.get_consolidated_nets(current_user.id, db=db)
+        # The exact and heuristic strategies are CPU-bound; keep them off the event loop
+        plan = await run_in_threadpool(
+            SettlementService.plan,
+            {member_id: -net for member_id, net in nets.items()},
+            strategy.value if strategy else None,
+        )
+
+    return UserBalancesResponse.from_balances(current_user.id, owed_by_user, names, plan)
@@ -4,8 +4,10 @@ from typing import Dict, List, Optional
 
 from pydantic import BaseModel, validator
 
+from src.constants import EXPORT_CSV, EXPORT_JSONL, EXPORT_XLSX, SPLIT_EXACT
 from src.models.expense import Expense
 from src.models.installment import Installment
+from src.money import from_cents, from_cents_map
 
 
 class SplitType(str, Enum):
@@ -14,6 +16,12 @@ class SplitType(str, Enum):
     PERCENTAGE = "PERCENTAGE"
 
 
+class ExportFormat(str, Enum):
+    CSV = EXPORT_CSV
+    JSONL = EXPORT_JSONL
+    XLSX = EXPORT_XLSX
+
+
 class ExpenseCreate(BaseModel):
     description: str
     amount: float
@@ -31,12 +39,61 @@ class ExpenseCreate(BaseModel):
             raise ValueError("Amount must be positive")
         return v
 
+    @validator("split_among")
+    def split_among_must_not_be_empty(cls, v):
+        if not v:
+            raise ValueError("split_among must list at least one member")
+        return v
+
+    @validator("split_among")
+    def split_among_must_be_unique(cls, v):
+        # Members are stored once per expense; a repeated id would skew the ledger deltas
+        return list(dict.fromkeys(v))
+
     @validator("installments_count")
     def installments_must_be_positive(cls, v):
         if v < 1:
             raise ValueError("Installments count must be at least 1")
         return v
 
+    @classmethod
+    def from_csv_row(cls, row: Dict[str, Optional[str]]) -> "ExpenseCreate":
+        """Create ExpenseCreate from a CSV row keyed by field name.
+
+        ``split_among`` lists member ids separated by ``;`` and ``split_values`` holds
+        ``member_id=value`` pairs separated by ``;``. Empty cells take the field's default.
+        """
+        data = {
+            key.strip(): value.strip()
+            for key, value in row.items()
+            if isinstance(key, str) and isinstance(value, str) and value.strip()
+        }
+        if "split_among" in data:
+            data["split_among"] = [
+                user_id.strip() for user_id in data["split_among"].split(";") if user_id.strip()
+            ]
+        if "split_values" in data:
+            split_values = {}
+            for pair in data["split_values"].split(";"):
+                if not pair.strip():
+                    continue
+                user_id, separator, value = pair.partition("=")
+                if not separator:
+                    raise ValueError(f"Invalid split value {pair.strip()!r}, expected id=value")
+                split_values[user_id.strip()] = value.strip()
+            data["split_values"] = split_values
+        return cls(**data)
+
+
+class ExpenseImportError(BaseModel):
+    row: int  # 1-based position among the imported rows (CSV header not counted)
+    error: str
+
+
+class ExpenseBulkResponse(BaseModel):
+    created: int
+    expense_ids: List[str]
+
 
 class InstallmentResponse(BaseModel):
     number: int
@@ -53,7 +110,7 @@ class InstallmentResponse(BaseModel):
         """Create InstallmentResponse from Installment model."""
         return cls(
             number=installment.number,
-            amount=installment.amount,
+            amount=from_cents(installment.amount),
             due_date=installment.due_date,
             paid=installment.paid,
             paid_at=installment.paid_at,
@@ -84,13 +141,17 @@ class ExpenseResponse(BaseModel):
         return cls(
             id=expense.id,
             description=expense.description,
-            amount=expense.amount,
+            amount=from_cents(expense.amount),
             paid_by=expense.paid_by,
             created_by=expense.created_by,
             split_among=expense.split_among,
             category=expense.category,
             split_type=SplitType(expense.split_type),
-            split_values=expense.split_values,
+            split_values=(
+                from_cents_map(expense.split_values)
+                if expense.split_type == SPLIT_EXACT
+                else expense.split_values
+            ),
             created_at=expense.created_at,
             installments_count=expense.installments_count,
             first_due_date=expense.first_due_date.date() if expense.first_due_date else None,
@@ -1,8 +1,10 @@
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
-from src.models.group import Group
+from src.models.group import Group, GroupSummary
+from src.money import from_cents, from_cents_map
 
 from .user import UserResponse
 from .expense import ExpenseResponse
@@ -27,8 +29,8 @@ class GroupResponse(BaseModel):
     @classmethod
     def from_group(cls, group: Group) -> "GroupResponse":
         """Create GroupResponse from Group model."""
-        # Calculate group-specific balances based only on expenses in this group
-        balances = cls._calculate_group_specific_balances(group)
+        # Net balances from the group ledger, the source of the members' balances too
+        balances = cls.ledger_net_balances(group)
 
         return cls(
             id=group.id,
@@ -43,56 +45,43 @@ class GroupResponse(BaseModel):
         )
 
     @classmethod
-    def _calculate_group_specific_balances(cls, group: Group) -> Dict[str, float]:
-        """Calculate balances based only on expenses within this specific group."""
-        # Initialize balances for all group members
-        group_balances = {user_id: {} for user_id in group.members.keys()}
-        
-        # Process each expense in this group
-        for expense in group.expenses:
-            if expense.paid_by not in group.members:
-                continue  # Skip if payer is not a group member
-            
-            # Calculate portions for this expense
-            portions = {}
-            if expense.split_type == "EQUAL":
-                per_person = expense.amount / len(expense.split_among)
-                portions = {uid: round(per_person, 2) for uid in expense.split_among if uid in group.members}
-                # Handle rounding differences
-                diff = round(expense.amount - sum(portions.values()), 2)
-                if abs(diff) > 0.001:
-                    # Add difference to last person (preferably not the payer)
-                    candidates = [uid for uid in expense.split_among if uid != expense.paid_by and uid in group.members]
-                    if not candidates:
-                        candidates = [uid for uid in expense.split_among if uid in group.members]
-                    if candidates:
-                        portions[candidates[-1]] = round(portions.get(candidates[-1], 0.0) + diff, 2)
-            elif expense.split_type == "EXACT":
-                portions = {uid: amt for uid, amt in expense.split_values.items() if uid in group.members}
-            elif expense.split_type == "PERCENTAGE":
-                for uid, pct in expense.split_values.items():
-                    if uid in group.members:
-                        portions[uid] = round((expense.amount * pct) / 100.0, 2)
-            
-            # Apply portions to balances
-            for uid, owed_amount in portions.items():
-                if uid == expense.paid_by:
-                    continue  # Payer doesn't owe themselves
-                
-                # uid owes expense.paid_by the owed_amount
-                if expense.paid_by not in group_balances[uid]:
-                    group_balances[uid][expense.paid_by] = 0
-                group_balances[uid][expense.paid_by] += owed_amount
-                
-                # expense.paid_by is owed by uid
-                if uid not in group_balances[expense.paid_by]:
-                    group_balances[expense.paid_by][uid] = 0
-                group_balances[expense.paid_by][uid] -= owed_amount
-        
-        # Sum up net balances for each user in this group
-        net_balances = {}
-        for user_id in group.members.keys():
-            net_balance = sum(group_balances[user_id].values())
-            net_balances[user_id] = round(net_balance, 2)
-        
-        return net_balances
+    def ledger_net_balances(cls, group: Group) -> Dict[str, float]:
+        """Net amount each member still owes in the group (positive = owes, negative = is owed).
+
+        Summed from the members' ledger balances (see ``DatabaseService.load_group_balances``),
+        so paid installments are left out and no expense history is walked.
+        """
+        return {
+            user_id: from_cents(sum(member.balance.values()))
+            for user_id, member in group.members.items()
+        }
+
+
+class GroupSummaryResponse(BaseModel):
+    id: str
+    name: str
+    member_count: int
+    expense_count: int
+    total_amount: float
+    last_activity: Optional[datetime] = None
+    my_balance: float = 0.0  # The caller's net balance; positive = you owe
+    # Only in the single-group summary; list views leave these out
+    members: Optional[Dict[str, str]] = None  # user_id -> name
+    balances: Optional[Dict[str, float]] = None
+
+    @classmethod
+    def from_summary(
+        cls, summary: GroupSummary, user_id: Optional[str] = None, detailed: bool = True
+    ) -> "GroupSummaryResponse":
+        """Create GroupSummaryResponse from GroupSummary model."""
+        return cls(
+            id=summary.id,
+            name=summary.name,
+            member_count=summary.member_count,
+            expense_count=summary.expense_count,
+            total_amount=from_cents(summary.total_amount),
+            last_activity=summary.last_activity,
+            my_balance=from_cents(summary.balances.get(user_id, 0)),
+            members=summary.member_names if detailed else None,
+            balances=from_cents_map(summary.balances) if detailed else None,
+        )
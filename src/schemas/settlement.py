@@ -0,0 +1,104 @@
+from enum import Enum
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from src.constants import (
+    SETTLEMENT_AUTO,
+    SETTLEMENT_EXACT,
+    SETTLEMENT_GREEDY,
+    SETTLEMENT_HEURISTIC,
+)
+from src.money import Cents, from_cents
+from src.services.settlement_service import SettlementPlan
+
+
+class SettlementStrategy(str, Enum):
+    AUTO = SETTLEMENT_AUTO
+    GREEDY = SETTLEMENT_GREEDY
+    EXACT = SETTLEMENT_EXACT
+    HEURISTIC = SETTLEMENT_HEURISTIC
+
+
+class SettlementTransferResponse(BaseModel):
+    from_user_id: str
+    to_user_id: str
+    amount: float
+
+    @classmethod
+    def from_transfer(cls, transfer: Dict) -> "SettlementTransferResponse":
+        """Create SettlementTransferResponse from a SettlementService transfer."""
+        return cls(
+            from_user_id=transfer["from"],
+            to_user_id=transfer["to"],
+            amount=from_cents(transfer["amount"]),
+        )
+
+
+class SettlementPlanResponse(BaseModel):
+    group_id: str
+    strategy: SettlementStrategy
+    transaction_count: int
+    transfers: List[SettlementTransferResponse] = []
+
+    @classmethod
+    def from_plan(cls, group_id: str, plan: SettlementPlan) -> "SettlementPlanResponse":
+        """Create SettlementPlanResponse from a SettlementPlan."""
+        return cls(
+            group_id=group_id,
+            strategy=SettlementStrategy(plan.strategy),
+            transaction_count=len(plan.transfers),
+            transfers=[
+                SettlementTransferResponse.from_transfer(transfer) for transfer in plan.transfers
+            ],
+        )
+
+
+class CounterpartyBalanceResponse(BaseModel):
+    user_id: str
+    name: str
+    amount: float  # Positive = they owe you, negative = you owe them
+
+
+class UserBalancesResponse(BaseModel):
+    user_id: str
+    net: float  # Positive = you are owed overall
+    owed_to_you: float
+    you_owe: float
+    counterparties: List[CounterpartyBalanceResponse] = []
+    # Only with ?settle=true: your transfers in a plan settling all your groups at once
+    settlement_strategy: Optional[SettlementStrategy] = None
+    settlement: Optional[List[SettlementTransferResponse]] = None
+
+    @classmethod
+    def from_balances(
+        cls,
+        user_id: str,
+        owed_by_user: Dict[str, Cents],
+        names: Dict[str, str],
+        plan: Optional[SettlementPlan] = None,
+    ) -> "UserBalancesResponse":
+        """Create UserBalancesResponse from counterparty_id -> cents the user owes them."""
+        counterparties = sorted(owed_by_user.items(), key=lambda item: item[1])
+        return cls(
+            user_id=user_id,
+            net=from_cents(-sum(owed_by_user.values())),
+            owed_to_you=from_cents(-sum(c for c in owed_by_user.values() if c < 0)),
+            you_owe=from_cents(sum(c for c in owed_by_user.values() if c > 0)),
+            counterparties=[
+                CounterpartyBalanceResponse(
+                    user_id=other_id, name=names.get(other_id, ""), amount=from_cents(-cents)
+                )
+                for other_id, cents in counterparties
+            ],
+            settlement_strategy=SettlementStrategy(plan.strategy) if plan else None,
+            settlement=(
+                [
+                    SettlementTransferResponse.from_transfer(transfer)
+                    for transfer in plan.transfers
+                    if user_id in (transfer["from"], transfer["to"])
+                ]
+                if plan
+                else None
+            ),
+        )
@@ -3,6 +3,7 @@ from typing import Dict
 from pydantic import BaseModel, EmailStr
 
 from src.models.user import User
+from src.money import from_cents_map
 
 
 class UserCreate(BaseModel):
@@ -22,4 +23,6 @@ class UserResponse(BaseModel):
     @classmethod
     def from_user(cls, user: User) -> "UserResponse":
         """Create UserResponse from User model."""
-        return cls(id=user.id, name=user.name, email=user.email, balance=user.balance)
+        return cls(
+            id=user.id, name=user.name, email=user.email, balance=from_cents_map(user.balance)
+        )
@@ -0,0 +1,227 @@
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import database
+from src.models.expense import Expense
+from src.models.group import Group, GroupSummary, GroupVersion
+from src.models.user import User
+from src.services.database_service import DatabaseService
+
+T = TypeVar("T")
+
+
+class AsyncDatabaseService:
+    """Awaitable counterpart of DatabaseService for the async API routers.
+
+    Each call runs on an ``AsyncSession`` from the asyncio engine (asyncpg on Postgres,
+    aiosqlite on SQLite). The repository code is shared with the synchronous service through
+    ``AsyncSession.run_sync``, so the event loop is never blocked on database I/O.
+
+    Routers pass their request-scoped session (``get_async_db``) as ``db`` so that every call
+    in a request shares one connection and one transaction. Without it, the call runs in a
+    session of its own that is committed immediately.
+    """
+
+    @staticmethod
+    async def _run(
+        operation: Callable[..., T], *args, db: Optional[AsyncSession] = None, **kwargs
+    ) -> T:
+        """Run a DatabaseService operation on the given async session, or on a fresh one."""
+        if db is not None:
+            return await db.run_sync(lambda session: operation(*args, db=session, **kwargs))
+
+        async with database.AsyncSessionLocal() as session:
+            result = await session.run_sync(lambda sync: operation(*args, db=sync, **kwargs))
+            await session.commit()
+            return result
+
+    @staticmethod
+    async def get_groups_for_user(
+        user_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        db: Optional[AsyncSession] = None,
+    ) -> List[Group]:
+        """Get a page of the groups a user is a member of."""
+        return await AsyncDatabaseService._run(
+            DatabaseService.get_groups_for_user, user_id, limit=limit, offset=offset, db=db
+        )
+
+    @staticmethod
+    async def create_user(name: str, email: str, db: Optional[AsyncSession] = None) -> User:
+        """Create a new user."""
+        return await AsyncDatabaseService._run(DatabaseService.create_user, name, email, db=db)
+
+    @staticmethod
+    async def create_group(
+        name: str, member_ids: List[str] | None = None, db: Optional[AsyncSession] = None
+    ) -> Group:
+        """Create a new group with optional member IDs."""
+        return await AsyncDatabaseService._run(
+            DatabaseService.create_group, name, member_ids, db=db
+        )
+
+    @staticmethod
+    async def get_user(user_id: str, db: Optional[AsyncSession] = None) -> Optional[User]:
+        """Get user by ID."""
+        return await AsyncDatabaseService._run(DatabaseService.get_user, user_id, db=db)
+
+    @staticmethod
+    async def get_user_by_email(email: str, db: Optional[AsyncSession] = None) -> Optional[User]:
+        """Get user by email."""
+        return await AsyncDatabaseService._run(DatabaseService.get_user_by_email, email, db=db)
+
+    @staticmethod
+    async def get_group(group_id: str, db: Optional[AsyncSession] = None) -> Optional[Group]:
+        """Get group by ID."""
+        return await AsyncDatabaseService._run(DatabaseService.get_group, group_id, db=db)
+
+    @staticmethod
+    async def get_group_member_ids(
+        group_id: str, db: Optional[AsyncSession] = None
+    ) -> Optional[List[str]]:
+        """Get the IDs of a group's members, or None if the group does not exist."""
+        return await AsyncDatabaseService._run(
+            DatabaseService.get_group_member_ids, group_id, db=db
+        )
+
+    @staticmethod
+    async def get_group_version(
+        group_id: str, user_id: str, db: Optional[AsyncSession] = None
+    ) -> Optional[GroupVersion]:
+        """Get a group's cache validators and whether the user is a member."""
+        return await AsyncDatabaseService._run(
+            DatabaseService.get_group_version, group_id, user_id, db=db
+        )
+
+    @staticmethod
+    async def list_group_expenses(
+        group_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        db: Optional[AsyncSession] = None,
+        **filters,
+    ) -> Tuple[List[Expense], Optional[str]]:
+        """Get a page of a group's expenses and the cursor of the next page (None if last)."""
+        return await AsyncDatabaseService._run(
+            DatabaseService.list_group_expenses, group_id, limit, cursor, db=db, **filters
+        )
+
+    @staticmethod
+    async def get_group_summary(
+        group_id: str, db: Optional[AsyncSession] = None
+    ) -> Optional[GroupSummary]:
+        """Get a group's members, totals and net balances without loading its expenses."""
+        return await AsyncDatabaseService._run(DatabaseService.get_group_summary, group_id, db=db)
+
+    @staticmethod
+    async def get_group_summaries_for_user(
+        user_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        db: Optional[AsyncSession] = None,
+    ) -> List[GroupSummary]:
+        """Get summaries for a page of a user's groups without loading members or expenses."""
+        return await AsyncDatabaseService._run(
+            DatabaseService.get_group_summaries_for_user,
+            user_id,
+            limit=limit,
+            offset=offset,
+            db=db,
+        )
+
+    @staticmethod
+    async def add_member_to_group(
+        group_id: str, user_id: str, db: Optional[AsyncSession] = None
+    ) -> bool:
+        """Add member to group."""
+        return await AsyncDatabaseService._run(
+            DatabaseService.add_member_to_group, group_id, user_id, db=db
+        )
+
+    @staticmethod
+    async def delete_group(group_id: str, db: Optional[AsyncSession] = None) -> bool:
+        """Delete group by ID."""
+        return await AsyncDatabaseService._run(DatabaseService.delete_group, group_id, db=db)
+
+    @staticmethod
+    async def is_group_settled(group_id: str, db: Optional[AsyncSession] = None) -> bool:
+        """Check if a group is settled (all balances below threshold)."""
+        return await AsyncDatabaseService._run(DatabaseService.is_group_settled, group_id, db=db)
+
+    @staticmethod
+    async def load_group_balances(group: Group, db: Optional[AsyncSession] = None) -> None:
+        """Populate each member's balance from the group's persisted balance ledger."""
+        await AsyncDatabaseService._run(DatabaseService.load_group_balances, group, db=db)
+
+    @staticmethod
+    async def get_counterparty_balances(
+        user_id: str, db: Optional[AsyncSession] = None
+    ) -> Dict[str, int]:
+        """Get other_user_id -> cents the user owes them, across all the user's groups."""
+        return await AsyncDatabaseService._run(
+            DatabaseService.get_counterparty_balances, user_id, db=db
+        )
+
+    @staticmethod
+    async def get_consolidated_nets(
+        user_id: str, db: Optional[AsyncSession] = None
+    ) -> Dict[str, int]:
+        """Get member_id -> net cents owed, summed over all the user's groups."""
+        return await AsyncDatabaseService._run(
+            DatabaseService.get_consolidated_nets, user_id, db=db
+        )
+
+    @staticmethod
+    async def get_user_names(
+        user_ids: List[str], db: Optional[AsyncSession] = None
+    ) -> Dict[str, str]:
+        """Get user_id -> name for the given users."""
+        return await AsyncDatabaseService._run(DatabaseService.get_user_names, user_ids, db=db)
+
+    @staticmethod
+    async def update_user_balances(
+        users: Dict[str, User], db: Optional[AsyncSession] = None
+    ) -> int:
+        """Flush changed user balances to the database in a single batched UPDATE."""
+        return await AsyncDatabaseService._run(DatabaseService.update_user_balances, users, db=db)
+
+    @staticmethod
+    async def update_user_balances_on_read(
+        users: Dict[str, User], db: Optional[AsyncSession] = None
+    ) -> None:
+        """Persist balances from a read path, only in the legacy "on_read" mode."""
+        await AsyncDatabaseService._run(DatabaseService.update_user_balances_on_read, users, db=db)
+
+    @staticmethod
+    async def add_expense_to_group(
+        group_id: str, expense, db: Optional[AsyncSession] = None
+    ) -> None:
+        """Add expense to group and record its shares in the balance ledger."""
+        await AsyncDatabaseService._run(
+            DatabaseService.add_expense_to_group, group_id, expense, db=db
+        )
+
+    @staticmethod
+    async def add_expenses_to_group(
+        group_id: str, expenses: List[Expense], db: Optional[AsyncSession] = None
+    ) -> int:
+        """Insert many expenses and record their shares in the balance ledger in one pass."""
+        return await AsyncDatabaseService._run(
+            DatabaseService.add_expenses_to_group, group_id, expenses, db=db
+        )
+
+    @staticmethod
+    async def pay_installment(
+        expense_id: str, installment_number: int, db: Optional[AsyncSession] = None
+    ) -> bool:
+        """Mark installment as paid and release its share from the balance ledger."""
+        return await AsyncDatabaseService._run(
+            DatabaseService.pay_installment, expense_id, installment_number, db=db
+        )
+
+    @staticmethod
+    async def delete_expense(expense_id: str, db: Optional[AsyncSession] = None) -> bool:
+        """Delete an expense and reverse its shares in the balance ledger."""
+        return await AsyncDatabaseService._run(DatabaseService.delete_expense, expense_id, db=db)
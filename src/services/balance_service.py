@@ -1,11 +1,16 @@
 """Balance calculation service for expense splitting."""
 
+from bisect import bisect_right
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
+from ..constants import MIN_BALANCE_THRESHOLD
 from ..models.expense import Expense
 from ..models.user import User
+from ..money import Cents, div_half_up
+from .portion_service import PortionService
+from .settlement_service import SettlementService
 
 
 @dataclass
@@ -15,7 +20,7 @@ class Balance:
     id: str
     from_user: User
     to_user: User
-    amount: float  # Positive means from_user receives, negative means from_user owes
+    amount: Cents  # Positive means from_user receives, negative means from_user owes
 
 
 @dataclass
@@ -25,63 +30,82 @@ class SettlementSuggestion:
     id: str
     from_user: User
     to_user: User
-    amount: float
+    amount: Cents
 
 
 class BalanceService:
     """Service for calculating balances and settlement suggestions."""
 
-    def calculate_group_balances(
-        self, expenses: List[Expense], users: Dict[str, User]
-    ) -> List[Balance]:
+    def calculate_net_balances(self, expenses: List[Expense]) -> Dict[str, Cents]:
         """
-        Calculate balances between all users in a group.
+        Calculate each user's net balance across a group's expenses in O(users + splits).
 
         Args:
             expenses: List of expenses in the group
-            users: Dictionary of user_id -> User objects
 
         Returns:
-            List of Balance objects representing who owes whom
+            Dictionary of user_id -> cents (positive = they are owed, negative = they owe)
         """
-        # Track net balances for each user (positive = they are owed, negative = they owe)
-        user_balances = defaultdict(float)
+        user_balances = defaultdict(int)
 
         for expense in expenses:
-            # Calculate how much each person should pay
-            split_amounts = self._calculate_split_amounts(expense)
-
             # The person who paid gets credited
             user_balances[expense.paid_by] += expense.amount
 
             # Each person in the split gets debited their share
-            for user_id, amount in split_amounts.items():
+            for user_id, amount in self._calculate_split_amounts(expense).items():
                 user_balances[user_id] -= amount
 
-        # Convert net balances to pairwise balances
-        balances = []
-        user_ids = list(user_balances.keys())
+        return dict(user_balances)
+
+    def iter_pairwise_balances(
+        self, net_balances: Dict[str, Cents], users: Dict[str, User]
+    ) -> Iterator[Balance]:
+        """
+        Lazily derive the pairwise view of net balances, one Balance per user pair.
+
+        There are O(n²) pairs, so callers should consume only what they need.
+
+        Args:
+            net_balances: Output of calculate_net_balances
+            users: Dictionary of user_id -> User objects
+
+        Yields:
+            Balance objects for every pair whose split difference reaches the threshold
+        """
+        user_ids = list(net_balances.keys())
 
         for i, user1_id in enumerate(user_ids):
             for user2_id in user_ids[i + 1 :]:
-                balance1 = user_balances[user1_id]
-                balance2 = user_balances[user2_id]
+                # Split the difference between the two net balances
+                amount = div_half_up(net_balances[user1_id] - net_balances[user2_id], 2)
 
-                # Calculate net balance between these two users
-                net_balance = balance1 - balance2
-
-                if abs(net_balance) > 0.01:  # Only include non-zero balances
-                    balance = Balance(
+                if abs(amount) >= MIN_BALANCE_THRESHOLD:  # Only include non-zero balances
+                    yield Balance(
                         id=f"{user1_id}_{user2_id}",
                         from_user=users[user1_id],
                         to_user=users[user2_id],
-                        amount=net_balance / 2,  # Split the difference
+                        amount=amount,
                     )
-                    balances.append(balance)
 
-        return balances
+    def calculate_group_balances(
+        self, expenses: List[Expense], users: Dict[str, User]
+    ) -> List[Balance]:
+        """
+        Calculate balances between all users in a group.
+
+        Materializes every pair; prefer calculate_net_balances where nets are enough.
+
+        Args:
+            expenses: List of expenses in the group
+            users: Dictionary of user_id -> User objects
+
+        Returns:
+            List of Balance objects representing who owes whom
+        """
+        return list(self.iter_pairwise_balances(self.calculate_net_balances(expenses), users))
 
-    def calculate_user_summary(self, user_id: str, expenses: List[Expense]) -> Dict[str, float]:
+    def calculate_user_summary(self, user_id: str, expenses: List[Expense]) -> Dict[str, Cents]:
         """
         Calculate summary balances for a specific user.
 
@@ -90,15 +114,15 @@ class BalanceService:
             expenses: List of expenses involving the user
 
         Returns:
-            Dictionary with 'owes', 'owed', and 'total_spent' amounts
+            Dictionary with 'owes', 'owed', and 'total_spent' amounts in cents
         """
-        total_paid = 0.0
-        total_share = 0.0
+        total_paid = 0
+        total_share = 0
 
         for expense in expenses:
             # Calculate user's share of this expense
             split_amounts = self._calculate_split_amounts(expense)
-            user_share = split_amounts.get(user_id, 0.0)
+            user_share = split_amounts.get(user_id, 0)
             total_share += user_share
 
             # Add amount if user paid for this expense
@@ -114,74 +138,57 @@ class BalanceService:
             "total_share": total_share,
         }
 
+    def suggest_settlements(
+        self, net_balances: Dict[str, Cents], users: Dict[str, User]
+    ) -> List[SettlementSuggestion]:
+        """
+        Generate settlement suggestions straight from net balances.
+
+        Args:
+            net_balances: Dictionary of user_id -> cents (positive = is owed)
+            users: Dictionary of user_id -> User objects
+
+        Returns:
+            List of settlement suggestions
+        """
+        return [
+            SettlementSuggestion(
+                id=str(suggestion_id),
+                from_user=users[transfer["from"]],
+                to_user=users[transfer["to"]],
+                amount=transfer["amount"],
+            )
+            for suggestion_id, transfer in enumerate(SettlementService.settle(net_balances), 1)
+        ]
+
     def generate_settlement_suggestions(
         self, balances: List[Balance]
     ) -> List[SettlementSuggestion]:
         """
         Generate optimal settlement suggestions to minimize number of transactions.
 
+        Kept for callers holding pairwise balances; suggest_settlements skips the round trip.
+
         Args:
             balances: List of current balances
 
         Returns:
             List of settlement suggestions
         """
-        # Create a net balance map for each user
-        net_balances = defaultdict(float)
+        # Net balance per user (positive = is owed, negative = owes)
+        net_balances = defaultdict(int)
         users_map = {}
 
         for balance in balances:
-            if balance.amount > 0:
-                # from_user is owed money
-                net_balances[balance.from_user.id] += balance.amount
-                net_balances[balance.to_user.id] -= balance.amount
-            else:
-                # from_user owes money
-                net_balances[balance.from_user.id] += balance.amount
-                net_balances[balance.to_user.id] -= balance.amount
+            net_balances[balance.from_user.id] += balance.amount
+            net_balances[balance.to_user.id] -= balance.amount
 
             users_map[balance.from_user.id] = balance.from_user
             users_map[balance.to_user.id] = balance.to_user
 
-        # Separate creditors (positive balance) and debtors (negative balance)
-        creditors = [(user_id, amount) for user_id, amount in net_balances.items() if amount > 0.01]
-        debtors = [(user_id, -amount) for user_id, amount in net_balances.items() if amount < -0.01]
-
-        suggestions = []
-        suggestion_id = 1
-
-        # Match debtors with creditors to minimize transactions
-        i, j = 0, 0
-        while i < len(debtors) and j < len(creditors):
-            debtor_id, debt_amount = debtors[i]
-            creditor_id, credit_amount = creditors[j]
-
-            # Settle the smaller amount
-            settle_amount = min(debt_amount, credit_amount)
-
-            if settle_amount > 0.01:
-                suggestion = SettlementSuggestion(
-                    id=str(suggestion_id),
-                    from_user=users_map[debtor_id],
-                    to_user=users_map[creditor_id],
-                    amount=settle_amount,
-                )
-                suggestions.append(suggestion)
-                suggestion_id += 1
-
-            # Update remaining amounts
-            debtors[i] = (debtor_id, debt_amount - settle_amount)
-            creditors[j] = (creditor_id, credit_amount - settle_amount)
-
-            # Move to next debtor/creditor if current one is settled
-            if debtors[i][1] <= 0.01:
-                i += 1
-            if creditors[j][1] <= 0.01:
-                j += 1
-
-        return suggestions
-
-    def _calculate_split_amounts(self, expense: Expense) -> Dict[str, float]:
+        return self.suggest_settlements(net_balances, users_map)
+
+    def _calculate_split_amounts(self, expense: Expense) -> Dict[str, Cents]:
         """
         Calculate how much each person should pay for an expense.
 
@@ -189,28 +196,9 @@ class BalanceService:
             expense: The expense to calculate splits for
 
         Returns:
-            Dictionary mapping user_id to amount they should pay
+            Dictionary mapping user_id to the cents they should pay
         """
-        split_amounts = {}
-
-        if expense.split_type == "EQUAL":
-            # Split equally among all people
-            amount_per_person = expense.amount / len(expense.split_among)
-            for user_id in expense.split_among:
-                split_amounts[user_id] = amount_per_person
-
-        elif expense.split_type == "EXACT":
-            # Use exact amounts specified
-            for user_id in expense.split_among:
-                split_amounts[user_id] = expense.split_values.get(user_id, 0.0)
-
-        elif expense.split_type == "PERCENTAGE":
-            # Calculate based on percentages
-            for user_id in expense.split_among:
-                percentage = expense.split_values.get(user_id, 0.0)
-                split_amounts[user_id] = (expense.amount * percentage) / 100.0
-
-        return split_amounts
+        return PortionService.portions(expense)
 
     def calculate_group_statistics(
         self, expenses: List[Expense], users: Dict[str, User]
@@ -227,8 +215,8 @@ class BalanceService:
         """
         if not expenses:
             return {
-                "total_expenses": 0.0,
-                "average_expense": 0.0,
+                "total_expenses": 0,
+                "average_expense": 0,
                 "total_transactions": 0,
                 "most_active_user": None,
                 "largest_expense": None,
@@ -236,7 +224,7 @@ class BalanceService:
             }
 
         total_amount = sum(expense.amount for expense in expenses)
-        average_expense = total_amount / len(expenses)
+        average_expense = div_half_up(total_amount, len(expenses))
 
         # Count expenses per user
         user_expense_counts = defaultdict(int)
@@ -249,9 +237,9 @@ class BalanceService:
         # Find largest expense
         largest_expense = max(expenses, key=lambda x: x.amount)
 
-        # Calculate pending settlements
-        balances = self.calculate_group_balances(expenses, users)
-        pending_settlements = len([b for b in balances if abs(b.amount) > 0.01])
+        # Pending settlements: pairs whose split difference reaches the threshold
+        net_balances = self.calculate_net_balances(expenses)
+        pending_settlements = self._count_unsettled_pairs(list(net_balances.values()))
 
         return {
             "total_expenses": total_amount,
@@ -261,3 +249,18 @@ class BalanceService:
             "largest_expense": largest_expense,
             "pending_settlements": pending_settlements,
         }
+
+    @staticmethod
+    def _count_unsettled_pairs(nets: List[Cents]) -> int:
+        """Count the pairs iter_pairwise_balances would yield, in O(n log n).
+
+        A pair yields a Balance when half its difference, rounded half up, reaches the
+        threshold, i.e. when the difference itself is at least ``2 * MIN_BALANCE_THRESHOLD - 1``.
+        """
+        nets = sorted(nets)
+        settled_pairs = 0
+        for i, net in enumerate(nets):
+            settled_pairs += (
+                bisect_right(nets, net + 2 * MIN_BALANCE_THRESHOLD - 2, lo=i + 1) - i - 1
+            )
+        return len(nets) * (len(nets) - 1) // 2 - settled_pairs
@@ -1,13 +1,25 @@
 from contextlib import contextmanager
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.constants import BALANCE_MATERIALIZATION_ON_READ, MIN_BALANCE_THRESHOLD
 from src.database import create_tables, get_db
-from src.models.group import Group
+from src.models.expense import Expense, Installment
+from src.models.group import Group, GroupSummary, GroupVersion
+from src.models.notification import OutboxItem
 from src.models.user import User
+from src.pagination import decode_cursor, encode_cursor
+from src.repositories.balance_ledger_repository import BalanceLedgerRepository
 from src.repositories.expense_repository import ExpenseRepository
 from src.repositories.group_repository import GroupRepository
+from src.repositories.notification_outbox_repository import NotificationOutboxRepository
 from src.repositories.user_repository import UserRepository
+from src.services.portion_service import PortionService
+from src.services.user_cache import user_cache
+from src.settings import get_settings
 
 
 class DatabaseService:
@@ -20,192 +32,443 @@ class DatabaseService:
 
     @staticmethod
     @contextmanager
-    def get_session():
-        """Get a database session with automatic cleanup."""
+    def get_session(db: Optional[Session] = None):
+        """Get a database session acting as a unit of work.
+
+        Repositories only flush. When ``db`` is given (the request-scoped session of the API
+        routers) it is reused as-is and its owner commits once at the end of the request;
+        otherwise a session is opened here and committed, or rolled back on error.
+        """
+        if db is not None:
+            yield db
+            return
+
         db = next(get_db())
         try:
             yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
         finally:
             db.close()
 
     @staticmethod
-    def get_all_users() -> Dict[str, User]:
+    def _invalidate_cached_users(db: Session, user_ids: Iterable[str]) -> None:
+        """Drop users from the auth cache once ``db``'s transaction has committed.
+
+        With a request-scoped session the commit comes after the handler returns; dropping
+        them any earlier would let a concurrent lookup cache the old row again.
+        """
+        user_ids = list(user_ids)
+        event.listen(db, "after_commit", lambda _: user_cache.invalidate(user_ids), once=True)
+
+    @staticmethod
+    def get_all_users(db: Optional[Session] = None) -> Dict[str, User]:
         """Get all users as a dictionary (compatible with current state interface)."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
             user_repo = UserRepository(db)
             users = user_repo.get_all()
             return {user.id: user for user in users}
 
     @staticmethod
-    def get_all_groups() -> Dict[str, Group]:
+    def get_all_groups(db: Optional[Session] = None) -> Dict[str, Group]:
         """Get all groups as a dictionary (compatible with current state interface)."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
             group_repo = GroupRepository(db)
             groups = group_repo.get_all()
             return {group.id: group for group in groups}
 
     @staticmethod
-    def create_user(name: str, email: str) -> User:
+    def get_groups_for_user(
+        user_id: str, limit: Optional[int] = None, offset: int = 0, db: Optional[Session] = None
+    ) -> List[Group]:
+        """Get a page of the groups a user is a member of."""
+        with DatabaseService.get_session(db) as db:
+            group_repo = GroupRepository(db)
+            return group_repo.get_for_user(user_id, limit=limit, offset=offset)
+
+    @staticmethod
+    def create_user(name: str, email: str, db: Optional[Session] = None) -> User:
         """Create a new user."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
             user_repo = UserRepository(db)
             return user_repo.create(name, email)
 
     @staticmethod
-    def create_user_with_password(name: str, email: str, password_hash: str) -> User:
+    def create_user_with_password(
+        name: str, email: str, password_hash: str, db: Optional[Session] = None
+    ) -> User:
         """Create a new user with password hash."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
             user_repo = UserRepository(db)
             return user_repo.create_with_password(name, email, password_hash)
 
     @staticmethod
-    def create_group(name: str, member_ids: List[str] | None = None) -> Group:
+    def create_group(
+        name: str, member_ids: List[str] | None = None, db: Optional[Session] = None
+    ) -> Group:
         """Create a new group with optional member IDs."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
             group_repo = GroupRepository(db)
             return group_repo.create(name, member_ids or [])
 
     @staticmethod
-    def get_user(user_id: str) -> Optional[User]:
+    def get_user(user_id: str, db: Optional[Session] = None) -> Optional[User]:
         """Get user by ID."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
             user_repo = UserRepository(db)
             return user_repo.get_by_id(user_id)
 
     @staticmethod
-    def get_user_by_email(email: str) -> Optional[User]:
+    def get_user_by_email(email: str, db: Optional[Session] = None) -> Optional[User]:
         """Get user by email."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
             user_repo = UserRepository(db)
             return user_repo.get_by_email(email)
 
     @staticmethod
-    def update_user_reset_token(user_id: str, reset_token: str, expiry: datetime) -> bool:
+    def update_user_reset_token(
+        user_id: str, reset_token: str, expiry: datetime, db: Optional[Session] = None
+    ) -> bool:
         """Update user's password reset token and expiry."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
             user_repo = UserRepository(db)
-            return user_repo.update_reset_token(user_id, reset_token, expiry)
+            updated = user_repo.update_reset_token(user_id, reset_token, expiry)
+            DatabaseService._invalidate_cached_users(db, [user_id])
+        return updated
 
     @staticmethod
-    def get_user_by_reset_token(reset_token: str) -> Optional[User]:
+    def get_user_by_reset_token(reset_token: str, db: Optional[Session] = None) -> Optional[User]:
         """Get user by reset token."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
             user_repo = UserRepository(db)
             return user_repo.get_by_reset_token(reset_token)
 
     @staticmethod
-    def update_user_password(user_id: str, password_hash: str) -> bool:
+    def update_user_password(
+        user_id: str, password_hash: str, db: Optional[Session] = None
+    ) -> bool:
         """Update user's password hash and clear reset token."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
+            user_repo = UserRepository(db)
+            updated = user_repo.update_password(user_id, password_hash)
+            DatabaseService._invalidate_cached_users(db, [user_id])
+        return updated
+
+    @staticmethod
+    def update_user_notification_preferences(
+        user_id: str, preferences: Dict[str, bool | int], db: Optional[Session] = None
+    ) -> None:
+        """Replace a user's notification preferences."""
+        with DatabaseService.get_session(db) as db:
             user_repo = UserRepository(db)
-            return user_repo.update_password(user_id, password_hash)
+            user_repo.update_notification_preferences(user_id, preferences)
+            DatabaseService._invalidate_cached_users(db, [user_id])
 
     @staticmethod
-    def get_group(group_id: str) -> Optional[Group]:
+    def get_group(group_id: str, db: Optional[Session] = None) -> Optional[Group]:
         """Get group by ID."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
             group_repo = GroupRepository(db)
             return group_repo.get_by_id(group_id)
 
     @staticmethod
-    def add_member_to_group(group_id: str, user_id: str) -> bool:
+    def get_group_member_ids(group_id: str, db: Optional[Session] = None) -> Optional[List[str]]:
+        """Get the IDs of a group's members, or None if the group does not exist."""
+        with DatabaseService.get_session(db) as db:
+            return GroupRepository(db).get_member_ids(group_id)
+
+    @staticmethod
+    def get_group_version(
+        group_id: str, user_id: str, db: Optional[Session] = None
+    ) -> Optional[GroupVersion]:
+        """Get a group's cache validators and whether the user is a member."""
+        with DatabaseService.get_session(db) as db:
+            return GroupRepository(db).get_version(group_id, user_id)
+
+    @staticmethod
+    def list_group_expenses(
+        group_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        db: Optional[Session] = None,
+        **filters,
+    ) -> Tuple[List[Expense], Optional[str]]:
+        """Get a page of a group's expenses and the cursor of the next page (None if last).
+
+        ``filters`` are passed to ``ExpenseRepository.list_for_group``.
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is malformed
+        """
+        after = decode_cursor(cursor) if cursor else None
+        with DatabaseService.get_session(db) as db:
+            # One extra row tells whether another page follows
+            expenses = ExpenseRepository(db).list_for_group(
+                group_id, limit + 1, after=after, **filters
+            )
+        if len(expenses) <= limit:
+            return expenses, None
+        last = expenses[limit - 1]
+        return expenses[:limit], encode_cursor(last.created_at, last.id)
+
+    @staticmethod
+    def iter_group_expenses(
+        group_id: str, batch_size: int = 500, db: Optional[Session] = None
+    ) -> Iterator[Expense]:
+        """Stream a group's expenses oldest first, in constant memory (see iter_for_export).
+
+        The session stays open until the iterator is exhausted or closed.
+        """
+        with DatabaseService.get_session(db) as db:
+            yield from ExpenseRepository(db).iter_for_export(group_id, batch_size)
+
+    @staticmethod
+    def get_unpaid_installments_due(
+        due_before: datetime,
+        due_from: Optional[datetime] = None,
+        created_after: Optional[datetime] = None,
+        db: Optional[Session] = None,
+    ) -> List[Tuple[User, Expense, Installment, Group]]:
+        """Unpaid installments due in ``[due_from, due_before)`` with each member who owes them."""
+        with DatabaseService.get_session(db) as db:
+            return ExpenseRepository(db).get_unpaid_installments_due(
+                due_before, due_from, created_after
+            )
+
+    @staticmethod
+    def enqueue_notifications(
+        kind: str,
+        notify_on: date,
+        entries: Iterable[Tuple[str, str, int]],
+        db: Optional[Session] = None,
+    ) -> int:
+        """Queue ``(user_id, expense_id, installment_number)`` reminders; returns rows added."""
+        with DatabaseService.get_session(db) as db:
+            return NotificationOutboxRepository(db).enqueue(kind, notify_on, entries)
+
+    @staticmethod
+    def claim_notifications(
+        max_users: int,
+        kind: Optional[str] = None,
+        after_user_id: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> Optional[Tuple[str, str]]:
+        """Claim the pending reminders of the next users (see NotificationOutboxRepository)."""
+        with DatabaseService.get_session(db) as db:
+            return NotificationOutboxRepository(db).claim(max_users, kind, after_user_id)
+
+    @staticmethod
+    def load_claimed_notifications(
+        claim_id: str, db: Optional[Session] = None
+    ) -> List[OutboxItem]:
+        """The claimed reminders still worth sending; the others are marked skipped."""
+        with DatabaseService.get_session(db) as db:
+            return NotificationOutboxRepository(db).load_claim(claim_id)
+
+    @staticmethod
+    def mark_notifications_sent(outbox_ids: List[int], db: Optional[Session] = None) -> None:
+        """Record delivered reminders."""
+        with DatabaseService.get_session(db) as db:
+            NotificationOutboxRepository(db).mark_sent(outbox_ids)
+
+    @staticmethod
+    def mark_notifications_failed(
+        outbox_ids: List[int], error: str, max_attempts: int, db: Optional[Session] = None
+    ) -> None:
+        """Record a failed delivery, to be retried until ``max_attempts``."""
+        with DatabaseService.get_session(db) as db:
+            NotificationOutboxRepository(db).mark_failed(outbox_ids, error, max_attempts)
+
+    @staticmethod
+    def get_notification_outbox_counts(db: Optional[Session] = None) -> Dict[str, int]:
+        """Number of outbox rows in each status."""
+        with DatabaseService.get_session(db) as db:
+            return NotificationOutboxRepository(db).count_by_status()
+
+    @staticmethod
+    def get_group_summary(group_id: str, db: Optional[Session] = None) -> Optional[GroupSummary]:
+        """Get a group's members, totals and ledger net balances without loading its expenses."""
+        with DatabaseService.get_session(db) as db:
+            ledger_repo = BalanceLedgerRepository(db)
+            if not ledger_repo.is_materialized(group_id):
+                group = GroupRepository(db).get_by_id(group_id)
+                if group:
+                    ledger_repo.rebuild(group)
+            return GroupRepository(db).get_summary(group_id)
+
+    @staticmethod
+    def get_group_summaries_for_user(
+        user_id: str, limit: Optional[int] = None, offset: int = 0, db: Optional[Session] = None
+    ) -> List[GroupSummary]:
+        """Get summaries for a page of a user's groups without loading members or expenses."""
+        with DatabaseService.get_session(db) as db:
+            DatabaseService._materialize_user_ledgers(user_id, db)
+            return GroupRepository(db).get_summaries_for_user(user_id, limit=limit, offset=offset)
+
+    @staticmethod
+    def add_member_to_group(group_id: str, user_id: str, db: Optional[Session] = None) -> bool:
         """Add member to group (legacy name)."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
             group_repo = GroupRepository(db)
             return group_repo.add_member(group_id, user_id)
 
     @staticmethod
-    def add_group_member(group_id: str, user_id: str) -> bool:
+    def add_group_member(group_id: str, user_id: str, db: Optional[Session] = None) -> bool:
         """Add member to group (method name used by routers)."""
-        return DatabaseService.add_member_to_group(group_id, user_id)
+        return DatabaseService.add_member_to_group(group_id, user_id, db=db)
 
     @staticmethod
-    def delete_group(group_id: str) -> bool:
+    def delete_group(group_id: str, db: Optional[Session] = None) -> bool:
         """Delete group by ID."""
-        with DatabaseService.get_session() as db:
+        with DatabaseService.get_session(db) as db:
             group_repo = GroupRepository(db)
             return group_repo.delete(group_id)
 
     @staticmethod
-    def is_group_settled(group_id: str) -> bool:
+    def is_group_settled(group_id: str, db: Optional[Session] = None) -> bool:
         """Check if a group is settled (all balances below threshold)."""
-        group = DatabaseService.get_group(group_id)
+        group = DatabaseService.get_group(group_id, db=db)
         if not group:
             return True  # Non-existent groups are considered "settled"
-        
-        from src.constants import MIN_BALANCE_THRESHOLD
-        
-        # Calculate group-specific balances (same logic as GroupResponse)
-        group_balances = {user_id: {} for user_id in group.members.keys()}
-        
-        for expense in group.expenses:
-            portions = {}
-            
-            if expense.split_type == "EQUAL":
-                split_amount = round(expense.amount / len(expense.split_among), 2)
-                portions = {uid: split_amount for uid in expense.split_among if uid in group.members}
-            elif expense.split_type == "EXACT":
-                portions = {uid: amt for uid, amt in expense.split_values.items() if uid in group.members}
-            elif expense.split_type == "PERCENTAGE":
-                for uid, pct in expense.split_values.items():
-                    if uid in group.members:
-                        portions[uid] = round((expense.amount * pct) / 100.0, 2)
-            
-            # Apply portions to balances
-            for uid, owed_amount in portions.items():
-                if uid == expense.paid_by:
-                    continue  # Payer doesn't owe themselves
-                
-                # uid owes expense.paid_by the owed_amount
-                if expense.paid_by not in group_balances[uid]:
-                    group_balances[uid][expense.paid_by] = 0
-                group_balances[uid][expense.paid_by] += owed_amount
-                
-                # expense.paid_by is owed by uid
-                if uid not in group_balances[expense.paid_by]:
-                    group_balances[expense.paid_by][uid] = 0
-                group_balances[expense.paid_by][uid] -= owed_amount
-        
-        # Check if all net balances are below threshold
-        for user_id in group.members.keys():
-            net_balance = sum(group_balances[user_id].values())
-            if abs(net_balance) >= MIN_BALANCE_THRESHOLD:
-                return False
-                
-        return True
+
+        # Outstanding balances, as reported by the group: paid installments are settled
+        DatabaseService.load_group_balances(group, db=db)
+        return all(
+            abs(sum(member.balance.values())) < MIN_BALANCE_THRESHOLD
+            for member in group.members.values()
+        )
+
+    @staticmethod
+    def load_group_balances(group: Group, db: Optional[Session] = None) -> None:
+        """Populate each member's balance from the group's persisted balance ledger.
+
+        Groups created before the ledger existed are materialized from their expense history
+        on first access; afterwards expense writes keep the ledger current incrementally.
+        """
+        with DatabaseService.get_session(db) as db:
+            ledger_repo = BalanceLedgerRepository(db)
+            if not ledger_repo.is_materialized(group.id):
+                ledger_repo.rebuild(group)
+            balances = ledger_repo.get_member_balances(group.id)
+
+        for user_id, member in group.members.items():
+            member.balance = balances.get(user_id, {})
+
+    @staticmethod
+    def get_counterparty_balances(user_id: str, db: Optional[Session] = None) -> Dict[str, int]:
+        """Get other_user_id -> cents the user owes them, across all the user's groups."""
+        with DatabaseService.get_session(db) as db:
+            DatabaseService._materialize_user_ledgers(user_id, db)
+            return BalanceLedgerRepository(db).get_counterparty_balances(user_id)
+
+    @staticmethod
+    def get_consolidated_nets(user_id: str, db: Optional[Session] = None) -> Dict[str, int]:
+        """Get member_id -> net cents owed, summed over all the user's groups."""
+        with DatabaseService.get_session(db) as db:
+            DatabaseService._materialize_user_ledgers(user_id, db)
+            return BalanceLedgerRepository(db).get_consolidated_nets(user_id)
+
+    @staticmethod
+    def _materialize_user_ledgers(user_id: str, db: Session) -> None:
+        """Build the ledger of any of the user's groups that predates it."""
+        ledger_repo = BalanceLedgerRepository(db)
+        group_repo = GroupRepository(db)
+        for group_id in ledger_repo.get_unmaterialized_group_ids(user_id):
+            ledger_repo.rebuild(group_repo.get_by_id(group_id))
+
+    @staticmethod
+    def get_user_names(user_ids: List[str], db: Optional[Session] = None) -> Dict[str, str]:
+        """Get user_id -> name for the given users."""
+        with DatabaseService.get_session(db) as db:
+            return UserRepository(db).get_names(user_ids)
 
     @staticmethod
-    def update_user_balances(users: Dict[str, User]):
-        """Update user balances in database."""
-        with DatabaseService.get_session() as db:
+    def update_user_balances(users: Dict[str, User], db: Optional[Session] = None) -> int:
+        """Flush changed user balances to the database in a single batched UPDATE."""
+        with DatabaseService.get_session(db) as db:
             user_repo = UserRepository(db)
-            for user in users.values():
-                user_repo.update_balance(user.id, user.balance)
+            updated = user_repo.update_balances(
+                {user.id: user.balance for user in users.values()}
+            )
+            if updated:
+                DatabaseService._invalidate_cached_users(db, users.keys())
+        return updated
+
+    @staticmethod
+    def update_user_balances_on_read(
+        users: Dict[str, User], db: Optional[Session] = None
+    ) -> None:
+        """Persist balances from a read path, only in the legacy "on_read" mode."""
+        if get_settings().BALANCE_MATERIALIZATION == BALANCE_MATERIALIZATION_ON_READ:
+            DatabaseService.update_user_balances(users, db=db)
 
     @staticmethod
-    def add_expense_to_group(group_id: str, expense) -> None:
-        """Add expense to group."""
-        with DatabaseService.get_session() as db:
+    def add_expense_to_group(group_id: str, expense, db: Optional[Session] = None) -> None:
+        """Add expense to group and record its shares in the balance ledger."""
+        with DatabaseService.get_session(db) as db:
             expense_repo = ExpenseRepository(db)
             expense_repo.create(expense, group_id)
+            BalanceLedgerRepository(db).apply_expense(group_id, expense)
+
+    @staticmethod
+    def add_expenses_to_group(
+        group_id: str, expenses: List[Expense], db: Optional[Session] = None
+    ) -> int:
+        """Insert many expenses and record their shares in the balance ledger in one pass."""
+        with DatabaseService.get_session(db) as db:
+            created = ExpenseRepository(db).bulk_create(expenses, group_id)
+            BalanceLedgerRepository(db).apply_expenses(group_id, expenses)
+            return created
 
     @staticmethod
-    def pay_installment(expense_id: str, installment_number: int) -> bool:
-        """Mark installment as paid."""
-        with DatabaseService.get_session() as db:
+    def pay_installment(
+        expense_id: str, installment_number: int, db: Optional[Session] = None
+    ) -> bool:
+        """Mark installment as paid and release its share from the balance ledger."""
+        with DatabaseService.get_session(db) as db:
             expense_repo = ExpenseRepository(db)
-            return expense_repo.pay_installment(expense_id, installment_number)
+            expense = expense_repo.get_by_id(expense_id)
+            if not expense or not expense_repo.pay_installment(expense_id, installment_number):
+                return False
+
+            owed_before = PortionService.owed_shares(expense)
+            for installment in expense.installments:
+                if installment.number == installment_number:
+                    installment.paid = True
+            owed_after = PortionService.owed_shares(expense)
+
+            deltas = {
+                user_id: owed_after.get(user_id, 0) - owed_before.get(user_id, 0)
+                for user_id in owed_before.keys() | owed_after.keys()
+            }
+            group_id = expense_repo.get_group_id(expense_id)
+            BalanceLedgerRepository(db).apply_shares(group_id, expense.paid_by, deltas)
+            return True
 
     @staticmethod
-    def update_expense(expense) -> None:
-        """Update an existing expense."""
-        with DatabaseService.get_session() as db:
+    def update_expense(expense, db: Optional[Session] = None) -> None:
+        """Update an existing expense and swap its shares in the balance ledger."""
+        with DatabaseService.get_session(db) as db:
             expense_repo = ExpenseRepository(db)
+            previous = expense_repo.get_by_id(expense.id)
             expense_repo.update(expense)
+            if previous:
+                ledger_repo = BalanceLedgerRepository(db)
+                group_id = expense_repo.get_group_id(expense.id)
+                ledger_repo.apply_expense(group_id, previous, sign=-1)
+                ledger_repo.apply_expense(group_id, expense)
 
     @staticmethod
-    def delete_expense(expense_id: str) -> bool:
-        """Delete an expense."""
-        with DatabaseService.get_session() as db:
+    def delete_expense(expense_id: str, db: Optional[Session] = None) -> bool:
+        """Delete an expense and reverse its shares in the balance ledger."""
+        with DatabaseService.get_session(db) as db:
             expense_repo = ExpenseRepository(db)
-            return expense_repo.delete(expense_id)
+            expense = expense_repo.get_by_id(expense_id)
+            group_id = expense_repo.get_group_id(expense_id)
+            if not expense or not expense_repo.delete(expense_id):
+                return False
+
+            BalanceLedgerRepository(db).apply_expense(group_id, expense, sign=-1)
+            return True
@@ -0,0 +1,266 @@
+"""Pooled, rate-limited SMTP delivery for notification batches.
+
+Authenticated SMTP connections are kept in a small pool and reused across messages, so a
+batch pays for the connect, STARTTLS and login round trips once per connection instead of
+once per email. Messages are sent by a bounded pool of worker threads (one per connection),
+throttled by a token bucket and retried with exponential backoff on transient failures.
+"""
+
+import logging
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Iterator, List, Optional
+
+from ..settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether another attempt on a fresh connection may succeed."""
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    # SMTPException derives from OSError; only socket-level errors are transient
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+@dataclass
+class OutgoingEmail:
+    """A plain-text email waiting to be delivered."""
+
+    to: str
+    subject: str
+    body: str
+
+
+@dataclass
+class DeliveryResult:
+    """Outcome of delivering one email."""
+
+    email: OutgoingEmail
+    sent: bool
+    attempts: int
+    error: Optional[str] = None
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing ``rate`` acquisitions per second on average.
+
+    Bursts of up to ``rate`` acquisitions (at least one) go through at once. A rate of 0
+    disables the limit.
+    """
+
+    def __init__(self, rate: float, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+class SMTPConnectionPool:
+    """Up to ``size`` authenticated SMTP connections shared between threads.
+
+    A connection is closed after ``max_messages`` messages (providers cap messages per
+    session) or as soon as using it raises, since its state is then unknown.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        size: int = 4,
+        starttls: bool = True,
+        timeout: float = 30,
+        max_messages: int = 100,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = max(size, 1)
+        self.starttls = starttls
+        self.timeout = timeout
+        self.max_messages = max_messages
+        self.connections_opened = 0
+        self._idle: "queue.LifoQueue[tuple[smtplib.SMTP, int]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password or "")
+        except Exception:
+            server.close()
+            raise
+        with self._lock:
+            self.connections_opened += 1
+        return server
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        """Borrow a connection, opening one if none is idle."""
+        with self._slots:
+            try:
+                server, used = self._idle.get_nowait()
+            except queue.Empty:
+                server, used = self._connect(), 0
+            try:
+                yield server
+            except BaseException:
+                self._discard(server)
+                raise
+            used += 1
+            if used >= self.max_messages:
+                self._quit(server)
+            else:
+                self._idle.put((server, used))
+
+    def close(self) -> None:
+        """Log out of every idle connection. The pool can still be used afterwards."""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._quit(server)
+
+    @staticmethod
+    def _quit(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    @staticmethod
+    def _discard(server: smtplib.SMTP) -> None:
+        try:
+            server.close()
+        except OSError:
+            pass
+
+
+class EmailDelivery:
+    """Send emails concurrently through an ``SMTPConnectionPool``."""
+
+    def __init__(
+        self,
+        pool: SMTPConnectionPool,
+        sender: str,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        sleep=time.sleep,
+    ):
+        self.pool = pool
+        self.sender = sender
+        self.rate_limiter = rate_limiter or RateLimiter(0)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._sleep = sleep
+
+    @classmethod
+    def from_settings(
+        cls,
+        host: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        sender: Optional[str] = None,
+    ) -> "EmailDelivery":
+        """Delivery tuned by the SMTP_* settings."""
+        settings = get_settings()
+        pool = SMTPConnectionPool(
+            host,
+            port,
+            username,
+            password,
+            size=settings.SMTP_POOL_SIZE,
+            starttls=settings.SMTP_STARTTLS,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+            max_messages=settings.SMTP_MESSAGES_PER_CONNECTION,
+        )
+        return cls(
+            pool,
+            sender or username or "",
+            rate_limiter=RateLimiter(settings.SMTP_RATE_PER_SECOND),
+            max_retries=settings.SMTP_MAX_RETRIES,
+            backoff_seconds=settings.SMTP_RETRY_BACKOFF_SECONDS,
+        )
+
+    def send(self, email: OutgoingEmail) -> DeliveryResult:
+        """Deliver one email, retrying transient failures with exponential backoff.
+
+        Connection drops, timeouts and 4xx replies are transient; other SMTP errors (bad
+        credentials, rejected recipients, 5xx replies) fail at once.
+        """
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = email.to
+        message["Subject"] = email.subject
+        message.set_content(email.body)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            self.rate_limiter.acquire()
+            try:
+                with self.pool.connection() as server:
+                    server.send_message(message)
+                return DeliveryResult(email, sent=True, attempts=attempt)
+            except Exception as e:
+                if not _is_transient(e) or attempt > self.max_retries:
+                    logger.error("Failed to send email to %s: %s", email.to, e)
+                    return DeliveryResult(email, sent=False, attempts=attempt, error=str(e))
+                delay = self.backoff_seconds * 2 ** (attempt - 1)
+                logger.warning(
+                    "Retrying email to %s in %.1fs after attempt %d: %s",
+                    email.to,
+                    delay,
+                    attempt,
+                    e,
+                )
+                self._sleep(delay)
+
+    def send_many(self, emails: List[OutgoingEmail]) -> List[DeliveryResult]:
+        """Deliver a batch with one worker per pooled connection; results keep input order."""
+        if not emails:
+            return []
+        workers = min(self.pool.size, len(emails))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="smtp") as executor:
+            return list(executor.map(self.send, emails))
+
+    def close(self) -> None:
+        """Release the pooled connections."""
+        self.pool.close()
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Set
+
+from src.constants import EVENT_BROKER_MEMORY, EVENT_RESYNC
+from src.settings import get_settings
+
+
+@dataclass
+class GroupEvent:
+    """A compact change notification for one group, as pushed to its subscribers."""
+
+    type: str
+    group_id: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+class Subscription:
+    """A subscriber's bounded queue of events for one group.
+
+    Brokers feed it from any thread through ``deliver``. A subscriber that falls
+    ``max_queue`` events behind loses its backlog and receives a single final ``resync``
+    event instead, telling it to refetch the group and subscribe again.
+    """
+
+    def __init__(
+        self,
+        group_id: str,
+        max_queue: int,
+        on_close: Optional[Callable[["Subscription"], None]] = None,
+    ):
+        self.group_id = group_id
+        self._queue: "asyncio.Queue[GroupEvent]" = asyncio.Queue(maxsize=max(max_queue, 1))
+        self._loop = asyncio.get_running_loop()
+        self._on_close = on_close
+        self.closed = False
+        self.overflowed = False
+
+    def deliver(self, event: GroupEvent) -> None:
+        """Queue an event; safe to call from any thread."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(event)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: GroupEvent) -> None:
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(GroupEvent(type=EVENT_RESYNC, group_id=self.group_id))
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[GroupEvent]:
+        """Wait for the next event, or return None after ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        """Stop receiving events."""
+        if not self.closed:
+            self.closed = True
+            if self._on_close:
+                self._on_close(self)
+
+
+class EventBroker(ABC):
+    """Pub/sub of group events.
+
+    Implementations fan every published event out to the current subscribers of its group,
+    possibly across processes; ``subscribe`` must be called from a running event loop.
+    """
+
+    @abstractmethod
+    def publish(self, event: GroupEvent) -> None:
+        """Send an event to every subscriber of ``event.group_id``."""
+
+    @abstractmethod
+    def subscribe(self, group_id: str) -> Subscription:
+        """Start receiving the events of a group; close the subscription when done."""
+
+
+class InMemoryBroker(EventBroker):
+    """Single-process broker: events only reach subscribers connected to this process."""
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, event: GroupEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.group_id, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def subscribe(self, group_id: str) -> Subscription:
+        subscription = Subscription(group_id, self.max_queue, on_close=self._unsubscribe)
+        with self._lock:
+            self._subscribers.setdefault(group_id, set()).add(subscription)
+        return subscription
+
+    def subscriber_count(self, group_id: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(group_id, ()))
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.group_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.group_id]
+
+
+EVENT_BROKERS: Dict[str, Callable[[], EventBroker]] = {
+    EVENT_BROKER_MEMORY: lambda: InMemoryBroker(get_settings().EVENT_QUEUE_SIZE),
+}
+
+_broker: Optional[EventBroker] = None
+
+
+def get_event_broker() -> EventBroker:
+    """The process-wide broker, created from the ``EVENT_BROKER`` setting on first use."""
+    global _broker
+    if _broker is None:
+        name = get_settings().EVENT_BROKER
+        if name not in EVENT_BROKERS:
+            raise ValueError(f"Unknown event broker: {name}")
+        _broker = EVENT_BROKERS[name]()
+    return _broker
+
+
+def set_event_broker(broker: Optional[EventBroker]) -> None:
+    """Install a broker, e.g. one backed by an external pub/sub; None restores the default."""
+    global _broker
+    _broker = broker
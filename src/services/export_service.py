@@ -0,0 +1,243 @@
+"""Streaming export of a group's expense history as CSV, JSON Lines or XLSX.
+
+Every format is produced incrementally from an iterator of expenses and yields ``bytes``
+chunks, so an export never holds more than a small buffer of rows in memory. The CSV
+columns match what ``POST /api/groups/{id}/expenses:bulk`` accepts, so an export can be
+imported into another group.
+"""
+
+import csv
+import io
+import json
+import re
+import zipfile
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from xml.sax.saxutils import escape
+
+from ..constants import EXPORT_CSV, EXPORT_JSONL, EXPORT_XLSX, SPLIT_EXACT
+from ..models.expense import Expense
+from ..money import from_cents
+
+# Rows encoded between two chunks handed to the response
+FLUSH_EVERY_ROWS = 200
+
+EXPORT_COLUMNS = (
+    "id",
+    "created_at",
+    "created_by",
+    "description",
+    "category",
+    "amount",
+    "paid_by",
+    "split_type",
+    "split_among",
+    "split_values",
+    "installments_count",
+    "first_due_date",
+    "installments",
+)
+_AMOUNT_COLUMN = EXPORT_COLUMNS.index("amount")
+
+MEDIA_TYPES = {
+    EXPORT_CSV: "text/csv; charset=utf-8",
+    EXPORT_JSONL: "application/x-ndjson",
+    EXPORT_XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _iso_date(value: Optional[Union[date, datetime]]) -> Optional[str]:
+    if value is None:
+        return None
+    return (value.date() if isinstance(value, datetime) else value).isoformat()
+
+
+class ExportService:
+    """Serialize expense streams for download."""
+
+    @classmethod
+    def stream(cls, expenses: Iterable[Expense], export_format: str) -> Iterator[bytes]:
+        """Encode ``expenses`` in ``export_format`` ("csv", "jsonl" or "xlsx")."""
+        if export_format == EXPORT_CSV:
+            return cls._iter_csv(expenses)
+        if export_format == EXPORT_JSONL:
+            return cls._iter_jsonl(expenses)
+        if export_format == EXPORT_XLSX:
+            return cls._iter_xlsx(expenses)
+        raise ValueError(f"Unknown export format: {export_format}")
+
+    @classmethod
+    def record(cls, expense: Expense) -> Dict[str, Any]:
+        """An expense with its splits and installments, amounts in currency units."""
+        split_values = expense.split_values
+        if expense.split_type == SPLIT_EXACT:
+            split_values = {user_id: from_cents(cents) for user_id, cents in split_values.items()}
+        return {
+            "id": expense.id,
+            "created_at": expense.created_at.isoformat() if expense.created_at else None,
+            "created_by": expense.created_by,
+            "description": expense.description,
+            "category": expense.category,
+            "amount": from_cents(expense.amount),
+            "paid_by": expense.paid_by,
+            "split_type": expense.split_type,
+            "split_among": list(expense.split_among),
+            "split_values": split_values,
+            "installments_count": expense.installments_count,
+            "first_due_date": _iso_date(expense.first_due_date),
+            "installments": [
+                {
+                    "number": installment.number,
+                    "amount": from_cents(installment.amount),
+                    "due_date": _iso_date(installment.due_date),
+                    "paid": installment.paid,
+                }
+                for installment in expense.installments
+            ],
+        }
+
+    @classmethod
+    def flat_row(cls, expense: Expense) -> List[Any]:
+        """A record flattened to ``EXPORT_COLUMNS`` for CSV and spreadsheets.
+
+        ``split_among`` is ``;``-separated, ``split_values`` holds ``id=value`` pairs and each
+        installment reads ``number:amount:due_date:paid|unpaid``.
+        """
+        record = cls.record(expense)
+        record["split_among"] = ";".join(record["split_among"])
+        record["split_values"] = ";".join(
+            f"{user_id}={value}" for user_id, value in record["split_values"].items()
+        )
+        record["installments"] = ";".join(
+            f"{item['number']}:{item['amount']:.2f}:{item['due_date']}:"
+            f"{'paid' if item['paid'] else 'unpaid'}"
+            for item in record["installments"]
+        )
+        record["amount"] = f"{record['amount']:.2f}"
+        return [record[column] for column in EXPORT_COLUMNS]
+
+    @classmethod
+    def _iter_csv(cls, expenses: Iterable[Expense]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for count, expense in enumerate(expenses, start=1):
+            writer.writerow(cls.flat_row(expense))
+            if count % FLUSH_EVERY_ROWS == 0:
+                yield cls._drain(buffer)
+        yield cls._drain(buffer)
+
+    @classmethod
+    def _iter_jsonl(cls, expenses: Iterable[Expense]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        for count, expense in enumerate(expenses, start=1):
+            buffer.write(json.dumps(cls.record(expense), ensure_ascii=False))
+            buffer.write("\n")
+            if count % FLUSH_EVERY_ROWS == 0:
+                yield cls._drain(buffer)
+        yield cls._drain(buffer)
+
+    @classmethod
+    def _iter_xlsx(cls, expenses: Iterable[Expense]) -> Iterator[bytes]:
+        """A single-sheet workbook, zipped on the fly into an unseekable sink."""
+        sink = _ChunkSink()
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as workbook:
+            for name, content in _XLSX_PARTS.items():
+                workbook.writestr(name, content)
+            with workbook.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+                sheet.write(_SHEET_HEAD.encode())
+                sheet.write(_xlsx_row(EXPORT_COLUMNS).encode())
+                for count, expense in enumerate(expenses, start=1):
+                    row = cls.flat_row(expense)
+                    # Amounts stay numeric in the spreadsheet
+                    row[_AMOUNT_COLUMN] = float(row[_AMOUNT_COLUMN])
+                    sheet.write(_xlsx_row(row).encode())
+                    if count % FLUSH_EVERY_ROWS == 0:
+                        yield sink.drain()
+                sheet.write(_SHEET_TAIL.encode())
+            yield sink.drain()
+        yield sink.drain()
+
+    @staticmethod
+    def _drain(buffer: io.StringIO) -> bytes:
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable file that hands its contents back in chunks.
+
+    ``zipfile`` writes data descriptors instead of seeking back into an unseekable file, so
+    the archive can be streamed out while it is being built.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_DOC_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        _XML_DECL
+        + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        _XML_DECL + f'<Relationships xmlns="{_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_DOC_REL}/officeDocument" Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        _XML_DECL + f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_DOC_REL}">'
+        '<sheets><sheet name="Expenses" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        _XML_DECL + f'<Relationships xmlns="{_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_DOC_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+_SHEET_HEAD = _XML_DECL + f'<worksheet xmlns="{_MAIN_NS}"><sheetData>'
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+# Characters XML 1.0 does not allow, even escaped
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _xlsx_row(values: Iterable[Any]) -> str:
+    cells = []
+    for value in values:
+        if value is None or value == "":
+            cells.append("<c/>")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f"<c><v>{value}</v></c>")
+        else:
+            text = escape(_INVALID_XML_CHARS.sub("", str(value)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f"<row>{''.join(cells)}</row>"
@@ -0,0 +1,177 @@
+"""Long-running notification scheduler with a health and metrics endpoint.
+
+One process keeps the database engine and SMTP settings loaded and ticks every few seconds.
+Once a day, at ``NOTIFICATION_DAILY_AT``, it queues every overdue reminder and every upcoming
+one within each user's ``days_ahead_reminder``. The ticks after that only look at expenses
+created since the previous tick (the watermark). Every tick then delivers the outbox.
+"""
+
+import json
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from datetime import time as dt_time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from ..constants import NOTIFICATION_OVERDUE, NOTIFICATION_UPCOMING
+from ..settings import get_settings
+from .database_service import DatabaseService
+from .notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationScheduler:
+    """Queues reminders on a daily schedule plus incremental ticks, and delivers them.
+
+    The watermark is read from ``clock``, local time like ``Expense.created_at``, and each
+    tick rescans ``watermark_overlap`` before it: an expense stamped before a scan but
+    committed after it is picked up by the next tick, and the outbox drops the reminders
+    queued twice. The watermark lives in memory: after a restart the first tick past
+    ``daily_at`` does a full scan again.
+    """
+
+    def __init__(
+        self,
+        service: NotificationService,
+        interval_seconds: Optional[float] = None,
+        daily_at: Optional[dt_time] = None,
+        upcoming_days: Optional[int] = None,
+        watermark_overlap: timedelta = timedelta(minutes=5),
+        clock=datetime.now,
+    ):
+        settings = get_settings()
+        self.service = service
+        self.interval_seconds = interval_seconds or settings.NOTIFICATION_DAEMON_INTERVAL_SECONDS
+        self.daily_at = daily_at or dt_time.fromisoformat(settings.NOTIFICATION_DAILY_AT)
+        self.upcoming_days = upcoming_days or settings.NOTIFICATION_UPCOMING_MAX_DAYS
+        self.watermark_overlap = watermark_overlap
+        self._clock = clock
+        self.started_at = clock()
+        # Expenses created up to this (local) time have been scanned
+        self.watermark: Optional[datetime] = None
+        self.last_daily_run: Optional[date] = None
+        self.last_tick_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.ticks = 0
+        self.daily_runs = 0
+        self.errors = 0
+        self.emails_sent = 0
+        self.enqueued = {NOTIFICATION_OVERDUE: 0, NOTIFICATION_UPCOMING: 0}
+
+    def tick(self) -> int:
+        """Queue the reminders due since the last tick and deliver the outbox.
+
+        Before the day's full scan has run nothing is queued, so reminders for expenses added
+        overnight go out with the rest at ``daily_at``.
+
+        Returns:
+            Number of emails sent
+        """
+        now = self._clock()
+        scanned_from = now - self.watermark_overlap
+        if self.last_daily_run != now.date() and now.time() >= self.daily_at:
+            self._enqueue(None)
+            self.last_daily_run = now.date()
+            self.daily_runs += 1
+            self.watermark = scanned_from
+        elif self.last_daily_run == now.date():
+            self._enqueue(self.watermark)
+            self.watermark = scanned_from
+
+        sent = self.service.dispatch_notifications()
+        self.emails_sent += sent
+        self.ticks += 1
+        self.last_tick_at = now
+        return sent
+
+    def _enqueue(self, created_after: Optional[datetime]) -> None:
+        self.enqueued[NOTIFICATION_OVERDUE] += self.service.enqueue_overdue_notifications(
+            created_after=created_after
+        )
+        # Each user's days_ahead_reminder narrows the widest window down
+        self.enqueued[NOTIFICATION_UPCOMING] += self.service.enqueue_upcoming_notifications(
+            days_ahead=self.upcoming_days, created_after=created_after
+        )
+
+    def run(self, stop: threading.Event) -> None:
+        """Tick every ``interval_seconds`` until ``stop`` is set; failed ticks are retried."""
+        logger.info(
+            "Notification scheduler started: every %ss, daily scan at %s",
+            self.interval_seconds,
+            self.daily_at.strftime("%H:%M"),
+        )
+        while not stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e)
+                logger.exception("Notification scheduler tick failed")
+            stop.wait(self.interval_seconds)
+        logger.info("Notification scheduler stopped")
+
+    def healthy(self) -> bool:
+        """Whether a tick has succeeded within the last three intervals."""
+        last = self.last_tick_at or self.started_at
+        return (self._clock() - last).total_seconds() <= 3 * self.interval_seconds
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters since start-up, and the outbox rows in each status."""
+        return {
+            "healthy": self.healthy(),
+            "started_at": self.started_at.isoformat(),
+            "last_tick_at": self.last_tick_at.isoformat() if self.last_tick_at else None,
+            "last_daily_run": self.last_daily_run.isoformat() if self.last_daily_run else None,
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+            "ticks": self.ticks,
+            "daily_runs": self.daily_runs,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "enqueued": dict(self.enqueued),
+            "emails_sent": self.emails_sent,
+            "outbox": DatabaseService.get_notification_outbox_counts(),
+        }
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    server: "MetricsServer"
+
+    def do_GET(self) -> None:
+        scheduler = self.server.scheduler
+        if self.path == "/health":
+            healthy = scheduler.healthy()
+            self._reply(200 if healthy else 503, {"status": "ok" if healthy else "stale"})
+        elif self.path == "/metrics":
+            self._reply(200, scheduler.metrics())
+        else:
+            self._reply(404, {"detail": "Not Found"})
+
+    def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format, *args)
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """Serves ``/health`` (200, or 503 when ticks stall) and ``/metrics`` (JSON)."""
+
+    daemon_threads = True
+
+    def __init__(self, scheduler: NotificationScheduler, host: str = "0.0.0.0", port: int = 0):
+        super().__init__((host, port), _MetricsHandler)
+        self.scheduler = scheduler
+
+    def start(self) -> threading.Thread:
+        """Serve from a background thread; ``shutdown()`` stops it."""
+        thread = threading.Thread(target=self.serve_forever, name="notification-metrics")
+        thread.daemon = True
+        thread.start()
+        return thread
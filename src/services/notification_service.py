@@ -1,15 +1,26 @@
 import logging
-import smtplib
 from dataclasses import dataclass
-from datetime import date, datetime, timedelta
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import Dict, List, Optional
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from ..constants import NOTIFICATION_OVERDUE, NOTIFICATION_UPCOMING
 from ..models.expense import Expense
 from ..models.group import Group
 from ..models.installment import Installment
+from ..models.notification import OutboxItem
 from ..models.user import User
+from ..money import from_cents
+from ..settings import get_settings
+from .database_service import DatabaseService
+from .email_delivery import EmailDelivery, OutgoingEmail
+
+
+def _days_overdue(installment: Installment, today: date) -> int:
+    """Days past the installment's due date (negative before it is due)."""
+    due_date = installment.due_date
+    if isinstance(due_date, datetime):
+        due_date = due_date.date()
+    return (today - due_date).days
 
 
 @dataclass
@@ -32,76 +43,102 @@ class NotificationService:
         smtp_port: Optional[int] = None,
         smtp_username: Optional[str] = None,
         smtp_password: Optional[str] = None,
+        delivery: Optional[EmailDelivery] = None,
     ):
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port or 587
         self.smtp_username = smtp_username
         self.smtp_password = smtp_password
+        # Built from the SMTP settings on first use unless given
+        self.delivery = delivery
         self.logger = logging.getLogger(__name__)
 
-    def get_overdue_installments(self, groups: Dict[str, Group]) -> List[OverdueInstallment]:
+    def get_overdue_installments(
+        self,
+        groups: Optional[Dict[str, Group]] = None,
+        created_after: Optional[datetime] = None,
+    ) -> List[OverdueInstallment]:
         """Get all overdue installments across all groups.
 
         Args:
-            groups: Dictionary of group_id -> Group objects
+            groups: Dictionary of group_id -> Group objects to scan in memory. When omitted
+                the database is queried for unpaid installments due before today only.
+            created_after: Only include expenses created after this (local) time
 
         Returns:
             List of OverdueInstallment objects
         """
-        overdue = []
         today = date.today()
-
-        for group in groups.values():
-            for expense in group.expenses:
-                if expense.installments_count <= 1 or not expense.installments:
-                    continue
-
-                for installment in expense.installments:
-                    # Convert due_date to date for comparison if it's a datetime
-                    due_date = installment.due_date
-                    if isinstance(due_date, datetime):
-                        due_date = due_date.date()
-
-                    if not installment.paid and due_date < today:
-                        days_overdue = (today - due_date).days
-
-                        # For each user who owes money for this installment
-                        for user_id in expense.split_among:
-                            if user_id != expense.paid_by:  # Don't notify the payer
-                                user = group.members.get(user_id)
-                                if user:
-                                    overdue.append(
-                                        OverdueInstallment(
-                                            user=user,
-                                            expense=expense,
-                                            installment=installment,
-                                            group=group,
-                                            days_overdue=days_overdue,
-                                        )
-                                    )
-
-        return overdue
+        return self._find_unpaid(groups, None, today, today, created_after)
 
     def get_upcoming_installments(
-        self, groups: Dict[str, Group], days_ahead: int = 3
+        self,
+        groups: Optional[Dict[str, Group]] = None,
+        days_ahead: int = 3,
+        created_after: Optional[datetime] = None,
     ) -> List[OverdueInstallment]:
         """Get installments due in the next few days.
 
         Args:
-            groups: Dictionary of group_id -> Group objects
+            groups: Dictionary of group_id -> Group objects to scan in memory. When omitted
+                the database is queried for unpaid installments due in the window only.
             days_ahead: Number of days ahead to check for due installments
+            created_after: Only include expenses created after this (local) time
 
         Returns:
             List of OverdueInstallment objects (days_overdue will be negative for upcoming)
         """
-        upcoming = []
         today = date.today()
-        future_date = today + timedelta(days=days_ahead)
+        return self._find_unpaid(
+            groups, today, today + timedelta(days=days_ahead + 1), today, created_after
+        )
 
+    def _find_unpaid(
+        self,
+        groups: Optional[Dict[str, Group]],
+        due_from: Optional[date],
+        due_before: date,
+        today: date,
+        created_after: Optional[datetime] = None,
+    ) -> List[OverdueInstallment]:
+        """Unpaid installments due in ``[due_from, due_before)``, one item per owing member.
+
+        ``days_overdue`` counts days past the due date (negative when not yet due).
+        """
+        if groups is None:
+            rows = DatabaseService.get_unpaid_installments_due(
+                datetime.combine(due_before, time.min),
+                datetime.combine(due_from, time.min) if due_from else None,
+                created_after,
+            )
+        else:
+            rows = self._iter_unpaid(groups, due_from, due_before, created_after)
+
+        return [
+            OverdueInstallment(
+                user=user,
+                expense=expense,
+                installment=installment,
+                group=group,
+                days_overdue=_days_overdue(installment, today),
+            )
+            for user, expense, installment, group in rows
+        ]
+
+    @staticmethod
+    def _iter_unpaid(
+        groups: Dict[str, Group],
+        due_from: Optional[date],
+        due_before: date,
+        created_after: Optional[datetime] = None,
+    ) -> Iterator[Tuple[User, Expense, Installment, Group]]:
+        """The in-memory counterpart of ``DatabaseService.get_unpaid_installments_due``."""
         for group in groups.values():
             for expense in group.expenses:
                 if expense.installments_count <= 1 or not expense.installments:
                     continue
+                if created_after is not None and expense.created_at <= created_after:
+                    continue
 
                 for installment in expense.installments:
                     # Convert due_date to date for comparison if it's a datetime
@@ -109,25 +146,17 @@ class NotificationService:
                     if isinstance(due_date, datetime):
                         due_date = due_date.date()
 
-                    if not installment.paid and today <= due_date <= future_date:
-                        days_until_due = (due_date - today).days
-
-                        # For each user who owes money for this installment
-                        for user_id in expense.split_among:
-                            if user_id != expense.paid_by:  # Don't notify the payer
-                                user = group.members.get(user_id)
-                                if user:
-                                    upcoming.append(
-                                        OverdueInstallment(
-                                            user=user,
-                                            expense=expense,
-                                            installment=installment,
-                                            group=group,
-                                            days_overdue=-days_until_due,  # Negative for upcoming
-                                        )
-                                    )
-
-        return upcoming
+                    if installment.paid or due_date >= due_before:
+                        continue
+                    if due_from is not None and due_date < due_from:
+                        continue
+
+                    # For each user who owes money for this installment
+                    for user_id in expense.split_among:
+                        if user_id != expense.paid_by:  # Don't notify the payer
+                            user = group.members.get(user_id)
+                            if user:
+                                yield user, expense, installment, group
 
     def send_email_notification(self, to_email: str, subject: str, body: str) -> bool:
         """Send an email notification.
@@ -140,29 +169,39 @@ class NotificationService:
         Returns:
             True if email was sent successfully, False otherwise
         """
-        if not all([self.smtp_server, self.smtp_username, self.smtp_password]):
-            self.logger.warning("SMTP configuration incomplete, skipping email notification")
-            return False
-
-        try:
-            msg = MIMEMultipart()
-            msg["From"] = self.smtp_username
-            msg["To"] = to_email
-            msg["Subject"] = subject
+        return self.send_email_batch([OutgoingEmail(to_email, subject, body)])[0]
 
-            msg.attach(MIMEText(body, "plain", "utf-8"))
+    def send_email_batch(self, emails: List[OutgoingEmail]) -> List[bool]:
+        """Send many emails over pooled SMTP connections.
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
+        Args:
+            emails: Emails to deliver
 
-            self.logger.info(f"Email notification sent to {to_email}")
-            return True
+        Returns:
+            Whether each email was sent, in input order
+        """
+        delivery = self._get_delivery()
+        if delivery is None:
+            self.logger.warning("SMTP configuration incomplete, skipping email notification")
+            return [False] * len(emails)
 
-        except Exception as e:
-            self.logger.error(f"Failed to send email to {to_email}: {e}")
-            return False
+        try:
+            results = delivery.send_many(emails)
+        finally:
+            delivery.close()
+        for result in results:
+            if result.sent:
+                self.logger.info(f"Email notification sent to {result.email.to}")
+        return [result.sent for result in results]
+
+    def _get_delivery(self) -> Optional[EmailDelivery]:
+        if self.delivery is None and all(
+            [self.smtp_server, self.smtp_username, self.smtp_password]
+        ):
+            self.delivery = EmailDelivery.from_settings(
+                self.smtp_server, self.smtp_port, self.smtp_username, self.smtp_password
+            )
+        return self.delivery
 
     def generate_overdue_notification_text(self, overdue_items: List[OverdueInstallment]) -> str:
         """Generate notification text for overdue installments.
@@ -185,7 +224,8 @@ class NotificationService:
             if isinstance(due_date, datetime):
                 due_date = due_date.date()
             text += f"• {item.expense.description} - Grupo: {item.group.name}\n"
-            text += f"  Parcela {item.installment.number} de R$ {item.installment.amount:.2f}\n"
+            amount = from_cents(item.installment.amount)
+            text += f"  Parcela {item.installment.number} de R$ {amount:.2f}\n"
             text += f"  Vencimento: {due_date.strftime('%d/%m/%Y')}\n"
             text += f"  {item.days_overdue} dias em atraso\n\n"
 
@@ -216,7 +256,8 @@ class NotificationService:
             if isinstance(due_date, datetime):
                 due_date = due_date.date()
             text += f"• {item.expense.description} - Grupo: {item.group.name}\n"
-            text += f"  Parcela {item.installment.number} de R$ {item.installment.amount:.2f}\n"
+            amount = from_cents(item.installment.amount)
+            text += f"  Parcela {item.installment.number} de R$ {amount:.2f}\n"
             text += f"  Vencimento: {due_date.strftime('%d/%m/%Y')}\n"
             if days_until == 0:
                 text += "  Vence hoje!\n\n"
@@ -228,96 +269,173 @@ class NotificationService:
 
         return text
 
-    def send_overdue_notifications(self, groups: Dict[str, Group]) -> int:
-        """Send notifications for all overdue installments.
+    def send_overdue_notifications(self, groups: Optional[Dict[str, Group]] = None) -> int:
+        """Queue today's overdue reminders and deliver every pending overdue reminder.
 
         Args:
-            groups: Dictionary of group_id -> Group objects
+            groups: Dictionary of group_id -> Group objects (default: query the database)
 
         Returns:
-            Number of notifications sent
+            Number of emails sent
         """
-        overdue_items = self.get_overdue_installments(groups)
+        self.enqueue_overdue_notifications(groups)
+        return self.dispatch_notifications(NOTIFICATION_OVERDUE)
 
-        # Group by user and filter by preferences
-        user_overdue: Dict[str, List[OverdueInstallment]] = {}
-        for item in overdue_items:
-            user = item.user
-            user_id = user.id
+    def send_upcoming_notifications(
+        self, groups: Optional[Dict[str, Group]] = None, days_ahead: int = 3
+    ) -> int:
+        """Queue today's upcoming reminders and deliver every pending upcoming reminder.
 
-            # Check if user wants overdue notifications
-            if user.notification_preferences.get("email_overdue", True):
-                if user_id not in user_overdue:
-                    user_overdue[user_id] = []
-                user_overdue[user_id].append(item)
+        Args:
+            groups: Dictionary of group_id -> Group objects (default: query the database)
+            days_ahead: Number of days ahead to check
 
-        sent_count = 0
-        for _user_id, items in user_overdue.items():
-            user = items[0].user
-            subject = f"DividaFacil - Parcelas em atraso ({len(items)} pendente{'s' if len(items) > 1 else ''})"
-            body = self.generate_overdue_notification_text(items)
+        Returns:
+            Number of emails sent
+        """
+        self.enqueue_upcoming_notifications(groups, days_ahead)
+        return self.dispatch_notifications(NOTIFICATION_UPCOMING)
 
-            if self.send_email_notification(user.email, subject, body):
-                sent_count += 1
-            else:
-                # Log to console as fallback when email is not configured
-                print(f"📬 Console notification for {user.name} ({user.email}):")
-                print(f"Subject: {subject}")
-                print("---")
-                print(body)
-                print("=" * 50)
-                sent_count += 1  # Count console notifications as sent
+    def enqueue_overdue_notifications(
+        self,
+        groups: Optional[Dict[str, Group]] = None,
+        created_after: Optional[datetime] = None,
+    ) -> int:
+        """Queue a reminder for each overdue installment, for users who want them.
 
-        return sent_count
+        Args:
+            groups: Dictionary of group_id -> Group objects (default: query the database)
+            created_after: Only queue reminders for expenses created after this (local) time
 
-    def send_upcoming_notifications(self, groups: Dict[str, Group], days_ahead: int = 3) -> int:
-        """Send notifications for upcoming installments.
+        Returns:
+            Number of reminders added; those already queued today are not added again
+        """
+        items = [
+            item
+            for item in self.get_overdue_installments(groups, created_after)
+            if item.user.notification_preferences.get("email_overdue", True)
+        ]
+        return self._enqueue(NOTIFICATION_OVERDUE, items)
+
+    def enqueue_upcoming_notifications(
+        self,
+        groups: Optional[Dict[str, Group]] = None,
+        days_ahead: int = 3,
+        created_after: Optional[datetime] = None,
+    ) -> int:
+        """Queue a reminder for each installment due within each user's reminder window.
 
         Args:
-            groups: Dictionary of group_id -> Group objects
+            groups: Dictionary of group_id -> Group objects (default: query the database)
             days_ahead: Number of days ahead to check
+            created_after: Only queue reminders for expenses created after this (local) time
 
         Returns:
-            Number of notifications sent
+            Number of reminders added; those already queued today are not added again
         """
-        upcoming_items = self.get_upcoming_installments(groups, days_ahead)
-
-        # Group by user and filter by preferences
-        user_upcoming: Dict[str, List[OverdueInstallment]] = {}
-        for item in upcoming_items:
-            user = item.user
-            user_id = user.id
-
+        items = []
+        for item in self.get_upcoming_installments(groups, days_ahead, created_after):
+            preferences = item.user.notification_preferences
             # Check if user wants upcoming notifications and respects their preferred days ahead
-            user_days_ahead = user.notification_preferences.get("days_ahead_reminder", 3)
             if (
-                user.notification_preferences.get("email_upcoming", True)
-                and -item.days_overdue <= user_days_ahead
+                preferences.get("email_upcoming", True)
+                and -item.days_overdue <= preferences.get("days_ahead_reminder", 3)
             ):  # item.days_overdue is negative for upcoming
-                if user_id not in user_upcoming:
-                    user_upcoming[user_id] = []
-                user_upcoming[user_id].append(item)
-
-        sent_count = 0
-        for _user_id, items in user_upcoming.items():
-            user = items[0].user
-            subject = f"DividaFacil - Parcelas vencendo ({len(items)} próxima{'s' if len(items) > 1 else ''})"
-            body = self.generate_upcoming_notification_text(items)
+                items.append(item)
+        return self._enqueue(NOTIFICATION_UPCOMING, items)
+
+    @staticmethod
+    def _enqueue(kind: str, items: List[OverdueInstallment]) -> int:
+        return DatabaseService.enqueue_notifications(
+            kind,
+            date.today(),
+            [(item.user.id, item.expense.id, item.installment.number) for item in items],
+        )
+
+    def dispatch_notifications(
+        self,
+        kind: Optional[str] = None,
+        chunk_users: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ) -> int:
+        """Deliver the pending outbox reminders, one email per user and kind.
+
+        Users are claimed ``chunk_users`` at a time and each chunk's outcome is committed
+        before the next one is claimed, so an interrupted dispatch is resumed by the next run.
+        Each user is tried once per run; failed reminders stay pending for later runs until
+        they have been tried ``max_attempts`` times. Nothing is claimed while SMTP is not
+        configured.
 
-            if self.send_email_notification(user.email, subject, body):
-                sent_count += 1
-            else:
-                # Log to console as fallback when email is not configured
-                print(f"📬 Console notification for {user.name} ({user.email}):")
-                print(f"Subject: {subject}")
-                print("---")
-                print(body)
-                print("=" * 50)
-                sent_count += 1  # Count console notifications as sent
+        Args:
+            kind: Only deliver "overdue" or "upcoming" reminders (default: both)
+            chunk_users: Users per chunk (default: NOTIFICATION_DISPATCH_CHUNK_USERS)
+            max_attempts: Delivery runs per reminder (default: NOTIFICATION_MAX_ATTEMPTS)
 
+        Returns:
+            Number of emails sent
+        """
+        delivery = self._get_delivery()
+        if delivery is None:
+            self.logger.warning("SMTP configuration incomplete, notifications stay queued")
+            return 0
+
+        settings = get_settings()
+        chunk_users = chunk_users or settings.NOTIFICATION_DISPATCH_CHUNK_USERS
+        max_attempts = max_attempts or settings.NOTIFICATION_MAX_ATTEMPTS
+        sent_count = 0
+        after_user_id = None
+        try:
+            while True:
+                claimed = DatabaseService.claim_notifications(chunk_users, kind, after_user_id)
+                if claimed is None:
+                    break
+                claim_id, after_user_id = claimed
+
+                digests: Dict[Tuple[str, str], List[OutboxItem]] = {}
+                for item in DatabaseService.load_claimed_notifications(claim_id):
+                    digests.setdefault((item.user.id, item.kind), []).append(item)
+                batches = list(digests.values())
+                results = delivery.send_many([self._render_digest(items) for items in batches])
+
+                sent_ids = []
+                for items, result in zip(batches, results, strict=True):
+                    outbox_ids = [item.id for item in items]
+                    if result.sent:
+                        sent_ids.extend(outbox_ids)
+                        sent_count += 1
+                    else:
+                        DatabaseService.mark_notifications_failed(
+                            outbox_ids, result.error or "", max_attempts
+                        )
+                if sent_ids:
+                    DatabaseService.mark_notifications_sent(sent_ids)
+        finally:
+            delivery.close()
         return sent_count
 
-    def print_overdue_report(self, groups: Dict[str, Group]) -> None:
+    def _render_digest(self, items: List[OutboxItem]) -> OutgoingEmail:
+        """The email reminding a user of the installments in ``items`` (all of one kind)."""
+        today = date.today()
+        reminders = [
+            OverdueInstallment(
+                user=item.user,
+                expense=item.expense,
+                installment=item.installment,
+                group=item.group,
+                days_overdue=_days_overdue(item.installment, today),
+            )
+            for item in items
+        ]
+        user = items[0].user
+        if items[0].kind == NOTIFICATION_OVERDUE:
+            subject = f"DividaFacil - Parcelas em atraso ({len(items)} pendente{'s' if len(items) > 1 else ''})"
+            body = self.generate_overdue_notification_text(reminders)
+        else:
+            subject = f"DividaFacil - Parcelas vencendo ({len(items)} próxima{'s' if len(items) > 1 else ''})"
+            body = self.generate_upcoming_notification_text(reminders)
+        return OutgoingEmail(user.email, subject, body)
+
+    def print_overdue_report(self, groups: Optional[Dict[str, Group]] = None) -> None:
         """Print a console report of overdue installments."""
         overdue_items = self.get_overdue_installments(groups)
 
@@ -343,7 +461,8 @@ class NotificationService:
                 if isinstance(due_date, datetime):
                     due_date = due_date.date()
                 print(f"   • {item.expense.description} - {item.group.name}")
-                print(f"     Parcela {item.installment.number}: R$ {item.installment.amount:.2f}")
+                amount = from_cents(item.installment.amount)
+                print(f"     Parcela {item.installment.number}: R$ {amount:.2f}")
                 print(
                     f"     Vencimento: {due_date.strftime('%d/%m/%Y')} ({item.days_overdue} dias atraso)"
                 )
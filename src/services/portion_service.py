@@ -0,0 +1,217 @@
+"""Single calculator for how an expense is split among its members.
+
+Every balance, analysis and settlement path asks ``PortionService`` for an expense's portions
+instead of re-deriving EQUAL/EXACT/PERCENTAGE splits itself. Portions depend only on the
+expense's split definition, so they are memoized per ``(expense id, version)``; the version is
+bumped whenever an expense is edited. Installment progress is applied on top of the cached
+portions, so paying an installment never invalidates them.
+"""
+
+import threading
+from collections import OrderedDict
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from ..constants import (
+    ERROR_INVALID_SPLIT_TYPE,
+    ERROR_NO_SPLIT_VALUES,
+    ERROR_NO_USERS_TO_SPLIT,
+    PERCENTAGE_BASE,
+    SPLIT_EQUAL,
+    SPLIT_EXACT,
+    SPLIT_PERCENTAGE,
+)
+from ..models.expense import Expense
+from ..models.group import Group
+from ..money import Cents, div_half_up
+from ..settings import get_settings
+from . import vectorized_balance_engine
+
+
+def _split_signature(expense: Expense) -> Tuple[Hashable, ...]:
+    """Everything the portions depend on, to catch in-memory edits that skip the version."""
+    return (
+        expense.amount,
+        expense.paid_by,
+        expense.split_type,
+        tuple(sorted(expense.split_among)),
+        tuple(sorted(expense.split_values.items())),
+    )
+
+
+class PortionCache:
+    """Thread-safe LRU cache of computed portions keyed on ``(expense id, version)``.
+
+    A size of 0 disables the cache. Each entry also records the split signature it was
+    computed from, so an expense mutated in memory without a version bump is recomputed
+    rather than served stale portions.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[Tuple, Dict[str, Cents]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: Tuple[str, int], signature: Tuple) -> Optional[Dict[str, Cents]]:
+        """Return the cached portions, or None on a miss or a stale entry."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Tuple[str, int], signature: Tuple, portions: Dict[str, Cents]) -> None:
+        """Cache portions, evicting the least recently used entry if full."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (signature, portions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current counters, suitable for a metrics endpoint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+portion_cache = PortionCache(get_settings().PORTIONS_CACHE_SIZE)
+
+
+class PortionService:
+    """Computes (and memoizes) each member's share of an expense."""
+
+    @staticmethod
+    def portions(expense: Expense) -> Dict[str, Cents]:
+        """Each member's share of the full expense amount, in cents.
+
+        The payer's own share is included. Callers get a fresh dict they may modify.
+
+        Raises:
+            ValueError: If the split type is unknown or the split definition is empty
+        """
+        key = (expense.id, expense.version)
+        signature = _split_signature(expense)
+        portions = portion_cache.get(key, signature)
+        if portions is None:
+            portions = PortionService._compute_portions(expense)
+            portion_cache.set(key, signature, portions)
+        return dict(portions)
+
+    @staticmethod
+    def _compute_portions(expense: Expense) -> Dict[str, Cents]:
+        amount = expense.amount
+
+        if expense.split_type == SPLIT_EQUAL:
+            if not expense.split_among:
+                raise ValueError(ERROR_NO_USERS_TO_SPLIT)
+            per_person = div_half_up(amount, len(expense.split_among))
+            portions = {uid: per_person for uid in expense.split_among}
+            diff = amount - per_person * len(portions)
+            if diff:
+                # split_among order is not preserved by the database, so the rounding
+                # remainder goes to a stable member: the highest non-payer id
+                candidates = sorted(uid for uid in portions if uid != expense.paid_by) or [
+                    expense.paid_by
+                ]
+                portions[candidates[-1]] = portions.get(candidates[-1], 0) + diff
+            return portions
+
+        if expense.split_type == SPLIT_EXACT:
+            if not expense.split_values:
+                raise ValueError(ERROR_NO_SPLIT_VALUES)
+            return {uid: int(value) for uid, value in expense.split_values.items()}
+
+        if expense.split_type == SPLIT_PERCENTAGE:
+            if not expense.split_values:
+                raise ValueError(ERROR_NO_SPLIT_VALUES)
+            # Percentages may carry arbitrary decimals, so this is the one place that still
+            # needs Decimal; the result is cached with the rest of the portions
+            return {
+                uid: int(
+                    (amount * Decimal(str(pct)) / PERCENTAGE_BASE).to_integral_value(
+                        rounding=ROUND_HALF_UP
+                    )
+                )
+                for uid, pct in expense.split_values.items()
+            }
+
+        raise ValueError(f"{ERROR_INVALID_SPLIT_TYPE}: {expense.split_type}")
+
+    @staticmethod
+    def unpaid_amount(expense: Expense) -> Cents:
+        """Cents still outstanding: the full amount unless installments were paid."""
+        if expense.installments_count > 1 and expense.installments:
+            return sum(inst.amount for inst in expense.installments if not inst.paid)
+        return expense.amount
+
+    @staticmethod
+    def owed_shares(expense: Expense) -> Dict[str, Cents]:
+        """How many cents each non-payer currently owes the payer for a single expense.
+
+        For installment expenses only the unpaid installments count, so the result shrinks
+        as installments are paid. This is the per-expense contribution used both by
+        ``ExpenseService.recompute_group_balances`` and by the incremental balance ledger.
+        """
+        unpaid = PortionService.unpaid_amount(expense)
+        if unpaid <= 0:
+            return {}
+        portions = PortionService.portions(expense)
+        if unpaid != expense.amount:
+            portions = {
+                uid: div_half_up(portion * unpaid, expense.amount)
+                for uid, portion in portions.items()
+            }
+        return {uid: owed for uid, owed in portions.items() if uid != expense.paid_by}
+
+    @staticmethod
+    def group_net_balances(group: Group) -> Dict[str, Cents]:
+        """Net cents each member owes within the group (positive = owes, negative = is owed).
+
+        Counts the full amount of every expense paid by a current member, ignoring shares of
+        people who are no longer in the group.
+        """
+        if vectorized_balance_engine.use_vectorized_engine(len(group.expenses)):
+            return vectorized_balance_engine.group_net_balances(group)
+
+        nets = {user_id: 0 for user_id in group.members}
+        for expense in group.expenses:
+            if expense.paid_by not in nets:
+                continue
+            for uid, owed in PortionService.portions(expense).items():
+                if uid == expense.paid_by or uid not in nets:
+                    continue
+                nets[uid] += owed
+                nets[expense.paid_by] -= owed
+        return nets
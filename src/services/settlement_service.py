@@ -0,0 +1,232 @@
+"""Minimum-transaction settlement planning.
+
+Given each member's net balance, a settlement plan is the list of transfers that brings every
+balance to zero. A group of ``n`` non-zero balances can always be settled with ``n - 1``
+transfers; every subset of members whose balances already sum to zero saves one more. Finding
+the largest number of disjoint zero-sum subsets is NP-hard, so three strategies are offered:
+
+- ``greedy``: the classic largest-debtor pays largest-creditor match. Fast but not minimal.
+- ``exact``: dynamic programming over member subsets; minimal, but exponential, so it is only
+  used for up to ``SETTLEMENT_EXACT_MAX_PARTIES`` members with a non-zero balance; larger
+  groups asking for it get ``heuristic`` instead.
+- ``heuristic``: pulls out zero-sum pairs and triples, then runs randomized greedy restarts
+  until ``SETTLEMENT_TIME_BUDGET_MS`` runs out, keeping the plan with the fewest transfers.
+
+``auto`` picks ``exact`` when the group is small enough and ``heuristic`` otherwise. The
+returned plan records the strategy that actually ran.
+"""
+
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..constants import (
+    MIN_BALANCE_THRESHOLD,
+    SETTLEMENT_AUTO,
+    SETTLEMENT_EXACT,
+    SETTLEMENT_GREEDY,
+    SETTLEMENT_HEURISTIC,
+)
+from ..money import Cents
+from ..settings import get_settings
+
+SETTLEMENT_STRATEGIES = (SETTLEMENT_AUTO, SETTLEMENT_GREEDY, SETTLEMENT_EXACT, SETTLEMENT_HEURISTIC)
+
+Party = Tuple[str, Cents]
+
+
+@dataclass
+class SettlementPlan:
+    """Transfers that settle a set of net balances, and the strategy that produced them."""
+
+    strategy: str
+    transfers: List[Dict[str, Any]] = field(default_factory=list)  # {"from", "to", "amount"}
+
+
+class SettlementService:
+    """Plans the transfers that settle a group's net balances."""
+
+    @staticmethod
+    def plan(nets: Dict[str, Cents], strategy: Optional[str] = None) -> SettlementPlan:
+        """Plan transfers for ``nets`` (user_id -> cents; positive = is owed, negative = owes).
+
+        Args:
+            nets: Net balance of each member, in cents
+            strategy: One of ``SETTLEMENT_STRATEGIES``; defaults to ``SETTLEMENT_STRATEGY``
+
+        Raises:
+            ValueError: If the strategy is unknown
+        """
+        strategy = (strategy or get_settings().SETTLEMENT_STRATEGY).lower()
+        if strategy not in SETTLEMENT_STRATEGIES:
+            raise ValueError(f"Unknown settlement strategy: {strategy}")
+
+        # Sorted by user id so equal inputs always produce the same plan
+        parties = sorted(
+            (uid, net) for uid, net in nets.items() if abs(net) >= MIN_BALANCE_THRESHOLD
+        )
+        if strategy in (SETTLEMENT_AUTO, SETTLEMENT_EXACT):
+            # The exact solver is exponential, so it is never run beyond its bound
+            small = len(parties) <= get_settings().SETTLEMENT_EXACT_MAX_PARTIES
+            strategy = SETTLEMENT_EXACT if small else SETTLEMENT_HEURISTIC
+
+        if strategy == SETTLEMENT_GREEDY:
+            transfers = _greedy(parties)
+        elif strategy == SETTLEMENT_EXACT:
+            transfers = _exact(parties)
+        else:
+            transfers = _heuristic(parties, get_settings().SETTLEMENT_TIME_BUDGET_MS / 1000)
+        return SettlementPlan(strategy=strategy, transfers=transfers)
+
+    @staticmethod
+    def settle(nets: Dict[str, Cents], strategy: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Shortcut for ``plan(nets, strategy).transfers``."""
+        return SettlementService.plan(nets, strategy).transfers
+
+
+def _greedy(parties: List[Party]) -> List[Dict[str, Any]]:
+    """Repeatedly settle the largest debt against the largest credit."""
+    debtors = sorted(((uid, -net) for uid, net in parties if net < 0), key=lambda p: -p[1])
+    creditors = sorted(((uid, net) for uid, net in parties if net > 0), key=lambda p: -p[1])
+    return _match(debtors, creditors)
+
+
+def _match(debtors: List[Party], creditors: List[Party]) -> List[Dict[str, Any]]:
+    """Two-pointer match of debtors (owing positive amounts) against creditors, in order."""
+    transfers = []
+    i = j = 0
+    debt = debtors[0][1] if debtors else 0
+    credit = creditors[0][1] if creditors else 0
+    while i < len(debtors) and j < len(creditors):
+        amount = min(debt, credit)
+        transfers.append({"from": debtors[i][0], "to": creditors[j][0], "amount": amount})
+        debt -= amount
+        credit -= amount
+        if not debt:
+            i += 1
+            debt = debtors[i][1] if i < len(debtors) else 0
+        if not credit:
+            j += 1
+            credit = creditors[j][1] if j < len(creditors) else 0
+    return transfers
+
+
+def _exact(parties: List[Party]) -> List[Dict[str, Any]]:
+    """Minimal plan: split the parties into as many zero-sum subsets as possible.
+
+    ``best[mask]`` is the largest number of zero-sum subsets that a removal order of the
+    parties in ``mask`` passes through. Each zero-sum subset is then settled greedily, which
+    takes at most ``len(subset) - 1`` transfers.
+    """
+    count = len(parties)
+    if count < 2:
+        return []
+    amounts = [net for _, net in parties]
+    full = (1 << count) - 1
+    sums = [0] * (full + 1)
+    best = [0] * (full + 1)
+    for mask in range(1, full + 1):
+        low = mask & -mask
+        sums[mask] = sums[mask ^ low] + amounts[low.bit_length() - 1]
+        top, rest = 0, mask
+        while rest:
+            bit = rest & -rest
+            if best[mask ^ bit] > top:
+                top = best[mask ^ bit]
+            rest ^= bit
+        best[mask] = top + (sums[mask] == 0)
+
+    # Walk back from the full set; every zero-sum mask on the way closes a subset
+    groups: List[List[Party]] = []
+    current: List[Party] = []
+    mask = full
+    while mask:
+        target = best[mask] - (sums[mask] == 0)
+        if sums[mask] == 0 and current:
+            groups.append(current)
+            current = []
+        rest = mask
+        while rest:
+            bit = rest & -rest
+            if best[mask ^ bit] == target:
+                break
+            rest ^= bit
+        current.append(parties[bit.bit_length() - 1])
+        mask ^= bit
+    groups.append(current)
+
+    transfers = []
+    for group in groups:
+        transfers.extend(_greedy(group))
+    return transfers
+
+
+def _heuristic(parties: List[Party], budget_seconds: float) -> List[Dict[str, Any]]:
+    """Near-minimal plan for groups too large for ``_exact``, within a time budget."""
+    deadline = time.perf_counter() + budget_seconds
+
+    # Zero-sum pairs and triples settle among themselves with one transfer fewer than members
+    transfers = []
+    remaining = parties
+    for size in (2, 3):
+        remaining, groups = _take_zero_sum_groups(remaining, size, deadline)
+        for group in groups:
+            transfers.extend(_greedy(group))
+
+    if len(remaining) <= get_settings().SETTLEMENT_EXACT_MAX_PARTIES:
+        return transfers + _exact(remaining)
+
+    debtors = sorted(((uid, -net) for uid, net in remaining if net < 0), key=lambda p: -p[1])
+    creditors = sorted(((uid, net) for uid, net in remaining if net > 0), key=lambda p: -p[1])
+    plan = _match(debtors, creditors)
+    # No plan can use fewer transfers than there are debtors or creditors
+    floor = max(len(debtors), len(creditors))
+    rng = random.Random(0)
+    while len(plan) > floor and time.perf_counter() < deadline:
+        rng.shuffle(debtors)
+        rng.shuffle(creditors)
+        candidate = _match(debtors, creditors)
+        if len(candidate) < len(plan):
+            plan = candidate
+    return transfers + plan
+
+
+def _take_zero_sum_groups(
+    parties: List[Party], size: int, deadline: float
+) -> Tuple[List[Party], List[List[Party]]]:
+    """Greedily pull out disjoint zero-sum groups of ``size`` (2 or 3) parties.
+
+    Returns the parties left over and the groups found, stopping early at ``deadline``.
+    """
+    by_amount: Dict[Cents, List[int]] = {}
+    for index, (_, net) in enumerate(parties):
+        by_amount.setdefault(net, []).append(index)
+
+    used = set()
+    groups = []
+    for i in range(len(parties)):
+        if i in used:
+            continue
+        partners = [()] if size == 2 else [(j,) for j in range(i + 1, len(parties))]
+        for extra in partners:
+            if time.perf_counter() > deadline:
+                break
+            if any(j in used for j in extra):
+                continue
+            needed = -(parties[i][1] + sum(parties[j][1] for j in extra))
+            match = next(
+                (
+                    k
+                    for k in by_amount.get(needed, ())
+                    if k > i and k not in used and k not in extra
+                ),
+                None,
+            )
+            if match is not None:
+                members = [i, *extra, match]
+                used.update(members)
+                groups.append([parties[k] for k in members])
+                break
+
+    return [party for index, party in enumerate(parties) if index not in used], groups
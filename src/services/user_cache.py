@@ -0,0 +1,92 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.models.user import User
+from src.settings import get_settings
+
+
+class UserCache:
+    """Small in-process TTL + LRU cache of user records for authentication lookups.
+
+    Entries expire ``ttl_seconds`` after they are stored and the least recently used entry is
+    evicted once ``max_size`` is reached. A TTL or size of 0 disables the cache. Callers get a
+    copy of the cached user, so mutating it never leaks into other requests.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def get(self, user_id: str) -> Optional[User]:
+        """Return a copy of the cached user, or None on a miss or expired entry."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            user = entry[1]
+        return copy.deepcopy(user)
+
+    def set(self, user: User) -> None:
+        """Cache a user record, evicting the least recently used entry if full."""
+        if not self.enabled:
+            return
+        entry = (time.monotonic() + self.ttl_seconds, copy.deepcopy(user))
+        with self._lock:
+            self._entries[user.id] = entry
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_ids: Iterable[str]) -> None:
+        """Drop the given users so their next lookup reads the database."""
+        with self._lock:
+            for user_id in user_ids:
+                if self._entries.pop(user_id, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current counters, suitable for a metrics endpoint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_settings = get_settings()
+user_cache = UserCache(_settings.AUTH_CACHE_TTL_SECONDS, _settings.AUTH_CACHE_MAX_SIZE)
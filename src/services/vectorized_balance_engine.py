@@ -0,0 +1,229 @@
+"""Optional NumPy balance engine for groups with many expenses.
+
+The pure-Python balance code walks dicts and rounds shares once per expense and per split
+member. For groups with thousands of expenses this engine instead flattens every split into an
+expense × member share matrix in COO form (parallel ``rows``/``cols``/``values`` arrays) of
+integer cents, rounds it in bulk and aggregates it with ``np.bincount``. Each function
+reproduces the ``PortionService`` semantics, including its rounding rules, so results agree
+exactly.
+
+NumPy is not a hard dependency: install it and pick the engine with ``BALANCE_ENGINE``.
+"""
+
+import logging
+from itertools import repeat
+from typing import Dict, List, Tuple
+
+from ..constants import (
+    BALANCE_ENGINE_AUTO,
+    BALANCE_ENGINE_NUMPY,
+    ERROR_INVALID_SPLIT_TYPE,
+    ERROR_NO_SPLIT_VALUES,
+    ERROR_NO_USERS_TO_SPLIT,
+    SPLIT_EQUAL,
+    SPLIT_EXACT,
+    SPLIT_PERCENTAGE,
+)
+from ..models.expense import Expense
+from ..models.group import Group
+from ..settings import get_settings
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+logger = logging.getLogger(__name__)
+
+NUMPY_AVAILABLE = np is not None
+
+_TYPE_CODES = {SPLIT_EQUAL: 0, SPLIT_EXACT: 1, SPLIT_PERCENTAGE: 2}
+_warned_unavailable = False
+
+
+def use_vectorized_engine(expense_count: int) -> bool:
+    """Decide whether a computation over ``expense_count`` expenses should use NumPy."""
+    global _warned_unavailable
+
+    settings = get_settings()
+    engine = settings.BALANCE_ENGINE
+    if engine not in (BALANCE_ENGINE_NUMPY, BALANCE_ENGINE_AUTO):
+        return False
+    if not NUMPY_AVAILABLE:
+        if engine == BALANCE_ENGINE_NUMPY and not _warned_unavailable:
+            logger.warning("BALANCE_ENGINE=numpy but numpy is not installed; using Python")
+            _warned_unavailable = True
+        return False
+    if engine == BALANCE_ENGINE_NUMPY:
+        return True
+    return expense_count >= settings.BALANCE_ENGINE_MIN_EXPENSES
+
+
+class _MemberIndex(dict):
+    """Maps user ids to dense column indices, assigned in first-seen order."""
+
+    def __init__(self):
+        super().__init__()
+        self.ids: List[str] = []
+
+    def __missing__(self, user_id: str) -> int:
+        position = self[user_id] = len(self.ids)
+        self.ids.append(user_id)
+        return position
+
+
+def _div_half_up(numerator: "np.ndarray", denominator: "np.ndarray") -> "np.ndarray":
+    """Element-wise integer division rounded half away from zero, as ``money.div_half_up``."""
+    numerator = np.asarray(numerator, dtype=np.int64)
+    denominator = np.asarray(denominator, dtype=np.int64)
+    quotient = (2 * np.abs(numerator) + np.abs(denominator)) // (2 * np.abs(denominator))
+    return np.where((numerator < 0) != (denominator < 0), -quotient, quotient)
+
+
+def _round_half_up(values: "np.ndarray") -> "np.ndarray":
+    """Round to whole cents half away from zero, as ``Decimal.to_integral_value`` does.
+
+    Only percentage shares go through floats. With amounts in cents and percentages with a
+    couple of decimals the exact result is never within 1e-6 of a half cent unless it is one,
+    so a tiny epsilon absorbs the binary error that would otherwise drop exact halves.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return (np.sign(values) * np.floor(np.abs(values) + 0.5 + 1e-9)).astype(np.int64)
+
+
+def _sum_cents(groups: "np.ndarray", cents: "np.ndarray", size: int) -> "np.ndarray":
+    """Sum ``cents`` per group id. ``np.bincount`` adds in float64, exact below 2**53 cents."""
+    return np.bincount(groups, weights=cents, minlength=size).astype(np.int64)
+
+
+def _portion_cells(
+    expenses: List[Expense], index: _MemberIndex
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Every expense's portions as ``(rows, cols, cents)`` with one cell per expense/member.
+
+    Follows the ``PortionService.portions`` rules: EQUAL shares rounded half-up to the cent
+    with the remainder on the highest non-payer id, EXACT values taken as given and
+    PERCENTAGE shares rounded half-up to the cent.
+    """
+    rows, cols, split_values, types = [], [], [], []
+    amounts, counts, remainder_cols = [], [], []
+    for row, expense in enumerate(expenses):
+        amounts.append(expense.amount)
+        code = _TYPE_CODES.get(expense.split_type)
+        if code is None:
+            raise ValueError(f"{ERROR_INVALID_SPLIT_TYPE}: {expense.split_type}")
+        types.append(code)
+
+        if code == 0:
+            split_among = expense.split_among
+            if not split_among:
+                raise ValueError(ERROR_NO_USERS_TO_SPLIT)
+            counts.append(len(split_among))
+            non_payers = [uid for uid in split_among if uid != expense.paid_by]
+            remainder_cols.append(index[max(non_payers) if non_payers else expense.paid_by])
+            rows.extend(repeat(row, len(split_among)))
+            cols.extend(map(index.__getitem__, split_among))
+            split_values.extend(repeat(0.0, len(split_among)))
+        else:
+            values = expense.split_values
+            if not values:
+                raise ValueError(ERROR_NO_SPLIT_VALUES)
+            counts.append(1)
+            remainder_cols.append(-1)
+            rows.extend(repeat(row, len(values)))
+            cols.extend(map(index.__getitem__, values))
+            split_values.extend(values.values())
+
+    amount = np.asarray(amounts, dtype=np.int64)
+    count = np.asarray(counts, dtype=np.int64)
+    code = np.asarray(types, dtype=np.int8)
+    rows = np.asarray(rows, dtype=np.intp)
+    cols = np.asarray(cols, dtype=np.intp)
+    split_values = np.asarray(split_values, dtype=np.float64)
+
+    # EQUAL: per-person share rounded half-up to the cent, plus the rounding remainder (if
+    # any) on the designated member
+    equal = code == 0
+    per_person = np.where(equal, _div_half_up(amount, np.maximum(count, 1)), 0)
+    remainder = np.where(equal, amount - per_person * count, 0)
+
+    row_code = code[rows]
+    cents = np.select(
+        [row_code == 0, row_code == 1, row_code == 2],
+        [
+            per_person[rows],
+            split_values.astype(np.int64),
+            _round_half_up(amount[rows] * split_values / 100.0),
+        ],
+        default=0,
+    )
+    with_remainder = np.flatnonzero(equal & (remainder != 0))
+    rows = np.concatenate([rows, with_remainder])
+    cols = np.concatenate([cols, np.asarray(remainder_cols, dtype=np.intp)[with_remainder]])
+    cents = np.concatenate([cents, remainder[with_remainder]])
+
+    # Members listed twice (e.g. remainder recipient) merge into one portion per expense
+    n = len(index.ids)
+    cell, inverse = np.unique(rows * n + cols, return_inverse=True)
+    return cell // n, cell % n, _sum_cents(inverse, cents, len(cell))
+
+
+def owed_pairs(expenses: List[Expense]) -> List[Tuple[str, str, int]]:
+    """Total cents each debtor owes each payer, as in ``recompute_group_balances``.
+
+    Uses the ``PortionService.owed_shares`` rules: only unpaid installments count and each
+    share is scaled by the unpaid fraction with half-up rounding. Returns
+    ``(debtor_id, payer_id, cents)`` triples.
+    """
+    index = _MemberIndex()
+    payer = np.asarray([index[expense.paid_by] for expense in expenses], dtype=np.intp)
+    amount = np.asarray([expense.amount for expense in expenses], dtype=np.int64)
+    unpaid = np.asarray(
+        [
+            sum(inst.amount for inst in expense.installments if not inst.paid)
+            if expense.installments_count > 1 and expense.installments
+            else expense.amount
+            for expense in expenses
+        ],
+        dtype=np.int64,
+    )
+    rows, cols, cents = _portion_cells(expenses, index)
+
+    keep = (cols != payer[rows]) & (unpaid[rows] > 0)
+    rows, cols, cents = rows[keep], cols[keep], cents[keep]
+    partial = unpaid[rows] != amount[rows]
+    owed = np.where(
+        partial, _div_half_up(cents * unpaid[rows], np.where(partial, amount[rows], 1)), cents
+    )
+    creditor = payer[rows]
+
+    n = len(index.ids)
+    pair, inverse = np.unique(cols * n + creditor, return_inverse=True)
+    totals = _sum_cents(inverse, owed, len(pair))
+    return [
+        (index.ids[key // n], index.ids[key % n], total)
+        for key, total in zip(pair.tolist(), totals.tolist(), strict=True)
+    ]
+
+
+def group_net_balances(group: Group) -> Dict[str, int]:
+    """Per-member net cents owed within a group, as in ``PortionService.group_net_balances``.
+
+    Positive means the member owes. Only expenses paid by a current member count, and only
+    the shares of current members.
+    """
+    members = group.members
+    index = _MemberIndex()
+    for user_id in members:
+        index[user_id]
+    member_count = len(index.ids)
+
+    expenses = [expense for expense in group.expenses if expense.paid_by in members]
+    payer = np.asarray([index[expense.paid_by] for expense in expenses], dtype=np.intp)
+    rows, cols, cents = _portion_cells(expenses, index)
+
+    keep = (cols < member_count) & (cols != payer[rows])
+    nets = _sum_cents(cols[keep], cents[keep], member_count)
+    nets -= _sum_cents(payer[rows[keep]], cents[keep], member_count)
+    # Non-members were indexed after the members; their shares are not counted
+    return dict(zip(index.ids[:member_count], nets.tolist(), strict=True))
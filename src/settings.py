@@ -19,6 +19,86 @@ class Settings:
     LOCALES_DIR: str = os.getenv("LOCALES_DIR", "locales")
     DEFAULT_LOCALE: str = os.getenv("DEFAULT_LOCALE", "pt-BR")
 
+    # Database engine / connection pool tuning. DB_POOL_SIZE and DB_MAX_OVERFLOW size the
+    # async engine behind the API routes; the sync engine (authentication lookups, the auth
+    # routes, the notification daemon and scripts) gets its own, smaller DB_SYNC_* pool.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_SYNC_POOL_SIZE: int = int(os.getenv("DB_SYNC_POOL_SIZE", "2"))
+    DB_SYNC_MAX_OVERFLOW: int = int(os.getenv("DB_SYNC_MAX_OVERFLOW", "3"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # PostgreSQL statement_timeout in milliseconds (0 disables it)
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+
+    # Token required in the X-Admin-Token header for /api/admin/* (unset disables them)
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+
+    # In-process cache of authenticated users (a TTL or size of 0 disables it)
+    AUTH_CACHE_TTL_SECONDS: float = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+    AUTH_CACHE_MAX_SIZE: int = int(os.getenv("AUTH_CACHE_MAX_SIZE", "1024"))
+
+    # "on_write": GET endpoints are read-only and user balances are only persisted by
+    # writes. "on_read": legacy behaviour, every group read also rewrites member balances.
+    BALANCE_MATERIALIZATION: str = os.getenv("BALANCE_MATERIALIZATION", "on_write").lower()
+
+    # "python", "numpy" (requires numpy) or "auto": NumPy for groups with at least
+    # BALANCE_ENGINE_MIN_EXPENSES expenses when numpy is installed
+    BALANCE_ENGINE: str = os.getenv("BALANCE_ENGINE", "auto").lower()
+    BALANCE_ENGINE_MIN_EXPENSES: int = int(os.getenv("BALANCE_ENGINE_MIN_EXPENSES", "2000"))
+
+    # Expenses whose split portions are memoized in process (0 disables the cache)
+    PORTIONS_CACHE_SIZE: int = int(os.getenv("PORTIONS_CACHE_SIZE", "20000"))
+
+    # "greedy", "exact", "heuristic" or "auto": the exact solver for groups with at most
+    # SETTLEMENT_EXACT_MAX_PARTIES unsettled members, the time-boxed heuristic above that
+    SETTLEMENT_STRATEGY: str = os.getenv("SETTLEMENT_STRATEGY", "auto").lower()
+    SETTLEMENT_EXACT_MAX_PARTIES: int = int(os.getenv("SETTLEMENT_EXACT_MAX_PARTIES", "14"))
+    SETTLEMENT_TIME_BUDGET_MS: float = float(os.getenv("SETTLEMENT_TIME_BUDGET_MS", "50"))
+
+    # Largest number of rows accepted by POST /api/groups/{id}/expenses:bulk
+    BULK_IMPORT_MAX_ROWS: int = int(os.getenv("BULK_IMPORT_MAX_ROWS", "10000"))
+
+    # Pub/sub behind the group event streams ("memory": single process only). Subscribers
+    # more than EVENT_QUEUE_SIZE events behind are told to resync instead.
+    EVENT_BROKER: str = os.getenv("EVENT_BROKER", "memory").lower()
+    EVENT_QUEUE_SIZE: int = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+    # Seconds between keep-alive comments on idle event streams
+    EVENT_STREAM_HEARTBEAT_SECONDS: float = float(
+        os.getenv("EVENT_STREAM_HEARTBEAT_SECONDS", "15")
+    )
+
+    # Notification email delivery: SMTP_POOL_SIZE authenticated connections (and sending
+    # threads), each reused for up to SMTP_MESSAGES_PER_CONNECTION messages. At most
+    # SMTP_RATE_PER_SECOND messages per second (0: unlimited); transient failures are
+    # retried SMTP_MAX_RETRIES times, waiting SMTP_RETRY_BACKOFF_SECONDS, doubled each time.
+    SMTP_POOL_SIZE: int = int(os.getenv("SMTP_POOL_SIZE", "4"))
+    SMTP_MESSAGES_PER_CONNECTION: int = int(os.getenv("SMTP_MESSAGES_PER_CONNECTION", "100"))
+    SMTP_RATE_PER_SECOND: float = float(os.getenv("SMTP_RATE_PER_SECOND", "10"))
+    SMTP_MAX_RETRIES: int = int(os.getenv("SMTP_MAX_RETRIES", "3"))
+    SMTP_RETRY_BACKOFF_SECONDS: float = float(os.getenv("SMTP_RETRY_BACKOFF_SECONDS", "1"))
+    SMTP_STARTTLS: bool = os.getenv("SMTP_STARTTLS", "true").lower() in {"1", "true", "yes", "on"}
+    SMTP_TIMEOUT_SECONDS: float = float(os.getenv("SMTP_TIMEOUT_SECONDS", "30"))
+
+    # Notification outbox dispatch: users whose reminders are claimed and sent per chunk,
+    # and delivery runs a reminder gets before it is marked failed
+    NOTIFICATION_DISPATCH_CHUNK_USERS: int = int(
+        os.getenv("NOTIFICATION_DISPATCH_CHUNK_USERS", "100")
+    )
+    NOTIFICATION_MAX_ATTEMPTS: int = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "5"))
+
+    # Notification daemon: seconds between ticks (each queues reminders for new expenses and
+    # delivers the outbox), local time of the daily full scan, widest upcoming window any
+    # user's days_ahead_reminder may ask for, and health/metrics HTTP port (0: disabled)
+    NOTIFICATION_DAEMON_INTERVAL_SECONDS: float = float(
+        os.getenv("NOTIFICATION_DAEMON_INTERVAL_SECONDS", "60")
+    )
+    NOTIFICATION_DAILY_AT: str = os.getenv("NOTIFICATION_DAILY_AT", "08:00")
+    NOTIFICATION_UPCOMING_MAX_DAYS: int = int(os.getenv("NOTIFICATION_UPCOMING_MAX_DAYS", "30"))
+    NOTIFICATION_METRICS_PORT: int = int(os.getenv("NOTIFICATION_METRICS_PORT", "9105"))
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
@@ -24,6 +24,33 @@ def cleanup_test_data():
     # This runs after each test - could clean up test data here
 
 
+@pytest.fixture
+def isolated_db(tmp_path, monkeypatch):
+    """Point the database layer at a fresh SQLite file for the duration of a test."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import NullPool
+
+    from src import database
+
+    db_path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    database.Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(
+        database, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    )
+    # The async routers use their own engine; point it at the same file
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    monkeypatch.setattr(
+        database,
+        "AsyncSessionLocal",
+        async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False),
+    )
+    yield engine
+    engine.dispose()
+
+
 @pytest.fixture
 def unique_email():
     """Generate a unique email for testing."""
@@ -0,0 +1,98 @@
+"""Stub SMTP server and the ``smtp_server`` / ``smtp_delivery`` fixtures.
+
+Loaded with ``pytest_plugins`` by the email delivery and notification tests.
+"""
+
+import email
+import socketserver
+import threading
+from email import policy
+
+import pytest
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    """Just enough SMTP (with AUTH PLAIN) to accept messages and fail on demand."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubSMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        # Replies to use instead of 250 after DATA, consumed one per message
+        self.data_failures = []
+
+
+class _StubSMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self._reply("220 stub ready")
+        while True:
+            line = self.rfile.readline().decode().rstrip("\r\n")
+            if not line:
+                return
+            verb = line.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self._reply("250-stub")
+                self._reply("250 AUTH PLAIN")
+            elif verb == "AUTH":
+                with server.lock:
+                    server.logins += 1
+                self._reply("235 authenticated")
+            elif verb == "DATA":
+                self._reply("354 go ahead")
+                lines = []
+                while (data := self.rfile.readline()) not in (b".\r\n", b""):
+                    lines.append(data)
+                with server.lock:
+                    failure = server.data_failures.pop(0) if server.data_failures else None
+                    if failure is None:
+                        server.messages.append(
+                            email.message_from_bytes(b"".join(lines), policy=policy.default)
+                        )
+                self._reply(failure or "250 queued")
+            elif verb == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 ok")
+
+
+@pytest.fixture
+def smtp_server():
+    """A stub SMTP server on localhost, recording the messages it accepts."""
+    server = StubSMTPServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def smtp_delivery(smtp_server):
+    """Build an EmailDelivery sending through ``smtp_server`` without sleeping on retries."""
+    from src.services.email_delivery import EmailDelivery, SMTPConnectionPool
+
+    def build(size=3, max_messages=100, **kwargs):
+        pool = SMTPConnectionPool(
+            "127.0.0.1",
+            smtp_server.server_address[1],
+            "bot@example.com",
+            "secret",
+            size=size,
+            starttls=False,
+            timeout=5,
+            max_messages=max_messages,
+        )
+        return EmailDelivery(pool, "bot@example.com", sleep=lambda _: None, **kwargs)
+
+    return build
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Test connection pool metrics and the admin metrics endpoint."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.pool_metrics import InstrumentedQueuePool, instrument_pool, pool_metrics
+from src.settings import get_settings
+
+
+def test_pool_metrics_count_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    instrument_pool(engine.pool)
+    pool_metrics.reset()
+
+    held = engine.connect()
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    held.close()
+
+    snapshot = pool_metrics.snapshot(engine.pool)
+    assert snapshot["checkouts"] == 1
+    assert snapshot["checkins"] == 1
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_seconds_max"] >= 0.05
+    assert snapshot["size"] == 1
+    engine.dispose()
+
+
+def test_admin_metrics_endpoint_requires_token(monkeypatch):
+    from web_app import app
+
+    client = TestClient(app)
+    settings = get_settings()
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    assert client.get("/api/admin/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/api/admin/metrics", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    response = client.get("/api/admin/metrics", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    assert "checkouts" in response.json()["db_pool"]
+    assert "checkouts" in response.json()["db_async_pool"]
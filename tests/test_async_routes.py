@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Test the async database layer used by the API routers."""
+
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src import database
+from src.pool_metrics import InstrumentedAsyncQueuePool, async_pool_metrics, instrument_pool
+from src.services.async_database_service import AsyncDatabaseService
+from src.services.database_service import DatabaseService
+
+
+def test_async_service_shares_data_with_sync_service(isolated_db):
+    """Rows written through the async engine are visible to the sync engine and back."""
+    alice = DatabaseService.create_user("Alice", "alice@example.com")
+
+    async def scenario():
+        bob = await AsyncDatabaseService.create_user("Bob", "bob@example.com")
+        group = await AsyncDatabaseService.create_group("Trip", [alice.id, bob.id])
+        # Several operations in flight at once on the same event loop
+        fetched = await asyncio.gather(
+            *(AsyncDatabaseService.get_group(group.id) for _ in range(8))
+        )
+        return bob, group, fetched
+
+    bob, group, fetched = asyncio.run(scenario())
+    assert all(set(g.members) == {alice.id, bob.id} for g in fetched)
+    assert DatabaseService.get_user(bob.id).email == "bob@example.com"
+    assert DatabaseService.get_group(group.id).name == "Trip"
+
+
+def test_group_and_expense_routes_run_on_async_layer(isolated_db):
+    """The main API flow works end to end through the awaited service."""
+    from web_app import app
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    assert response.status_code == 200
+    alice_id = response.json()["user_id"]
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+
+    response = client.post("/api/groups", json={"name": "Trip", "member_ids": [bob.id]})
+    assert response.status_code == 201
+    group_id = response.json()["id"]
+
+    response = client.post(
+        f"/api/groups/{group_id}/expenses",
+        json={
+            "amount": 100.0,
+            "description": "Dinner",
+            "paid_by": alice_id,
+            "split_among": [alice_id, bob.id],
+            "split_type": "EQUAL",
+        },
+    )
+    assert response.status_code == 201
+
+    response = client.get(f"/api/groups/{group_id}")
+    assert response.status_code == 200
+    assert response.json()["members"][bob.id]["balance"] == {alice_id: 50.0}
+
+
+def _pool_snapshot_under_load(db_path, monkeypatch, pool_size, max_overflow, requests=8):
+    """Serve ``requests`` concurrent group reads on an instrumented async pool."""
+    from web_app import app
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=10,
+    )
+    instrument_pool(engine.sync_engine.pool, async_pool_metrics)
+    monkeypatch.setattr(
+        database,
+        "AsyncSessionLocal",
+        async_sessionmaker(engine, autoflush=False, expire_on_commit=False),
+    )
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.post(
+                "/api/signup",
+                json={
+                    "name": "Alice",
+                    "email": f"alice{max_overflow}@example.com",
+                    "password": "secret123",
+                },
+            )
+            group_id = (await client.post("/api/groups", json={"name": "Trip"})).json()["id"]
+            async_pool_metrics.reset()
+            responses = await asyncio.gather(
+                *(client.get(f"/api/groups/{group_id}") for _ in range(requests))
+            )
+        snapshot = async_pool_metrics.snapshot(engine.sync_engine.pool)
+        await engine.dispose()
+        return [response.status_code for response in responses], snapshot
+
+    return asyncio.run(scenario())
+
+
+def test_pool_settings_shape_checkouts_under_concurrency(isolated_db, monkeypatch):
+    """More concurrent requests than pooled connections wait or overflow, per DB_MAX_OVERFLOW."""
+    db_path = isolated_db.url.database
+
+    statuses, tight = _pool_snapshot_under_load(db_path, monkeypatch, 2, 0)
+    assert statuses == [200] * 8
+    # Requests queue for the two pooled connections instead of opening more
+    assert tight["checkouts"] == 8 and tight["timeouts"] == 0
+    assert tight["connects"] <= 2
+    assert tight["peak_overflow"] == tight["overflow_checkouts"] == 0
+
+    statuses, roomy = _pool_snapshot_under_load(db_path, monkeypatch, 2, 6)
+    assert statuses == [200] * 8
+    # The same burst opens overflow connections on top of the pool
+    assert roomy["checkouts"] == 8
+    assert roomy["connects"] > 2
+    assert 1 <= roomy["peak_overflow"] <= 6
+    assert roomy["overflow_checkouts"] >= 1
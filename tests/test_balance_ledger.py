@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Test that the incremental balance ledger matches a full recompute."""
+
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from src.models.expense import Expense
+from src.repositories.balance_ledger_repository import BalanceLedgerRepository
+from src.services.database_service import DatabaseService
+from src.services.expense_service import ExpenseService
+
+
+def _make_expense(paid_by, split_among, amount, **kwargs):
+    expense = Expense(
+        id=str(uuid.uuid4()),
+        amount=amount,
+        description="Ledger test",
+        paid_by=paid_by,
+        split_among=split_among,
+        created_at=datetime(2025, 1, 15),
+        **kwargs,
+    )
+    ExpenseService.generate_installments(expense)
+    return expense
+
+
+def _ledger_and_recompute(group_id):
+    """Return (ledger balances, recomputed balances) for a group as plain dicts."""
+    group = DatabaseService.get_group(group_id)
+    DatabaseService.load_group_balances(group)
+    ledger = {uid: dict(user.balance) for uid, user in group.members.items()}
+
+    fresh = DatabaseService.get_group(group_id)
+    ExpenseService.recompute_group_balances(fresh)
+    recomputed = {uid: dict(user.balance) for uid, user in fresh.members.items()}
+    return ledger, recomputed
+
+
+def _assert_same(ledger, recomputed):
+    for uid in recomputed:
+        for other_id in set(ledger[uid]) | set(recomputed[uid]):
+            assert ledger[uid].get(other_id, 0) == recomputed[uid].get(other_id, 0)
+
+
+def test_ledger_tracks_expense_writes(isolated_db):
+    """Create, pay and delete expenses and compare the ledger with a full recompute."""
+    alice = DatabaseService.create_user("Alice", "alice@example.com")
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    carol = DatabaseService.create_user("Carol", "carol@example.com")
+    group = DatabaseService.create_group("Trip", [alice.id, bob.id, carol.id])
+    members = [alice.id, bob.id, carol.id]
+
+    dinner = _make_expense(alice.id, members, 9000)
+    taxi = _make_expense(
+        bob.id,
+        [alice.id, bob.id],
+        3000,
+        split_type="EXACT",
+        split_values={alice.id: 1250, bob.id: 1750},
+    )
+    laptop = _make_expense(carol.id, members, 90000, installments_count=3)
+    snacks = _make_expense(carol.id, members, 1000)
+    for expense in (dinner, taxi, laptop, snacks):
+        DatabaseService.add_expense_to_group(group.id, expense)
+
+    ledger, recomputed = _ledger_and_recompute(group.id)
+    _assert_same(ledger, recomputed)
+    assert ledger[bob.id][alice.id] == 3000 - 1250
+
+    assert DatabaseService.pay_installment(laptop.id, 1)
+    ledger, recomputed = _ledger_and_recompute(group.id)
+    _assert_same(ledger, recomputed)
+    # The snacks rounding cent goes to the highest non-payer id
+    snack_share = 334 if alice.id > bob.id else 333
+    assert ledger[alice.id][carol.id] == 20000 - 3000 + snack_share
+
+    assert DatabaseService.delete_expense(dinner.id)
+    ledger, recomputed = _ledger_and_recompute(group.id)
+    _assert_same(ledger, recomputed)
+    assert ledger[bob.id][alice.id] == -1250
+
+
+def test_unmaterialized_group_is_rebuilt(isolated_db):
+    """Groups that predate the ledger are materialized from their expenses on first read."""
+    from src import database
+
+    alice = DatabaseService.create_user("Alice", "alice@example.com")
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    group = DatabaseService.create_group("Legacy", [alice.id, bob.id])
+    lunch = _make_expense(alice.id, [alice.id, bob.id], 5000)
+    DatabaseService.add_expense_to_group(group.id, lunch)
+
+    with DatabaseService.get_session() as db:
+        db.query(database.GroupBalanceDB).delete()
+        db.query(database.GroupDB).update({database.GroupDB.balances_materialized: False})
+        db.commit()
+
+    ledger, recomputed = _ledger_and_recompute(group.id)
+    _assert_same(ledger, recomputed)
+    assert ledger[bob.id][alice.id] == 2500
+
+
+def test_concurrent_writes_to_a_new_pair_are_both_applied(isolated_db):
+    """Two transactions adding to a pair that has no row yet neither fail nor lose a delta."""
+    from src import database
+
+    alice = DatabaseService.create_user("Alice", "alice@example.com")
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    group = DatabaseService.create_group("Trip", [alice.id, bob.id])
+
+    first, second = database.SessionLocal(), database.SessionLocal()
+    BalanceLedgerRepository(first).apply_shares(group.id, alice.id, {bob.id: 1000})
+    # The second writer waits on the first's write lock, then adds to the row it inserted
+    writer = threading.Thread(
+        target=lambda: (
+            BalanceLedgerRepository(second).apply_shares(group.id, alice.id, {bob.id: 250}),
+            second.commit(),
+        )
+    )
+    writer.start()
+    time.sleep(0.2)
+    first.commit()
+    writer.join(5)
+    first.close()
+    second.close()
+
+    ledger, _ = _ledger_and_recompute(group.id)
+    assert ledger[bob.id][alice.id] == 1250
+
+
+def test_repeated_split_members_count_once(isolated_db):
+    """A member listed twice in split_among is stored once and owes a single share."""
+    from web_app import app
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    alice_id = response.json()["user_id"]
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    group_id = client.post("/api/groups", json={"name": "Trip", "member_ids": [bob.id]}).json()[
+        "id"
+    ]
+
+    response = client.post(
+        f"/api/groups/{group_id}/expenses",
+        json={
+            "amount": 90.0,
+            "description": "Dinner",
+            "paid_by": alice_id,
+            "split_among": [alice_id, bob.id, bob.id],
+        },
+    )
+    assert response.status_code == 201
+    assert response.json()["split_among"] == [alice_id, bob.id]
+
+    ledger, recomputed = _ledger_and_recompute(group_id)
+    _assert_same(ledger, recomputed)
+    assert ledger[bob.id][alice_id] == 4500
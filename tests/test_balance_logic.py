@@ -48,18 +48,18 @@ def test_balance_logic():
     print("\n💰 Balances BEFORE recompute:")
     for user_id, user in test_group.members.items():
         total_balance = sum(user.balance.values())
-        print(f"  {user.name}: ${total_balance:.2f}")
+        print(f"  {user.name}: ${total_balance / 100:.2f}")
         if user.balance:
             for other_user_id, amount in user.balance.items():
                 other_user = test_group.members.get(other_user_id)
                 other_name = other_user.name if other_user else other_user_id[:8]
-                print(f"    → {other_name}: ${amount:.2f}")
+                print(f"    → {other_name}: ${amount / 100:.2f}")
     
     # Analyze expenses in detail
     print(f"\n📝 Expense Analysis:")
     for i, expense in enumerate(test_group.expenses):
         print(f"  Expense {i+1}: {expense.description}")
-        print(f"    Amount: ${expense.amount}")
+        print(f"    Amount: ${expense.amount / 100:.2f}")
         
         payer = test_group.members.get(expense.paid_by)
         payer_name = payer.name if payer else expense.paid_by[:8]
@@ -77,7 +77,7 @@ def test_balance_logic():
         
         # Calculate what each person should owe
         if expense.split_type == "EQUAL":
-            per_person = expense.amount / len(expense.split_among)
+            per_person = expense.amount / 100 / len(expense.split_among)
             print(f"    Per person: ${per_person:.2f}")
             
             print("    Expected debts:")
@@ -97,12 +97,12 @@ def test_balance_logic():
     print("\n💰 Balances AFTER recompute:")
     for user_id, user in test_group.members.items():
         total_balance = sum(user.balance.values())
-        print(f"  {user.name} ({user_id[:8]}...): ${total_balance:.2f}")
+        print(f"  {user.name} ({user_id[:8]}...): ${total_balance / 100:.2f}")
         if user.balance:
             for other_user_id, amount in user.balance.items():
                 other_user = test_group.members.get(other_user_id)
                 other_name = other_user.name if other_user else "Unknown"
-                print(f"    → owes {other_name} ({other_user_id[:8]}...): ${amount:.2f}")
+                print(f"    → owes {other_name} ({other_user_id[:8]}...): ${amount / 100:.2f}")
     
     # Verify balance consistency
     print(f"\n✅ Balance Verification:")
@@ -112,9 +112,9 @@ def test_balance_logic():
         total_balance += user_total
         print(f"  {user.name} net: ${user_total:.2f}")
     
-    print(f"  Total system balance: ${total_balance:.2f} (should be $0.00)")
+    print(f"  Total system balance: ${total_balance / 100:.2f} (should be $0.00)")
     
-    if abs(total_balance) < 0.01:
+    if total_balance == 0:
         print("  ✅ Balances are consistent!")
     else:
         print("  ❌ Balance inconsistency detected!")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Test that balances are flushed in one batch and never written by read paths."""
+
+from sqlalchemy import event
+
+from src.constants import BALANCE_MATERIALIZATION_ON_READ, BALANCE_MATERIALIZATION_ON_WRITE
+from src.services.database_service import DatabaseService
+from src.settings import get_settings
+
+
+def _capture_writes(engine):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("UPDATE", "INSERT", "DELETE")):
+            statements.append(statement)
+
+    return statements
+
+
+def test_update_user_balances_is_batched(isolated_db):
+    """Changed balances are written with a single UPDATE; unchanged ones are skipped."""
+    users = {
+        user.id: user
+        for user in (
+            DatabaseService.create_user("Alice", "alice@example.com"),
+            DatabaseService.create_user("Bob", "bob@example.com"),
+            DatabaseService.create_user("Carol", "carol@example.com"),
+        )
+    }
+    ids = list(users)
+    users[ids[0]].balance = {ids[1]: 10.0}
+    users[ids[1]].balance = {ids[0]: -10.0}
+
+    writes = _capture_writes(isolated_db)
+    assert DatabaseService.update_user_balances(users) == 2
+    assert len(writes) == 1
+
+    writes.clear()
+    assert DatabaseService.update_user_balances(users) == 0
+    assert writes == []
+    assert DatabaseService.get_user(ids[0]).balance == {ids[1]: 10.0}
+
+
+def test_read_paths_do_not_write_balances(isolated_db, monkeypatch):
+    """In the default mode a read never persists balances; the legacy mode still does."""
+    alice = DatabaseService.create_user("Alice", "alice@example.com")
+    alice.balance = {"someone": 5.0}
+    users = {alice.id: alice}
+    settings = get_settings()
+
+    monkeypatch.setattr(settings, "BALANCE_MATERIALIZATION", BALANCE_MATERIALIZATION_ON_WRITE)
+    DatabaseService.update_user_balances_on_read(users)
+    assert DatabaseService.get_user(alice.id).balance == {}
+
+    monkeypatch.setattr(settings, "BALANCE_MATERIALIZATION", BALANCE_MATERIALIZATION_ON_READ)
+    DatabaseService.update_user_balances_on_read(users)
+    assert DatabaseService.get_user(alice.id).balance == {"someone": 5.0}
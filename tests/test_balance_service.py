@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Test the net-balance-first BalanceService API."""
+
+import random
+from datetime import datetime
+
+from src.models.expense import Expense
+from src.models.user import User
+from src.services.balance_service import BalanceService
+
+
+def _group(seed: int, member_count: int = 40, expense_count: int = 200):
+    rng = random.Random(seed)
+    users = {
+        f"u{i}": User(id=f"u{i}", name=f"U{i}", email=f"{i}@x.com") for i in range(member_count)
+    }
+    ids = list(users)
+    expenses = [
+        Expense(
+            id=f"e{i}",
+            amount=rng.randint(1, 5000),
+            description="",
+            paid_by=rng.choice(ids),
+            split_among=rng.sample(ids, rng.randint(1, 6)),
+            created_at=datetime(2025, 1, 1),
+        )
+        for i in range(expense_count)
+    ]
+    return expenses, users
+
+
+def test_net_balances_sum_to_zero():
+    expenses, users = _group(1)
+    nets = BalanceService().calculate_net_balances(expenses)
+    assert sum(nets.values()) == 0
+    assert set(nets) <= set(users)
+
+
+def test_statistics_count_pairs_without_materializing_them():
+    service = BalanceService()
+    for seed in range(5):
+        expenses, users = _group(seed)
+        pairwise = service.calculate_group_balances(expenses, users)
+        statistics = service.calculate_group_statistics(expenses, users)
+        assert statistics["pending_settlements"] == len(pairwise)
+
+    # Only equal nets are settled: a one-cent difference still rounds to a one-cent balance
+    assert BalanceService._count_unsettled_pairs([0, 2, 2, 3, 10]) == 9
+
+
+def test_one_cent_balances_are_kept():
+    users = {uid: User(id=uid, name=uid, email=f"{uid}@x.com") for uid in ("a", "b")}
+    expense = Expense(
+        id="e",
+        amount=2,
+        description="",
+        paid_by="a",
+        split_among=["a", "b"],
+        created_at=datetime(2025, 1, 1),
+    )
+    (balance,) = BalanceService().calculate_group_balances([expense], users)
+    assert abs(balance.amount) == 1
+    assert BalanceService().calculate_group_statistics([expense], users)["pending_settlements"] == 1
+
+
+def test_suggestions_from_nets_settle_every_member():
+    service = BalanceService()
+    expenses, users = _group(7, member_count=8)
+    nets = service.calculate_net_balances(expenses)
+
+    suggestions = service.suggest_settlements(nets, users)
+    remaining = dict(nets)
+    for suggestion in suggestions:
+        remaining[suggestion.from_user.id] += suggestion.amount
+        remaining[suggestion.to_user.id] -= suggestion.amount
+    assert set(remaining.values()) == {0}
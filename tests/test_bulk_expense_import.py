@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Test bulk expense import from JSON arrays and CSV bodies."""
+
+from fastapi.testclient import TestClient
+
+from src.services.database_service import DatabaseService
+from src.services.portion_service import PortionService
+
+
+def _signup(client):
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    return response.json()["user_id"]
+
+
+def test_bulk_import_json_and_csv(isolated_db):
+    from web_app import app
+
+    client = TestClient(app)
+    alice_id = _signup(client)
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    carol = DatabaseService.create_user("Carol", "carol@example.com")
+    group_id = client.post(
+        "/api/groups", json={"name": "Flat", "member_ids": [bob.id, carol.id]}
+    ).json()["id"]
+    members = [alice_id, bob.id, carol.id]
+    url = f"/api/groups/{group_id}/expenses:bulk"
+
+    rows = [
+        {
+            "description": f"Row {i}",
+            "amount": 10.0 + i,
+            "paid_by": members[i % 3],
+            "split_among": members if i % 2 else members[:2],
+        }
+        for i in range(300)
+    ]
+    response = client.post(url, json=rows)
+    assert response.status_code == 201
+    assert response.json()["created"] == 300
+
+    csv_body = (
+        "description,amount,paid_by,split_among,split_type,split_values,installments_count\n"
+        f"Rent,90.00,{bob.id},{alice_id};{bob.id},EXACT,{alice_id}=60;{bob.id}=30,3\n"
+        f"Internet,30,{carol.id},{alice_id};{bob.id};{carol.id},,,\n"
+    )
+    response = client.post(url, content=csv_body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 201
+    rent_id, internet_id = response.json()["expense_ids"]
+
+    group = DatabaseService.get_group(group_id)
+    assert len(group.expenses) == 302
+    rent = next(expense for expense in group.expenses if expense.id == rent_id)
+    assert rent.split_values == {alice_id: 6000, bob.id: 3000}
+    assert [installment.amount for installment in rent.installments] == [3000, 3000, 3000]
+    # The ledger updated in one pass matches the balances computed from every expense
+    detail = client.get(f"/api/groups/{group_id}").json()
+    expected = PortionService.group_net_balances(group)
+    assert detail["balances"] == {user_id: cents / 100 for user_id, cents in expected.items()}
+
+    # Imports keep file order within the listing
+    listed = client.get(
+        f"/api/groups/{group_id}/expenses", params={"created_by": "any", "limit": 2}
+    ).json()
+    assert [expense["id"] for expense in listed] == [internet_id, rent_id]
+
+
+def test_bulk_import_rejects_the_whole_batch_on_any_invalid_row(isolated_db):
+    from web_app import app
+
+    client = TestClient(app)
+    alice_id = _signup(client)
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    outsider = DatabaseService.create_user("Outsider", "outsider@example.com")
+    group_id = client.post("/api/groups", json={"name": "Trip", "member_ids": [bob.id]}).json()[
+        "id"
+    ]
+    url = f"/api/groups/{group_id}/expenses:bulk"
+    valid = {"description": "Ok", "amount": 10, "paid_by": alice_id, "split_among": [bob.id]}
+
+    response = client.post(
+        url,
+        json=[
+            valid,
+            {**valid, "amount": -5},
+            {**valid, "paid_by": outsider.id},
+            {**valid, "split_type": "PERCENTAGE", "split_values": {bob.id: 50}},
+            {**valid, "split_among": []},
+        ],
+    )
+    assert response.status_code == 422
+    errors = response.json()["detail"]
+    assert [error["row"] for error in errors] == [2, 3, 4, 5]
+    assert "amount" in errors[0]["error"]
+    assert errors[1]["error"] == "paid_by user must be a member of the group"
+    assert "split_among must list at least one member" in errors[3]["error"]
+    assert DatabaseService.get_group(group_id).expenses == []
+
+    csv_body = (
+        "description,amount,paid_by,split_among,split_values\n"
+        f"X,5,{alice_id},{bob.id},oops\n"
+    )
+    response = client.post(url, content=csv_body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 422
+    assert client.post(url, json=[]).status_code == 400
+    assert client.post(url, json={"description": "not a list"}).status_code == 400
+
+    other = TestClient(app)
+    other.post(
+        "/api/signup",
+        json={"name": "Eve", "email": "eve@example.com", "password": "secret123"},
+    )
+    assert other.post(url, json=[valid]).status_code == 403
@@ -32,32 +32,32 @@ def create_test_expenses_with_categories():
         test_expenses = [
             {
                 "description": "Dinner at Italian Restaurant",
-                "amount": 45.50,
+                "amount": 4550,
                 "category": "Food & Drink"
             },
             {
                 "description": "Uber to airport",
-                "amount": 23.75,
+                "amount": 2375,
                 "category": "Transportation"
             },
             {
                 "description": "Movie tickets",
-                "amount": 18.00,
+                "amount": 1800,
                 "category": "Entertainment"
             },
             {
                 "description": "Hotel booking",
-                "amount": 120.00,
+                "amount": 12000,
                 "category": "Accommodation"
             },
             {
                 "description": "Office supplies",
-                "amount": 15.30,
+                "amount": 1530,
                 "category": "General"
             },
             {
                 "description": "Lunch meeting",
-                "amount": 32.00,
+                "amount": 3200,
                 "category": None  # Test null category (should default to General)
             }
         ]
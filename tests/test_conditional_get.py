@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test ETag / Last-Modified validators on group and expense list responses."""
+
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from src.services.database_service import DatabaseService
+
+
+def _add_expense(client, group_id, paid_by, split_among, **extra):
+    response = client.post(
+        f"/api/groups/{group_id}/expenses",
+        json={
+            "amount": 100.0,
+            "description": "Dinner",
+            "paid_by": paid_by,
+            "split_among": split_among,
+            "split_type": "EQUAL",
+            **extra,
+        },
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_group_and_expense_list_revalidate_until_the_group_changes(isolated_db):
+    from web_app import app
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    alice_id = response.json()["user_id"]
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    carol = DatabaseService.create_user("Carol", "carol@example.com")
+    group_id = client.post("/api/groups", json={"name": "Trip", "member_ids": [bob.id]}).json()[
+        "id"
+    ]
+    group_url = f"/api/groups/{group_id}"
+    expenses_url = f"{group_url}/expenses"
+
+    def revalidate(url, etag, **params):
+        return client.get(url, params=params, headers={"If-None-Match": etag}).status_code
+
+    response = client.get(group_url)
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+    assert revalidate(group_url, etag) == 304
+    not_modified = client.get(group_url, headers={"If-None-Match": etag})
+    assert not_modified.content == b"" and not_modified.headers["ETag"] == etag
+    assert (
+        client.get(
+            group_url, headers={"If-Modified-Since": response.headers["Last-Modified"]}
+        ).status_code
+        == 304
+    )
+
+    # Each kind of change invalidates the tag
+    expense = _add_expense(
+        client,
+        group_id,
+        alice_id,
+        [alice_id, bob.id],
+        installments_count=2,
+        first_due_date=date.today().isoformat(),
+    )
+    assert revalidate(group_url, etag) == 200
+    etag = client.get(group_url).headers["ETag"]
+
+    assert client.post(f"{group_url}/members/{carol.id}").status_code == 204
+    assert revalidate(group_url, etag) == 200
+    etag = client.get(group_url).headers["ETag"]
+
+    client.post(f"{expenses_url}/{expense['id']}/installments/1/pay")
+    assert revalidate(group_url, etag) == 200
+    etag = client.get(group_url).headers["ETag"]
+
+    # Expense list tags also depend on the query
+    list_etag = client.get(expenses_url).headers["ETag"]
+    assert revalidate(expenses_url, list_etag) == 304
+    assert revalidate(expenses_url, list_etag, created_by="any") == 200
+    _add_expense(client, group_id, bob.id, [alice_id, bob.id])
+    assert revalidate(expenses_url, list_etag) == 200
+    assert revalidate(group_url, etag) == 200
+
+    # Outsiders get 403, not a 304
+    other = TestClient(app)
+    other.post(
+        "/api/signup",
+        json={"name": "Eve", "email": "eve@example.com", "password": "secret123"},
+    )
+    assert other.get(group_url, headers={"If-None-Match": "*"}).status_code == 403
+    assert client.get("/api/groups/missing").status_code == 404
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Test pooled SMTP delivery against a local stub SMTP server."""
+
+from src.services.email_delivery import OutgoingEmail, RateLimiter
+from src.services.notification_service import NotificationService
+
+# Stub SMTP server fixtures: smtp_server, smtp_delivery
+pytest_plugins = ["tests.smtp_stub"]
+
+
+def test_batches_reuse_authenticated_connections(smtp_server, smtp_delivery):
+    delivery = smtp_delivery(size=3, max_messages=20)
+    emails = [OutgoingEmail(f"user{i}@example.com", f"Lembrete {i}", "Olá") for i in range(50)]
+    results = delivery.send_many(emails)
+    delivery.close()
+
+    assert [result.email.to for result in results] == [e.to for e in emails]
+    assert all(result.sent and result.attempts == 1 for result in results)
+    assert sorted(message["To"] for message in smtp_server.messages) == sorted(e.to for e in emails)
+    # 50 messages over at most 3 concurrent connections, each reused up to 20 times
+    assert 3 <= delivery.pool.connections_opened <= 6
+    assert smtp_server.logins == smtp_server.connections == delivery.pool.connections_opened
+
+
+def test_transient_failures_are_retried_and_permanent_ones_are_not(smtp_server, smtp_delivery):
+    delivery = smtp_delivery(size=1, max_retries=2)
+    smtp_server.data_failures = ["451 try again later"]
+    result = delivery.send(OutgoingEmail("a@example.com", "Hi", "Body"))
+    assert result.sent and result.attempts == 2
+
+    smtp_server.data_failures = ["550 mailbox unavailable"]
+    result = delivery.send(OutgoingEmail("b@example.com", "Hi", "Body"))
+    assert not result.sent and result.attempts == 1
+    assert "mailbox unavailable" in result.error
+
+    smtp_server.data_failures = ["421 busy"] * 3
+    result = delivery.send(OutgoingEmail("c@example.com", "Hi", "Body"))
+    assert not result.sent and result.attempts == 3
+    delivery.close()
+
+    assert [message["To"] for message in smtp_server.messages] == ["a@example.com"]
+
+
+def test_rate_limiter_spaces_out_acquisitions():
+    now = [0.0]
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(6):
+        limiter.acquire()
+    # A burst of 2, then one token every half second
+    assert now[0] == 2.0
+    assert waits == [0.5, 0.5, 0.5, 0.5]
+
+
+def test_notification_service_sends_batches_through_the_pool(smtp_server, smtp_delivery):
+    service = NotificationService(delivery=smtp_delivery())
+    sent = service.send_email_batch(
+        [OutgoingEmail("a@example.com", "Um", "1"), OutgoingEmail("b@example.com", "Dois", "2")]
+    )
+    assert sent == [True, True]
+    assert service.send_email_notification("c@example.com", "Três", "3")
+    assert {message["Subject"] for message in smtp_server.messages} == {"Um", "Dois", "Três"}
+    assert NotificationService().send_email_batch([OutgoingEmail("d@x.com", "s", "b")]) == [False]
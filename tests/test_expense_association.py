@@ -29,7 +29,7 @@ def test_expense_group_association(test_users):
     expense1 = Expense(
         id=str(uuid.uuid4()),
         description="Group 1 Expense",
-        amount=50.0,
+        amount=5000,
         paid_by=user1.id,
         created_by=user1.id,
         split_among=[user1.id, user2.id],
@@ -57,7 +57,7 @@ def test_expense_group_association(test_users):
         print(f"     Expenses: {len(group.expenses)}")
         if group.expenses:
             for exp in group.expenses:
-                print(f"       - {exp.description} (${exp.amount})")
+                print(f"       - {exp.description} (${exp.amount / 100:.2f})")
         print()
     
     # Check specific groups
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test keyset pagination and SQL filters for group expense listing."""
+
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from src.models.expense import Expense
+from src.services.database_service import DatabaseService
+
+
+def _seed(group_id, payers):
+    start = datetime(2025, 1, 1, 12)
+    for i in range(25):
+        DatabaseService.add_expense_to_group(
+            group_id,
+            Expense(
+                id=f"e{i:02d}",
+                amount=100 * (i + 1),
+                description=f"Expense {i}",
+                paid_by=payers[i % len(payers)],
+                created_by=payers[i % len(payers)],
+                split_among=payers,
+                category="food" if i % 3 == 0 else "travel",
+                # Pairs of expenses share a timestamp, so the id breaks ties
+                created_at=start + timedelta(days=i // 2),
+            ),
+        )
+
+
+def _all_pages(group_id, limit, **filters):
+    pages, cursor = [], None
+    while True:
+        page, cursor = DatabaseService.list_group_expenses(
+            group_id, limit, cursor, **filters
+        )
+        pages.append([expense.id for expense in page])
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_every_expense_once_in_order(isolated_db):
+    alice = DatabaseService.create_user("Alice", "alice@example.com")
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    group = DatabaseService.create_group("Trip", [alice.id, bob.id])
+    _seed(group.id, [alice.id, bob.id])
+
+    pages = _all_pages(group.id, 7)
+    assert [len(page) for page in pages] == [7, 7, 7, 4]
+    assert sum(pages, []) == [f"e{i:02d}" for i in reversed(range(25))]
+
+    # An expense added after the first page does not shift the following pages
+    first, cursor = DatabaseService.list_group_expenses(group.id, 7)
+    DatabaseService.add_expense_to_group(
+        group.id,
+        Expense(
+            id="late", amount=100, description="", paid_by=alice.id, split_among=[alice.id]
+        ),
+    )
+    second, _ = DatabaseService.list_group_expenses(group.id, 7, cursor)
+    assert [expense.id for expense in second] == pages[1]
+
+    food = sum(_all_pages(group.id, 4, category="food", created_by=alice.id), [])
+    assert food == ["e24", "e18", "e12", "e06", "e00"]
+    window = sum(
+        _all_pages(
+            group.id,
+            10,
+            paid_by=bob.id,
+            created_from=datetime(2025, 1, 3),
+            created_before=datetime(2025, 1, 6),
+        ),
+        [],
+    )
+    assert window == ["e09", "e07", "e05"]
+
+
+def test_expense_listing_endpoint(isolated_db):
+    from web_app import app
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    alice_id = response.json()["user_id"]
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    group_id = client.post("/api/groups", json={"name": "Trip", "member_ids": [bob.id]}).json()[
+        "id"
+    ]
+    _seed(group_id, [alice_id, bob.id])
+
+    # Defaults to the current user's expenses
+    response = client.get(f"/api/groups/{group_id}/expenses", params={"limit": 10})
+    assert response.status_code == 200
+    assert len(response.json()) == 10
+    assert {expense["paid_by"] for expense in response.json()} == {alice_id}
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get(
+        f"/api/groups/{group_id}/expenses", params={"limit": 10, "cursor": cursor}
+    )
+    assert len(response.json()) == 3
+    assert "X-Next-Cursor" not in response.headers
+
+    response = client.get(
+        f"/api/groups/{group_id}/expenses",
+        params={"created_by": "any", "date_from": "2025-01-12", "date_to": "2025-01-13"},
+    )
+    assert [expense["id"] for expense in response.json()] == ["e24", "e23", "e22"]
+
+    response = client.get(f"/api/groups/{group_id}/expenses", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
@@ -47,7 +47,7 @@ def test_group_deletion(test_users):
     expense = Expense(
         id=f"test-expense-{uuid.uuid4().hex[:8]}",
         description="Test Dinner",
-        amount=100.0,
+        amount=10000,
         paid_by=user1.id,
         split_type="EQUAL",
         split_among=[user1.id, user2.id],
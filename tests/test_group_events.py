@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Test the in-memory event broker and the group event stream."""
+
+import asyncio
+import json
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from src.services.database_service import DatabaseService
+from src.services.event_broker import GroupEvent, InMemoryBroker, get_event_broker
+from src.settings import get_settings
+
+
+def test_in_memory_broker_fans_out_per_group_and_resyncs_slow_subscribers():
+    async def scenario():
+        broker = InMemoryBroker(max_queue=3)
+        first, second = broker.subscribe("g1"), broker.subscribe("g1")
+        other = broker.subscribe("g2")
+
+        broker.publish(GroupEvent("expense_added", "g1", {"n": 1}))
+        # Publishing from another thread is handed over to the subscriber's loop
+        thread = threading.Thread(
+            target=broker.publish, args=(GroupEvent("member_added", "g1", {"n": 2}),)
+        )
+        thread.start()
+        thread.join()
+
+        for subscription in (first, second):
+            assert (await subscription.get(1)).data == {"n": 1}
+            assert (await subscription.get(1)).data == {"n": 2}
+        assert await other.get(0.01) is None
+
+        for n in range(5):
+            broker.publish(GroupEvent("expense_added", "g1", {"n": n}))
+        assert (await first.get(1)).type == "resync"
+        # Nothing follows a resync
+        broker.publish(GroupEvent("expense_added", "g1", {"n": 5}))
+        assert await first.get(0.01) is None
+
+        first.close()
+        second.close()
+        assert broker.subscriber_count("g1") == 0
+        assert broker.subscriber_count("g2") == 1
+
+    asyncio.run(scenario())
+
+
+def _parse_events(body):
+    events = []
+    for message in body.split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in message.splitlines() if not line.startswith(":")
+        )
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_group_event_stream_pushes_deltas(isolated_db, monkeypatch):
+    from web_app import app
+
+    monkeypatch.setattr(get_settings(), "EVENT_STREAM_HEARTBEAT_SECONDS", 0.05)
+    client = TestClient(app)
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    alice_id = response.json()["user_id"]
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    carol = DatabaseService.create_user("Carol", "carol@example.com")
+    group_id = client.post("/api/groups", json={"name": "Trip", "member_ids": [bob.id]}).json()[
+        "id"
+    ]
+    assert client.get("/api/groups/missing/events").status_code == 404
+
+    # The test client only returns once the stream ends, which deleting the group does
+    streamed = {}
+    listener = TestClient(app, cookies=client.cookies)
+    thread = threading.Thread(
+        target=lambda: streamed.update(response=listener.get(f"/api/groups/{group_id}/events"))
+    )
+    thread.start()
+    broker = get_event_broker()
+    deadline = time.monotonic() + 5
+    while broker.subscriber_count(group_id) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    expense = client.post(
+        f"/api/groups/{group_id}/expenses",
+        json={
+            "amount": 100.0,
+            "description": "Dinner",
+            "paid_by": alice_id,
+            "split_among": [alice_id, bob.id],
+            "split_type": "EQUAL",
+        },
+    ).json()
+    client.post(f"/api/groups/{group_id}/members/{carol.id}")
+    client.delete(f"/api/groups/{group_id}/expenses/{expense['id']}")
+
+    car = client.post(
+        f"/api/groups/{group_id}/expenses",
+        json={
+            "amount": 90.0,
+            "description": "Car",
+            "paid_by": alice_id,
+            "split_among": [alice_id, carol.id],
+            "split_type": "EQUAL",
+            "installments_count": 2,
+        },
+    ).json()
+    pay_url = f"/api/groups/{group_id}/expenses/{car['id']}/installments/1/pay"
+    # Only members may pay, and only installments of the group's own expenses
+    outsider = TestClient(app)
+    outsider.post(
+        "/api/signup",
+        json={"name": "Dave", "email": "dave@example.com", "password": "secret123"},
+    )
+    assert outsider.post(pay_url).status_code == 403
+    assert (
+        client.post(f"/api/groups/missing/expenses/{car['id']}/installments/1/pay").status_code
+        == 404
+    )
+    assert (
+        client.post(f"/api/groups/{group_id}/expenses/missing/installments/1/pay").status_code
+        == 404
+    )
+    assert client.post(pay_url).status_code == 204
+    paid_balances = client.get(f"/api/groups/{group_id}").json()["balances"]
+    client.delete(f"/api/groups/{group_id}/expenses/{car['id']}")
+    settled_balances = client.get(f"/api/groups/{group_id}").json()["balances"]
+    assert client.delete(f"/api/groups/{group_id}").status_code == 204
+    thread.join(5)
+
+    response = streamed["response"]
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_events(response.text)
+    assert [event_type for event_type, _ in events] == [
+        "expense_added",
+        "balances",
+        "member_added",
+        "expense_deleted",
+        "balances",
+        "expense_added",
+        "balances",
+        "installment_paid",
+        "balances",
+        "expense_deleted",
+        "balances",
+        "group_deleted",
+    ]
+    assert events[0][1]["expense"]["id"] == expense["id"]
+    assert events[1][1] == {"balances": {alice_id: -50.0, bob.id: 50.0}}
+    assert events[2][1] == {"user_id": carol.id, "name": "Carol"}
+    assert events[3][1] == {"expense_id": expense["id"]}
+    assert events[7][1] == {"expense_id": car["id"], "number": 1}
+    # Balances events match the group's balances, from the ledger: the paid installment is left out
+    assert events[8][1] == {"balances": paid_balances}
+    assert paid_balances == {alice_id: -22.5, bob.id: 0.0, carol.id: 22.5}
+    assert events[10][1] == {"balances": settled_balances}
+    assert broker.subscriber_count(group_id) == 0
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Test streaming exports of a group's expense history."""
+
+import csv
+import io
+import json
+import zipfile
+from xml.etree import ElementTree
+
+from fastapi.testclient import TestClient
+
+from src.services.database_service import DatabaseService
+from src.services.export_service import EXPORT_COLUMNS
+
+
+def _setup(client):
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    alice_id = response.json()["user_id"]
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    group_id = client.post("/api/groups", json={"name": "Flat", "member_ids": [bob.id]}).json()[
+        "id"
+    ]
+    rows = [
+        {
+            "description": f'Row {i}, "quoted" <tag> & more',
+            "amount": 10.5 + i,
+            "paid_by": alice_id if i % 2 else bob.id,
+            "split_among": [alice_id, bob.id],
+        }
+        for i in range(450)
+    ]
+    rows.append(
+        {
+            "description": "Rent",
+            "amount": 90,
+            "paid_by": bob.id,
+            "split_among": [alice_id, bob.id],
+            "split_type": "EXACT",
+            "split_values": {alice_id: 60, bob.id: 30},
+            "installments_count": 3,
+            "first_due_date": "2025-01-10",
+        }
+    )
+    assert client.post(f"/api/groups/{group_id}/expenses:bulk", json=rows).status_code == 201
+    return alice_id, bob, group_id
+
+
+def test_export_formats(isolated_db):
+    from web_app import app
+
+    client = TestClient(app)
+    alice_id, bob, group_id = _setup(client)
+    url = f"/api/groups/{group_id}/export"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    records = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(records) == 451
+    assert records[0]["description"] == 'Row 0, "quoted" <tag> & more'
+    assert records[0]["amount"] == "10.50"
+    rent = records[-1]
+    assert rent["split_values"] == f"{alice_id}=60.0;{bob.id}=30.0"
+    assert rent["installments"] == (
+        "1:30.00:2025-01-10:unpaid;2:30.00:2025-02-10:unpaid;3:30.00:2025-03-10:unpaid"
+    )
+
+    # The CSV can be imported back
+    other_group = client.post(
+        "/api/groups", json={"name": "Copy", "member_ids": [bob.id]}
+    ).json()["id"]
+    reimported = client.post(
+        f"/api/groups/{other_group}/expenses:bulk",
+        content=response.content,
+        headers={"Content-Type": "text/csv"},
+    )
+    assert reimported.json()["created"] == 451
+    assert (
+        client.get(f"/api/groups/{other_group}").json()["balances"]
+        == client.get(f"/api/groups/{group_id}").json()["balances"]
+    )
+
+    response = client.get(url, params={"format": "jsonl"})
+    lines = response.text.splitlines()
+    assert len(lines) == 451
+    rent = json.loads(lines[-1])
+    assert rent["split_values"] == {alice_id: 60.0, bob.id: 30.0}
+    assert [item["due_date"] for item in rent["installments"]] == [
+        "2025-01-10",
+        "2025-02-10",
+        "2025-03-10",
+    ]
+
+    response = client.get(url, params={"format": "xlsx"})
+    with zipfile.ZipFile(io.BytesIO(response.content)) as workbook:
+        assert workbook.testzip() is None
+        sheet = ElementTree.fromstring(workbook.read("xl/worksheets/sheet1.xml"))
+    ns = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+    sheet_rows = sheet.findall("s:sheetData/s:row", ns)
+    assert len(sheet_rows) == 452
+    header = [cell.findtext("s:is/s:t", namespaces=ns) for cell in sheet_rows[0]]
+    assert header == list(EXPORT_COLUMNS)
+    first = sheet_rows[1]
+    assert first[EXPORT_COLUMNS.index("amount")].findtext("s:v", namespaces=ns) == "10.5"
+    assert first[EXPORT_COLUMNS.index("description")].findtext("s:is/s:t", namespaces=ns) == (
+        'Row 0, "quoted" <tag> & more'
+    )
+
+    assert client.get(url, params={"format": "pdf"}).status_code == 422
+    assert client.get("/api/groups/missing/export").status_code == 404
+
+
+def test_export_iterator_reads_in_batches(isolated_db):
+    from web_app import app
+
+    client = TestClient(app)
+    _, _, group_id = _setup(client)
+
+    expenses = DatabaseService.iter_group_expenses(group_id, batch_size=100)
+    first = next(expenses)
+    assert first.description.startswith("Row 0")
+    remaining = sum(1 for _ in expenses)
+    assert remaining == 450
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""Test that group listing only loads the caller's groups and pages them."""
+
+from src.services.database_service import DatabaseService
+
+
+def test_get_groups_for_user_filters_and_pages(isolated_db):
+    alice = DatabaseService.create_user("Alice", "alice@example.com")
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+
+    mine = [DatabaseService.create_group(f"Alice {i}", [alice.id, bob.id]) for i in range(3)]
+    DatabaseService.create_group("Bob only", [bob.id])
+
+    groups = DatabaseService.get_groups_for_user(alice.id)
+    assert {group.id for group in groups} == {group.id for group in mine}
+    assert all(alice.id in group.members and bob.id in group.members for group in groups)
+
+    first_page = DatabaseService.get_groups_for_user(alice.id, limit=2)
+    second_page = DatabaseService.get_groups_for_user(alice.id, limit=2, offset=2)
+    assert len(first_page) == 2 and len(second_page) == 1
+    assert {g.id for g in first_page + second_page} == {group.id for group in mine}
+
+    assert len(DatabaseService.get_groups_for_user(bob.id)) == 4
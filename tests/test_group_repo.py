@@ -37,7 +37,7 @@ def test_group_repository():
                 # Show some expense details
                 for i, exp in enumerate(casa_group_loaded.expenses):
                     if i < 3:  # Show first 3
-                        print(f"     Expense {i+1}: {exp.description} - ${exp.amount}")
+                        print(f"     Expense {i+1}: {exp.description} - ${exp.amount / 100:.2f}")
         else:
             print("   Casa group not found!")
         
@@ -59,7 +59,8 @@ def test_group_repository():
                 # Show expense details
                 for i, expense in enumerate(group.expenses):
                     if i < 3:  # Show first 3
-                        print(f"       Expense {i+1}: {expense.description} - ${expense.amount}")
+                        amount = expense.amount / 100
+                        print(f"       Expense {i+1}: {expense.description} - ${amount:.2f}")
                 break
         
         print("\n3. Testing individual group fetch:")
@@ -71,7 +72,8 @@ def test_group_repository():
                 print(f"   Expenses: {len(fetched_group.expenses)}")
                 for i, expense in enumerate(fetched_group.expenses):
                     if i < 3:  # Show first 3
-                        print(f"     Expense {i+1}: {expense.description} - ${expense.amount}")
+                        amount = expense.amount / 100
+                        print(f"     Expense {i+1}: {expense.description} - ${amount:.2f}")
         
     finally:
         db.close()
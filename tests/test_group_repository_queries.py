@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Query-count benchmark: loading a group must not issue per-expense SELECTs."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import event
+
+from src import database
+from src.models.expense import Expense
+from src.repositories.expense_repository import ExpenseRepository
+from src.repositories.group_repository import GroupRepository
+from src.services.expense_service import ExpenseService
+
+
+def _seed_group(db, member_ids, expense_count):
+    group = GroupRepository(db).create(f"Group {expense_count}", member_ids)
+    expense_repo = ExpenseRepository(db)
+    for i in range(expense_count):
+        expense = Expense(
+            id=str(uuid.uuid4()),
+            amount=3000 + i,
+            description=f"Expense {i}",
+            paid_by=member_ids[i % len(member_ids)],
+            split_among=member_ids,
+            created_at=datetime(2025, 1, 1),
+            installments_count=2 if i % 2 else 1,
+        )
+        ExpenseService.generate_installments(expense)
+        expense_repo.create(expense, group.id)
+    return group.id
+
+
+def _count_selects(engine, load):
+    selects = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        result = load()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    return len(selects), result
+
+
+def test_group_load_query_count_is_constant(isolated_db):
+    db = database.SessionLocal()
+    try:
+        users = [
+            database.UserDB(id=str(uuid.uuid4()), name=f"User {i}", email=f"u{i}@example.com")
+            for i in range(4)
+        ]
+        db.add_all(users)
+        db.commit()
+        member_ids = [user.id for user in users]
+
+        small_id = _seed_group(db, member_ids, 5)
+        large_id = _seed_group(db, member_ids, 100)
+        db.commit()
+    finally:
+        db.close()
+
+    counts = {}
+    for group_id, expense_count in ((small_id, 5), (large_id, 100)):
+        db = database.SessionLocal()
+        try:
+            count, group = _count_selects(
+                isolated_db,
+                lambda db=db, group_id=group_id: GroupRepository(db).get_by_id(group_id),
+            )
+        finally:
+            db.close()
+        assert len(group.expenses) == expense_count
+        assert all(len(expense.split_among) == 4 for expense in group.expenses)
+        counts[expense_count] = count
+
+    # group + members + expenses + split users + installments
+    assert counts[5] == counts[100] <= 5
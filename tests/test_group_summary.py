@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Test SQL-side group summaries against the group's balance ledger."""
+
+import random
+
+from fastapi.testclient import TestClient
+
+from src.models.expense import Expense
+from src.services.database_service import DatabaseService
+from src.services.expense_service import ExpenseService
+from src.services.portion_service import PortionService
+
+
+def test_summary_net_balances_match_the_ledger(isolated_db):
+    rng = random.Random(3)
+    users = [DatabaseService.create_user(f"U{i}", f"u{i}@example.com") for i in range(6)]
+    ids = [user.id for user in users]
+    outsider = DatabaseService.create_user("Outsider", "outsider@example.com")
+    group = DatabaseService.create_group("Trip", ids)
+
+    for i in range(60):
+        split_among = rng.sample(ids, rng.randint(1, len(ids)))
+        split_type = rng.choice(["EQUAL", "EQUAL", "EXACT", "PERCENTAGE"])
+        amount = rng.randint(1, 20000)
+        split_values = {}
+        if split_type == "EXACT":
+            split_values = {uid: amount // len(split_among) for uid in split_among}
+            split_values[split_among[-1]] += amount - sum(split_values.values())
+        elif split_type == "PERCENTAGE":
+            split_values = {uid: 100 / len(split_among) for uid in split_among}
+        DatabaseService.add_expense_to_group(
+            group.id,
+            Expense(
+                id=f"e{i}",
+                amount=amount,
+                description="",
+                paid_by=rng.choice(ids),
+                split_among=split_among,
+                split_type=split_type,
+                split_values=split_values,
+            ),
+        )
+    # Only members are reported; a share owed by someone outside the group stays with the payer
+    DatabaseService.add_expense_to_group(
+        group.id,
+        Expense(
+            id="outside", amount=900, description="", paid_by=ids[0], split_among=[outsider.id]
+        ),
+    )
+
+    # Paid installments are settled, as in the ledger and /me/balances
+    car = Expense(
+        id="car",
+        amount=9000,
+        description="",
+        paid_by=ids[0],
+        split_among=ids[:2],
+        installments_count=3,
+    )
+    ExpenseService.generate_installments(car)
+    DatabaseService.add_expense_to_group(group.id, car)
+    DatabaseService.pay_installment("car", 1)
+
+    summary = DatabaseService.get_group_summary(group.id)
+    loaded = DatabaseService.get_group(group.id)
+    DatabaseService.load_group_balances(loaded)
+    ledger_nets = {user_id: sum(user.balance.values()) for user_id, user in loaded.members.items()}
+    assert summary.balances == ledger_nets
+    full_nets = PortionService.group_net_balances(loaded)
+    assert summary.balances[ids[1]] == full_nets[ids[1]] - 1500
+    assert summary.expense_count == 62
+    assert outsider.id not in summary.balances
+    assert sum(summary.balances.values()) == -900
+    assert DatabaseService.get_group_summary("missing") is None
+
+
+def test_group_summary_endpoint(isolated_db):
+    from web_app import app
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    alice_id = response.json()["user_id"]
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    group_id = client.post("/api/groups", json={"name": "Trip", "member_ids": [bob.id]}).json()[
+        "id"
+    ]
+    client.post(
+        f"/api/groups/{group_id}/expenses",
+        json={
+            "amount": 100.0,
+            "description": "Dinner",
+            "paid_by": alice_id,
+            "split_among": [alice_id, bob.id],
+            "split_type": "EQUAL",
+        },
+    )
+
+    response = client.get(f"/api/groups/{group_id}/summary")
+    assert response.status_code == 200
+    body = response.json()
+    assert body.pop("last_activity")
+    assert body == {
+        "id": group_id,
+        "name": "Trip",
+        "member_count": 2,
+        "expense_count": 1,
+        "total_amount": 100.0,
+        "my_balance": -50.0,
+        "members": {alice_id: "Alice", bob.id: "Bob"},
+        "balances": {alice_id: -50.0, bob.id: 50.0},
+    }
+    assert body["balances"] == client.get(f"/api/groups/{group_id}").json()["balances"]
+
+
+def test_group_list_summary_view(isolated_db):
+    from web_app import app
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    alice_id = response.json()["user_id"]
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    carol = DatabaseService.create_user("Carol", "carol@example.com")
+    trip = client.post("/api/groups", json={"name": "Trip", "member_ids": [bob.id]}).json()
+    flat = client.post(
+        "/api/groups", json={"name": "Flat", "member_ids": [bob.id, carol.id]}
+    ).json()
+    client.post(
+        f"/api/groups/{flat['id']}/expenses",
+        json={
+            "amount": 90.0,
+            "description": "Groceries",
+            "paid_by": bob.id,
+            "split_among": [alice_id, bob.id, carol.id],
+            "split_type": "EQUAL",
+        },
+    )
+
+    response = client.get("/api/groups", params={"view": "summary"})
+    assert response.status_code == 200
+    summaries = response.json()
+    full = client.get("/api/groups").json()
+    assert [summary["id"] for summary in summaries] == [group["id"] for group in full]
+
+    trip_summary, flat_summary = summaries
+    assert (trip_summary["member_count"], trip_summary["expense_count"]) == (2, 0)
+    assert trip_summary["my_balance"] == 0.0
+    assert trip_summary["last_activity"] and trip_summary["members"] is None
+    assert (flat_summary["member_count"], flat_summary["expense_count"]) == (3, 1)
+    assert flat_summary["total_amount"] == 90.0
+    assert flat_summary["my_balance"] == full[1]["balances"][alice_id] == 30.0
+    assert flat_summary["balances"] is None
+    assert trip["id"] == trip_summary["id"]
+
+    assert client.get("/api/groups", params={"view": "bogus"}).status_code == 422
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test the notification outbox: idempotent enqueue, chunked dispatch and retries."""
+
+from datetime import datetime, timedelta
+
+from src.constants import NOTIFICATION_OVERDUE, NOTIFICATION_UPCOMING
+from src.models.expense import Expense
+from src.services.database_service import DatabaseService
+from src.services.expense_service import ExpenseService
+from src.services.notification_service import NotificationService
+
+# Stub SMTP server fixtures: smtp_server, smtp_delivery
+pytest_plugins = ["tests.smtp_stub"]
+
+
+def _add_expense(group_id, expense_id, paid_by, split_among, first_due_date):
+    expense = Expense(
+        id=expense_id,
+        amount=9000,
+        description=expense_id,
+        paid_by=paid_by,
+        split_among=split_among,
+        installments_count=3,
+        first_due_date=first_due_date,
+    )
+    ExpenseService.generate_installments(expense)
+    DatabaseService.add_expense_to_group(group_id, expense)
+
+
+def _setup():
+    alice = DatabaseService.create_user("Alice", "alice@example.com")
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    carol = DatabaseService.create_user("Carol", "carol@example.com")
+    group = DatabaseService.create_group("Trip", [alice.id, bob.id, carol.id])
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    # Installment 2 of the car is overdue for Bob and Carol, installment 1 of the TV for Bob
+    _add_expense(group.id, "car", alice.id, [alice.id, bob.id, carol.id], today - timedelta(40))
+    DatabaseService.pay_installment("car", 1)
+    _add_expense(group.id, "tv", alice.id, [alice.id, bob.id], today - timedelta(5))
+    return alice, bob, carol, group
+
+
+def test_outbox_delivers_each_reminder_once(isolated_db, smtp_server, smtp_delivery):
+    _, bob, carol, _ = _setup()
+    service = NotificationService(delivery=smtp_delivery(size=1))
+
+    assert service.enqueue_overdue_notifications() == 3
+    # Enqueueing again the same day adds nothing
+    assert service.enqueue_overdue_notifications() == 0
+
+    # Bob is sent one digest; Carol's email is rejected and stays queued
+    smtp_server.data_failures = [None, "550 mailbox unavailable"]
+    if bob.id > carol.id:
+        smtp_server.data_failures.reverse()
+    assert service.dispatch_notifications(chunk_users=1) == 1
+    assert DatabaseService.get_notification_outbox_counts() == {"sent": 2, "pending": 1}
+    (digest,) = smtp_server.messages
+    assert digest["To"] == "bob@example.com"
+    assert digest["Subject"] == "DividaFacil - Parcelas em atraso (2 pendentes)"
+    assert "car" in digest.get_content() and "tv" in digest.get_content()
+
+    # The next day's reminder about the same installment is queued next to the retry
+    tomorrow = datetime.now().date() + timedelta(days=1)
+    entries = [(carol.id, "car", 2)]
+    assert DatabaseService.enqueue_notifications(NOTIFICATION_OVERDUE, tomorrow, entries) == 1
+
+    # The next run retries Carol only, listing the installment once; later runs and enqueues
+    # never re-deliver
+    assert service.send_overdue_notifications() == 1
+    assert service.send_overdue_notifications() == 0
+    assert [message["To"] for message in smtp_server.messages] == [
+        "bob@example.com",
+        "carol@example.com",
+    ]
+    assert smtp_server.messages[1]["Subject"] == "DividaFacil - Parcelas em atraso (1 pendente)"
+    assert DatabaseService.get_notification_outbox_counts() == {"sent": 3, "skipped": 1}
+
+
+def test_outbox_skips_paid_reminders_and_never_resends_claimed_ones(
+    isolated_db, smtp_server, smtp_delivery
+):
+    _, bob, carol, _ = _setup()
+    service = NotificationService(delivery=smtp_delivery())
+    today = datetime.now().date()
+
+    # Without SMTP nothing is claimed or counted as sent
+    assert NotificationService().send_overdue_notifications() == 0
+    assert DatabaseService.get_notification_outbox_counts() == {"pending": 3}
+
+    # Paid before dispatch: skipped
+    DatabaseService.pay_installment("tv", 1)
+    assert service.dispatch_notifications() == 2
+    bob_email = next(m for m in smtp_server.messages if m["To"] == "bob@example.com")
+    assert bob_email["Subject"] == "DividaFacil - Parcelas em atraso (1 pendente)"
+    assert DatabaseService.get_notification_outbox_counts() == {"sent": 2, "skipped": 1}
+
+    # A dispatch that crashed after claiming its first user leaves that reminder unsent
+    entries = [(bob.id, "car", 3), (carol.id, "car", 3)]
+    assert DatabaseService.enqueue_notifications(NOTIFICATION_UPCOMING, today, entries) == 2
+    assert DatabaseService.claim_notifications(1, NOTIFICATION_UPCOMING) is not None
+    assert service.dispatch_notifications(NOTIFICATION_UPCOMING) == 1
+    assert service.dispatch_notifications(NOTIFICATION_UPCOMING) == 0
+    assert DatabaseService.get_notification_outbox_counts()["sending"] == 1
+    assert len(smtp_server.messages) == 3
+
+    # Failures stop being retried after max_attempts
+    tomorrow = today + timedelta(days=1)
+    assert DatabaseService.enqueue_notifications(NOTIFICATION_UPCOMING, tomorrow, entries[:1]) == 1
+    smtp_server.data_failures = ["550 no"]
+    assert service.dispatch_notifications(NOTIFICATION_UPCOMING, max_attempts=1) == 0
+    assert DatabaseService.get_notification_outbox_counts()["failed"] == 1
+    assert service.dispatch_notifications(NOTIFICATION_UPCOMING, max_attempts=1) == 0
+    assert len(smtp_server.messages) == 3
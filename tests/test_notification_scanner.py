@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Test the database scan of overdue and upcoming installments for notifications."""
+
+from datetime import datetime, timedelta
+
+from src.models.expense import Expense
+from src.services.database_service import DatabaseService
+from src.services.expense_service import ExpenseService
+from src.services.notification_service import NotificationService
+
+
+def _add_expense(group_id, expense_id, paid_by, split_among, first_due_date, count=3):
+    expense = Expense(
+        id=expense_id,
+        amount=9000,
+        description=expense_id,
+        paid_by=paid_by,
+        split_among=split_among,
+        installments_count=count,
+        first_due_date=first_due_date,
+    )
+    ExpenseService.generate_installments(expense)
+    DatabaseService.add_expense_to_group(group_id, expense)
+
+
+def _keys(items):
+    return sorted(
+        (item.user.id, item.expense.id, item.installment.number, item.days_overdue)
+        for item in items
+    )
+
+
+def test_database_scan_matches_the_in_memory_scan(isolated_db):
+    alice = DatabaseService.create_user("Alice", "alice@example.com")
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    carol = DatabaseService.create_user("Carol", "carol@example.com")
+    trip = DatabaseService.create_group("Trip", [alice.id, bob.id, carol.id])
+    flat = DatabaseService.create_group("Flat", [alice.id, bob.id])
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+
+    # Monthly installments: two past due (the first paid below), one ahead; another due soon
+    _add_expense(trip.id, "car", alice.id, [alice.id, bob.id, carol.id], today - timedelta(40))
+    _add_expense(flat.id, "sofa", bob.id, [alice.id, bob.id], today + timedelta(2))
+    _add_expense(flat.id, "single", bob.id, [alice.id, bob.id], today - timedelta(5), count=1)
+    DatabaseService.pay_installment("car", 1)
+
+    service = NotificationService()
+    groups = DatabaseService.get_all_groups()
+
+    overdue = service.get_overdue_installments()
+    assert _keys(overdue) == _keys(service.get_overdue_installments(groups))
+    second_due = DatabaseService.get_group(trip.id).expenses[0].installments[1].due_date
+    late = (today - second_due).days
+    assert _keys(overdue) == sorted([(bob.id, "car", 2, late), (carol.id, "car", 2, late)])
+    assert overdue[0].group.name == "Trip"
+    assert overdue[0].user.email in {"bob@example.com", "carol@example.com"}
+
+    upcoming = service.get_upcoming_installments(days_ahead=3)
+    assert _keys(upcoming) == _keys(service.get_upcoming_installments(groups, days_ahead=3))
+    assert _keys(upcoming) == [(alice.id, "sofa", 1, -2)]
+    assert service.get_upcoming_installments(days_ahead=1) == []
+
+    # Preferences come back with the scanned users
+    DatabaseService.update_user_notification_preferences(carol.id, {"email_overdue": False})
+    assert service.enqueue_overdue_notifications() == 1
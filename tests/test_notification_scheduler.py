@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Test the notification daemon: daily scan, incremental ticks and the metrics endpoint."""
+
+import json
+import urllib.error
+import urllib.request
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from src.models.expense import Expense
+from src.services.database_service import DatabaseService
+from src.services.expense_service import ExpenseService
+from src.services.notification_scheduler import MetricsServer, NotificationScheduler
+from src.services.notification_service import NotificationService
+
+# Stub SMTP server fixtures: smtp_server, smtp_delivery
+pytest_plugins = ["tests.smtp_stub"]
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _add_expense(group_id, expense_id, paid_by, split_among, first_due_date, created_at):
+    expense = Expense(
+        id=expense_id,
+        amount=9000,
+        description=expense_id,
+        paid_by=paid_by,
+        split_among=split_among,
+        installments_count=3,
+        first_due_date=first_due_date,
+        created_at=created_at,
+    )
+    ExpenseService.generate_installments(expense)
+    DatabaseService.add_expense_to_group(group_id, expense)
+
+
+def _scheduler(service, clock):
+    return NotificationScheduler(
+        service, interval_seconds=60, daily_at=time(8), upcoming_days=30, clock=clock
+    )
+
+
+def test_daily_scan_then_incremental_ticks(isolated_db, smtp_server, smtp_delivery):
+    alice = DatabaseService.create_user("Alice", "alice@example.com")
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    group = DatabaseService.create_group("Trip", [alice.id, bob.id])
+    today = datetime.combine(datetime.now().date(), time.min)
+    clock = FakeClock(today + timedelta(hours=7))
+    # Installments 1 and 2 are overdue; Bob's 3-day reminder window leaves out installment 3
+    car_due = today - timedelta(40)
+    _add_expense(group.id, "car", alice.id, [alice.id, bob.id], car_due, clock.now)
+
+    service = NotificationService(delivery=smtp_delivery())
+    scheduler = _scheduler(service, clock)
+
+    # Before the daily scan time nothing is queued
+    assert scheduler.tick() == 0
+    assert scheduler.watermark is None
+    assert DatabaseService.get_notification_outbox_counts() == {}
+
+    clock.now = today + timedelta(hours=9)
+    assert scheduler.tick() == 1
+    assert scheduler.daily_runs == 1
+    assert scheduler.enqueued == {"overdue": 2, "upcoming": 0}
+    assert smtp_server.messages[-1]["Subject"] == "DividaFacil - Parcelas em atraso (2 pendentes)"
+
+    # Later ticks only scan expenses created since the watermark, which trails the clock so
+    # an expense stamped just before the scan but committed after it is still picked up
+    watermark = scheduler.watermark
+    assert watermark == clock.now - timedelta(minutes=5)
+    members = [alice.id, bob.id]
+    stamped_before_scan = clock.now - timedelta(minutes=1)
+    _add_expense(group.id, "tv", alice.id, members, today - timedelta(5), stamped_before_scan)
+    clock.now += timedelta(minutes=1)
+    _add_expense(group.id, "sofa", alice.id, members, today + timedelta(2), clock.now)
+    assert len(service.get_overdue_installments()) == 3
+    assert len(service.get_overdue_installments(created_after=watermark)) == 1
+    assert scheduler.tick() == 2
+    assert scheduler.daily_runs == 1
+    assert scheduler.watermark > watermark
+    assert scheduler.enqueued == {"overdue": 3, "upcoming": 1}
+    assert sorted(message["Subject"] for message in smtp_server.messages[1:]) == [
+        "DividaFacil - Parcelas em atraso (1 pendente)",
+        "DividaFacil - Parcelas vencendo (1 próxima)",
+    ]
+
+    clock.now += timedelta(minutes=1)
+    assert scheduler.tick() == 0
+    assert scheduler.ticks == 4
+    assert scheduler.emails_sent == 3
+    assert DatabaseService.get_notification_outbox_counts() == {"sent": 4}
+
+
+def test_metrics_server_reports_health_and_counters(isolated_db):
+    clock = FakeClock(datetime.combine(datetime.now().date(), time(9)))
+    scheduler = _scheduler(NotificationService(), clock)
+    # Without SMTP the day's scan runs and everything stays queued
+    scheduler.tick()
+
+    server = MetricsServer(scheduler, host="127.0.0.1", port=0)
+    server.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def get(path):
+        with urllib.request.urlopen(base_url + path, timeout=5) as response:
+            return response.status, json.loads(response.read())
+
+    try:
+        assert get("/health") == (200, {"status": "ok"})
+        status, metrics = get("/metrics")
+        assert status == 200
+        assert metrics["ticks"] == 1 and metrics["daily_runs"] == 1
+        assert metrics["emails_sent"] == 0 and metrics["outbox"] == {}
+
+        # No successful tick for more than three intervals
+        clock.now += timedelta(minutes=4)
+        with pytest.raises(urllib.error.HTTPError) as stale:
+            get("/health")
+        assert stale.value.code == 503
+        with pytest.raises(urllib.error.HTTPError) as missing:
+            get("/nope")
+        assert missing.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
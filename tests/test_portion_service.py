@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Test the unified split-portion calculator and its per-expense cache."""
+
+from datetime import date
+
+import pytest
+
+from src.models.expense import Expense
+from src.models.group import Group
+from src.models.installment import Installment
+from src.models.user import User
+from src.services.balance_service import BalanceService
+from src.services.expense_service import ExpenseCalculationError, ExpenseService
+from src.services.portion_service import PortionCache, PortionService, portion_cache
+
+
+def _expense(**overrides) -> Expense:
+    fields = dict(
+        id="e1", amount=10000, description="Dinner", paid_by="a", split_among=["a", "b", "c"]
+    )
+    fields.update(overrides)
+    return Expense(**fields)
+
+
+def test_portion_rules():
+    # 10000 / 3 = 3333 each; the extra cent goes to the highest non-payer id
+    assert PortionService.portions(_expense()) == {"a": 3333, "b": 3333, "c": 3334}
+    assert PortionService.portions(
+        _expense(id="e2", split_type="EXACT", split_values={"a": 1000, "b": 9000})
+    ) == {"a": 1000, "b": 9000}
+    # Half cents round away from zero
+    assert PortionService.portions(
+        _expense(
+            id="e3",
+            amount=1005,
+            split_type="PERCENTAGE",
+            split_values={"a": 50.0, "b": 50.0},
+        )
+    ) == {"a": 503, "b": 503}
+
+    with pytest.raises(ValueError):
+        PortionService.portions(_expense(id="e4", split_type="BOGUS"))
+    with pytest.raises(ExpenseCalculationError):
+        ExpenseService._calculate_portions(_expense(id="e5", split_among=[]))
+
+
+def test_owed_shares_scale_with_unpaid_installments():
+    expense = _expense(installments_count=2)
+    expense.installments = [
+        Installment(number=1, due_date=date(2025, 1, 1), amount=5000, paid=True),
+        Installment(number=2, due_date=date(2025, 2, 1), amount=5000),
+    ]
+    assert PortionService.owed_shares(expense) == {"b": 1667, "c": 1667}
+
+    expense.installments[1].paid = True
+    assert PortionService.owed_shares(expense) == {}
+
+
+def test_cache_is_keyed_on_id_and_version(monkeypatch):
+    cache = PortionCache(max_size=2)
+    monkeypatch.setattr("src.services.portion_service.portion_cache", cache)
+    expense = _expense()
+
+    first = PortionService.portions(expense)
+    first["a"] = 0  # callers get their own copy
+    assert PortionService.portions(expense)["a"] == 3333
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # An edit bumps the version, so the old entry is never reused
+    expense.amount, expense.version = 9000, 2
+    assert PortionService.portions(expense) == {"a": 3000, "b": 3000, "c": 3000}
+
+    # An in-memory edit that skipped the version is caught by the signature check
+    expense.paid_by = "c"
+    assert PortionService.portions(expense) == {"a": 3000, "b": 3000, "c": 3000}
+    expense.amount = 10000
+    assert PortionService.portions(expense) == {"a": 3333, "b": 3334, "c": 3333}
+    assert cache.misses == 4
+
+    PortionService.portions(_expense(id="e2"))
+    assert cache.snapshot()["evictions"] == 1
+
+
+def test_group_paths_share_cached_portions():
+    members = {uid: User(id=uid, name=uid, email=f"{uid}@example.com") for uid in "abc"}
+    expenses = [
+        _expense(id="e1"),
+        _expense(id="e2", paid_by="b", split_type="EXACT", split_values={"a": 6000, "c": 4000}),
+    ]
+    group = Group(id="g", name="Trip", members=members, expenses=expenses)
+    portion_cache.clear()
+
+    balances = PortionService.group_net_balances(group)
+    ExpenseService.recompute_group_balances(group)
+    BalanceService().calculate_group_balances(group.expenses, group.members)
+
+    snapshot = portion_cache.snapshot()
+    assert snapshot["misses"] == len(expenses)
+    assert snapshot["hits"] == 2 * len(expenses)
+    assert balances == {"a": -667, "b": -6667, "c": 7334}
+    assert members["c"].balance == {"a": 3334, "b": 4000}
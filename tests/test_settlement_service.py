@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Test the settlement strategies and the group settlements endpoint."""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.services.database_service import DatabaseService
+from src.services.settlement_service import SettlementService
+from src.settings import get_settings
+
+# Greedy needs 4 transfers here; {a, e} and {b, c, d} each sum to zero, so 3 are enough
+NETS = {"a": -400, "b": -300, "c": -300, "d": 600, "e": 400}
+
+
+def _apply(nets, transfers):
+    remaining = dict(nets)
+    for transfer in transfers:
+        assert transfer["amount"] > 0
+        remaining[transfer["from"]] += transfer["amount"]
+        remaining[transfer["to"]] -= transfer["amount"]
+    return remaining
+
+
+@pytest.mark.parametrize("strategy", ["greedy", "exact", "heuristic", "auto"])
+def test_every_strategy_settles_all_balances(strategy):
+    rng = random.Random(7)
+    for size in (2, 5, 12, 30):
+        values = [rng.randint(-9000, 9000) for _ in range(size - 1)]
+        nets = {f"u{i}": value for i, value in enumerate(values + [-sum(values)])}
+        assert set(_apply(nets, SettlementService.settle(nets, strategy)).values()) <= {0}
+
+
+def test_exact_and_heuristic_beat_greedy():
+    assert len(SettlementService.settle(NETS, "greedy")) == 4
+    assert len(SettlementService.settle(NETS, "exact")) == 3
+    assert len(SettlementService.settle(NETS, "heuristic")) == 3
+
+
+def test_auto_falls_back_to_heuristic_for_large_groups(monkeypatch):
+    assert SettlementService.plan(NETS).strategy == "exact"
+    monkeypatch.setattr(get_settings(), "SETTLEMENT_EXACT_MAX_PARTIES", 3)
+    plan = SettlementService.plan(NETS)
+    assert plan.strategy == "heuristic"
+    assert len(plan.transfers) == 3
+    assert SettlementService.plan(NETS, "exact").strategy == "heuristic"
+
+    with pytest.raises(ValueError):
+        SettlementService.plan(NETS, "bogus")
+
+
+def test_group_settlements_endpoint(isolated_db):
+    from web_app import app
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    alice_id = response.json()["user_id"]
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    group_id = client.post("/api/groups", json={"name": "Trip", "member_ids": [bob.id]}).json()[
+        "id"
+    ]
+    client.post(
+        f"/api/groups/{group_id}/expenses",
+        json={
+            "amount": 100.0,
+            "description": "Dinner",
+            "paid_by": alice_id,
+            "split_among": [alice_id, bob.id],
+            "split_type": "EQUAL",
+        },
+    )
+
+    response = client.get(f"/api/groups/{group_id}/settlements", params={"strategy": "greedy"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "group_id": group_id,
+        "strategy": "greedy",
+        "transaction_count": 1,
+        "transfers": [{"from_user_id": bob.id, "to_user_id": alice_id, "amount": 50.0}],
+    }
+    response = client.get(f"/api/groups/{group_id}/settlements", params={"strategy": "bogus"})
+    assert response.status_code == 422
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Test that a request shares one session and commits its writes atomically."""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from src import database
+from src.models.expense import Expense
+from src.services.database_service import DatabaseService
+
+
+def test_create_expense_request_uses_one_connection(isolated_db):
+    """All service calls of a request run on the request-scoped session's connection."""
+    from web_app import app
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    alice_id = response.json()["user_id"]
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+
+    async_engine = database.AsyncSessionLocal.kw["bind"]
+    checkouts = []
+    listener = lambda *args: checkouts.append(args)  # noqa: E731
+    event.listen(async_engine.sync_engine, "checkout", listener)
+    try:
+        response = client.post(
+            "/api/groups", json={"name": "Trip", "member_emails": ["bob@example.com"]}
+        )
+        assert response.status_code == 201
+        assert len(checkouts) == 1
+        group_id = response.json()["id"]
+        assert set(response.json()["members"]) == {alice_id, bob.id}
+
+        checkouts.clear()
+        response = client.post(
+            f"/api/groups/{group_id}/expenses",
+            json={
+                "amount": 90.0,
+                "description": "Dinner",
+                "paid_by": alice_id,
+                "split_among": [alice_id, bob.id],
+                "split_type": "EQUAL",
+            },
+        )
+    finally:
+        event.remove(async_engine.sync_engine, "checkout", listener)
+
+    assert response.status_code == 201
+    assert len(checkouts) == 1
+    assert DatabaseService.get_user(bob.id).balance == {alice_id: 4500}
+
+
+def test_failed_unit_of_work_rolls_back_every_write(isolated_db):
+    """An error after a write leaves neither the expense nor its ledger entries behind."""
+    alice = DatabaseService.create_user("Alice", "alice@example.com")
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    group = DatabaseService.create_group("Trip", [alice.id, bob.id])
+    expense = Expense(
+        id=str(uuid.uuid4()),
+        amount=5000,
+        description="Taxi",
+        paid_by=alice.id,
+        split_among=[alice.id, bob.id],
+        created_at=datetime.now(),
+    )
+
+    with pytest.raises(RuntimeError):
+        with DatabaseService.get_session() as db:
+            DatabaseService.add_expense_to_group(group.id, expense, db=db)
+            raise RuntimeError("boom")
+
+    reloaded = DatabaseService.get_group(group.id)
+    assert reloaded.expenses == []
+    DatabaseService.load_group_balances(reloaded)
+    assert all(not member.balance for member in reloaded.members.values())
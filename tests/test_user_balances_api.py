@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Test the cross-group balances endpoint."""
+
+from fastapi.testclient import TestClient
+
+from src.services.database_service import DatabaseService
+
+
+def _add_expense(client, group_id, paid_by, split_among, amount):
+    response = client.post(
+        f"/api/groups/{group_id}/expenses",
+        json={
+            "amount": amount,
+            "description": "Dinner",
+            "paid_by": paid_by,
+            "split_among": split_among,
+            "split_type": "EQUAL",
+        },
+    )
+    assert response.status_code == 201
+
+
+def test_me_balances_aggregate_and_settle_across_groups(isolated_db):
+    from web_app import app
+
+    client = TestClient(app)
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    alice_id = response.json()["user_id"]
+    bob = DatabaseService.create_user("Bob", "bob@example.com")
+    carol = DatabaseService.create_user("Carol", "carol@example.com")
+
+    trip = client.post("/api/groups", json={"name": "Trip", "member_ids": [bob.id]}).json()
+    flat = client.post("/api/groups", json={"name": "Flat", "member_ids": [carol.id]}).json()
+    # Alice owes Bob 50 in one group, Carol owes Alice 30 in the other
+    _add_expense(client, trip["id"], bob.id, [alice_id, bob.id], 100.0)
+    _add_expense(client, flat["id"], alice_id, [alice_id, carol.id], 60.0)
+
+    response = client.get("/api/me/balances")
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["net"], body["owed_to_you"], body["you_owe"]) == (-20.0, 30.0, 50.0)
+    # Largest amount owed to Alice first
+    assert body["counterparties"] == [
+        {"user_id": carol.id, "name": "Carol", "amount": 30.0},
+        {"user_id": bob.id, "name": "Bob", "amount": -50.0},
+    ]
+    assert body["settlement"] is None
+
+    # Settling both groups together routes Carol's debt straight to Bob
+    body = client.get("/api/me/balances", params={"settle": "true"}).json()
+    assert body["settlement_strategy"] == "exact"
+    assert body["settlement"] == [{"from_user_id": alice_id, "to_user_id": bob.id, "amount": 20.0}]
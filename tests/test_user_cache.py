@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test the authenticated-user cache used by require_authentication."""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.models.user import User
+from src.services import user_cache as user_cache_module
+from src.services.database_service import DatabaseService
+from src.services.user_cache import UserCache, user_cache
+
+
+def test_user_cache_expires_and_evicts(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(user_cache_module.time, "monotonic", lambda: now[0])
+    cache = UserCache(ttl_seconds=10, max_size=2)
+
+    for user_id in ("a", "b"):
+        cache.set(User(id=user_id, name=user_id, email=f"{user_id}@example.com"))
+    assert cache.get("a").name == "a"
+
+    # "b" is now least recently used and is evicted by "c"
+    cache.set(User(id="c", name="c", email="c@example.com"))
+    assert cache.get("b") is None
+    assert cache.get("c").name == "c"
+
+    now[0] += 11
+    assert cache.get("a") is None
+
+    snapshot = cache.snapshot()
+    assert (snapshot["hits"], snapshot["misses"], snapshot["evictions"]) == (2, 2, 1)
+
+
+def test_cached_user_is_a_copy():
+    cache = UserCache(ttl_seconds=10, max_size=10)
+    cache.set(User(id="a", name="a", email="a@example.com"))
+    cache.get("a").balance["x"] = 1.0
+    assert cache.get("a").balance == {}
+
+
+def test_authentication_is_served_from_cache(isolated_db):
+    """Repeated requests skip the user SELECT until the user record changes."""
+    from web_app import app
+
+    user_cache.clear()
+    client = TestClient(app)
+    response = client.post(
+        "/api/signup",
+        json={"name": "Alice", "email": "alice@example.com", "password": "secret123"},
+    )
+    alice_id = response.json()["user_id"]
+
+    user_selects = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            user_selects.append(statement)
+
+    event.listen(isolated_db, "before_cursor_execute", _record)
+    try:
+        for _ in range(3):
+            assert client.get(f"/api/users/{alice_id}").status_code == 200
+        assert len(user_selects) == 1
+
+        DatabaseService.update_user_notification_preferences(alice_id, {"email_overdue": False})
+        user_selects.clear()
+        assert client.get(f"/api/users/{alice_id}").status_code == 200
+        assert len(user_selects) == 1
+    finally:
+        event.remove(isolated_db, "before_cursor_execute", _record)
+
+    assert user_cache.get(alice_id).notification_preferences == {"email_overdue": False}
+    snapshot = user_cache.snapshot()
+    assert snapshot["hits"] == 3
+    assert snapshot["invalidations"] == 1
+
+
+def test_cache_is_invalidated_when_the_callers_session_commits(isolated_db):
+    """With a request-scoped session the cached user is dropped on commit, not before."""
+    user_cache.clear()
+    alice = DatabaseService.create_user("Alice", "alice@example.com")
+    user_cache.set(alice)
+
+    with Session(isolated_db) as db:
+        DatabaseService.update_user_notification_preferences(
+            alice.id, {"email_overdue": False}, db=db
+        )
+        assert user_cache.get(alice.id) is not None
+        db.rollback()
+        assert user_cache.get(alice.id) is not None
+
+        DatabaseService.update_user_password(alice.id, "new-hash", db=db)
+        db.commit()
+    assert user_cache.get(alice.id) is None
+    assert user_cache.snapshot()["invalidations"] == 1
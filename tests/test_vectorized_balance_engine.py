@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Test that the NumPy balance engine matches the Python implementations to the cent."""
+
+import copy
+import random
+import uuid
+from datetime import date, datetime
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.constants import BALANCE_ENGINE_NUMPY, BALANCE_ENGINE_PYTHON  # noqa: E402
+from src.models.expense import Expense  # noqa: E402
+from src.models.group import Group  # noqa: E402
+from src.models.installment import Installment  # noqa: E402
+from src.models.user import User  # noqa: E402
+from src.money import div_half_up  # noqa: E402
+from src.services.expense_service import ExpenseService  # noqa: E402
+from src.services.portion_service import PortionService  # noqa: E402
+from src.settings import get_settings  # noqa: E402
+
+
+def _random_group(seed: int, member_count: int = 12, expense_count: int = 600) -> Group:
+    rng = random.Random(seed)
+    members = {
+        user.id: user
+        for user in (
+            User(id=str(uuid.UUID(int=rng.getrandbits(128))), name=f"U{i}", email=f"{i}@x.com")
+            for i in range(member_count)
+        )
+    }
+    ids = list(members)
+    expenses = []
+    for i in range(expense_count):
+        amount = rng.randint(100, 50000)
+        split_among = rng.sample(ids, rng.randint(1, member_count))
+        split_type = rng.choice(["EQUAL", "EXACT", "PERCENTAGE"])
+        split_values = {}
+        if split_type == "EXACT":
+            cuts = sorted(rng.randint(0, amount) for _ in range(len(split_among) - 1))
+            parts = [b - a for a, b in zip([0] + cuts, cuts + [amount], strict=True)]
+            split_values = dict(zip(split_among, parts, strict=True))
+        elif split_type == "PERCENTAGE":
+            weights = [rng.randint(1, 9) for _ in split_among]
+            split_values = {
+                uid: round(100 * w / sum(weights), 2)
+                for uid, w in zip(split_among, weights, strict=True)
+            }
+            split_values[split_among[-1]] += round(100 - sum(split_values.values()), 2)
+        expense = Expense(
+            id=f"e{i}",
+            amount=amount,
+            description="",
+            paid_by=rng.choice(ids),
+            split_among=split_among,
+            split_type=split_type,
+            split_values=split_values,
+            created_at=datetime(2025, 1, 1),
+        )
+        if rng.random() < 0.2:
+            expense.installments_count = 3
+            per = div_half_up(amount, 3)
+            expense.installments = [
+                Installment(number=n + 1, due_date=date(2025, n + 1, 1), amount=per)
+                for n in range(3)
+            ]
+            expense.installments[-1].amount = amount - 2 * per
+            for installment in expense.installments[: rng.randint(0, 3)]:
+                installment.paid = True
+        expenses.append(expense)
+    return Group(id="g", name="Random", members=members, expenses=expenses)
+
+
+def _with_engine(monkeypatch, engine, compute):
+    monkeypatch.setattr(get_settings(), "BALANCE_ENGINE", engine)
+    return compute()
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_recomputed_member_balances_match(monkeypatch, seed):
+    group = _random_group(seed)
+    expected_group, actual_group = copy.deepcopy(group), copy.deepcopy(group)
+
+    _with_engine(
+        monkeypatch,
+        BALANCE_ENGINE_PYTHON,
+        lambda: ExpenseService.recompute_group_balances(expected_group),
+    )
+    _with_engine(
+        monkeypatch,
+        BALANCE_ENGINE_NUMPY,
+        lambda: ExpenseService.recompute_group_balances(actual_group),
+    )
+    for user_id, member in expected_group.members.items():
+        actual = actual_group.members[user_id].balance
+        assert actual == member.balance
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_group_net_balances_match(monkeypatch, seed):
+    group = _random_group(seed)
+    # A payer who left the group and a member outside every split
+    group.expenses[0].paid_by = "former-member"
+    group.members["idle"] = User(id="idle", name="Idle", email="idle@x.com")
+
+    def compute():
+        return PortionService.group_net_balances(group)
+
+    expected = _with_engine(monkeypatch, BALANCE_ENGINE_PYTHON, compute)
+    actual = _with_engine(monkeypatch, BALANCE_ENGINE_NUMPY, compute)
+    assert actual == expected
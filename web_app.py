@@ -9,6 +9,7 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.sessions import SessionMiddleware
 
 from src.logging_config import configure_logging
+from src.routers.api_admin import router as api_admin_router
 from src.routers.api_auth import router as api_auth_router
 from src.routers.api_expenses import router as api_expenses_router
 from src.routers.api_groups import router as api_groups_router
@@ -75,6 +76,7 @@ class AppFactory:
             allow_credentials=True,
             allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
             allow_headers=["*"],
+            expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
         )
         
         # Add security headers middleware
@@ -116,6 +118,7 @@ class AppFactory:
             api_groups_router,
             api_expenses_router,
             api_auth_router,
+            api_admin_router,
         ]
 
         for router in api_routers: